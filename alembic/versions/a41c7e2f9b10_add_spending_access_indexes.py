@@ -0,0 +1,29 @@
+"""add spending access indexes
+
+Revision ID: a41c7e2f9b10
+Revises: 819a76e6ab65
+Create Date: 2026-10-18 09:12:41.204517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a41c7e2f9b10'
+down_revision: Union[str, Sequence[str], None] = '819a76e6ab65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_spending_user_deleted_date', 'spending', ['user_id', 'is_deleted', 'date'], unique=False)
+    op.create_index('ix_spending_user_category_date', 'spending', ['user_id', 'category_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_spending_user_category_date', table_name='spending')
+    op.drop_index('ix_spending_user_deleted_date', table_name='spending')
@@ -0,0 +1,44 @@
+"""use synced as change version
+
+Revision ID: a93d5f17c2e8
+Revises: f2c6b0e8a4d7
+Create Date: 2026-10-18 16:10:52.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a93d5f17c2e8'
+down_revision: Union[str, Sequence[str], None] = 'f2c6b0e8a4d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('categories', 'income', 'spending', 'savings_goals', 'savings_contributions')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Give existing rows distinct, ordered versions and start each user's
+    # counter above them, so a first pull (since=0) still pages cleanly.
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET synced = id")
+    latest = " UNION ALL ".join(f"SELECT MAX(synced) AS v FROM {table} WHERE user_id = users.id" for table in TABLES)
+    op.execute(f"UPDATE users SET synced = COALESCE((SELECT MAX(v) FROM ({latest}) AS versions), 0)")
+
+    op.create_index('ix_categories_user_version', 'categories', ['user_id', 'synced'], unique=False)
+    op.create_index('ix_income_user_version', 'income', ['user_id', 'synced'], unique=False)
+    op.create_index('ix_spending_user_version', 'spending', ['user_id', 'synced'], unique=False)
+    op.create_index('ix_savings_goals_user_version', 'savings_goals', ['user_id', 'synced'], unique=False)
+    op.create_index('ix_savings_contributions_user_version', 'savings_contributions', ['user_id', 'synced'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_savings_contributions_user_version', table_name='savings_contributions')
+    op.drop_index('ix_savings_goals_user_version', table_name='savings_goals')
+    op.drop_index('ix_spending_user_version', table_name='spending')
+    op.drop_index('ix_income_user_version', table_name='income')
+    op.drop_index('ix_categories_user_version', table_name='categories')
@@ -0,0 +1,29 @@
+"""add spending client id
+
+Revision ID: b2e7c94d1f36
+Revises: a93d5f17c2e8
+Create Date: 2026-10-18 16:58:31.470926
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b2e7c94d1f36'
+down_revision: Union[str, Sequence[str], None] = 'a93d5f17c2e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('spending', sa.Column('client_id', sa.String(), nullable=True))
+    op.create_index('uix_spending_user_client', 'spending', ['user_id', 'client_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uix_spending_user_client', table_name='spending')
+    op.drop_column('spending', 'client_id')
@@ -0,0 +1,31 @@
+"""add list pagination indexes
+
+Revision ID: b7d25e8c4a61
+Revises: a41c7e2f9b10
+Create Date: 2026-10-18 11:40:03.918254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b7d25e8c4a61'
+down_revision: Union[str, Sequence[str], None] = 'a41c7e2f9b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_categories_user_deleted', 'categories', ['user_id', 'is_deleted'], unique=False)
+    op.create_index('ix_income_user_date', 'income', ['user_id', 'date'], unique=False)
+    op.create_index('ix_savings_goals_user_created', 'savings_goals', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_savings_goals_user_created', table_name='savings_goals')
+    op.drop_index('ix_income_user_date', table_name='income')
+    op.drop_index('ix_categories_user_deleted', table_name='categories')
@@ -0,0 +1,52 @@
+"""require spending date
+
+Revision ID: c3d8a1f5e902
+Revises: f7b3e2a8c614
+Create Date: 2026-10-18 21:04:52.618240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c3d8a1f5e902'
+down_revision: Union[str, Sequence[str], None] = 'f7b3e2a8c614'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The rollup key includes the day, so undated spending cannot be summarized.
+    # Date it to now, then rebuild the affected users' rollups (as `python -m app.rollups rebuild`).
+    bind = op.get_bind()
+    user_ids = [row[0] for row in bind.execute(sa.text("SELECT DISTINCT user_id FROM spending WHERE date IS NULL"))]
+    op.execute("UPDATE spending SET date = CURRENT_TIMESTAMP WHERE date IS NULL")
+    day = "CAST(date_trunc('day', date) AS DATE)" if bind.dialect.name == 'postgresql' else "date(date)"
+    for user_id in user_ids:
+        bind.execute(sa.text("DELETE FROM spending_daily_totals WHERE user_id = :user_id"), {"user_id": user_id})
+        bind.execute(sa.text(
+            "INSERT INTO spending_daily_totals (user_id, category_id, currency, day, total, count) "
+            f"SELECT user_id, COALESCE(category_id, 0), currency, {day}, COALESCE(SUM(amount), 0), COUNT(id) "
+            "FROM spending WHERE is_deleted = false AND user_id = :user_id "
+            f"GROUP BY user_id, COALESCE(category_id, 0), currency, {day}"
+        ), {"user_id": user_id})
+
+    # SQLite cannot alter a column without rebuilding the table, which would drop
+    # the search triggers; there the model's NOT NULL applies to new databases.
+    if bind.dialect.name == 'postgresql':
+        op.alter_column('spending', 'date',
+                   existing_type=sa.DateTime(),
+                   nullable=False,
+                   server_default=sa.text('now()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.alter_column('spending', 'date',
+                   existing_type=sa.DateTime(),
+                   nullable=True,
+                   server_default=None)
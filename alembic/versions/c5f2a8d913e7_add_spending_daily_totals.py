@@ -0,0 +1,49 @@
+"""add spending daily totals
+
+Revision ID: c5f2a8d913e7
+Revises: b7d25e8c4a61
+Create Date: 2026-10-18 13:05:27.611840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'c5f2a8d913e7'
+down_revision: Union[str, Sequence[str], None] = 'b7d25e8c4a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The currency type already exists on Postgres (see d073e63f6c35)
+    currency_enum = postgresql.ENUM('NGN', 'GBP', 'USD', 'EUR', name='currency', create_type=False)
+    op.create_table(
+        'spending_daily_totals',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('currency', currency_enum, nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'category_id', 'currency', 'day'),
+    )
+
+    # Backfill from existing spending (same as `python -m app.rollups rebuild`)
+    day = "CAST(date_trunc('day', date) AS DATE)" if op.get_bind().dialect.name == 'postgresql' else "date(date)"
+    op.execute(
+        "INSERT INTO spending_daily_totals (user_id, category_id, currency, day, total, count) "
+        f"SELECT user_id, COALESCE(category_id, 0), currency, {day}, COALESCE(SUM(amount), 0), COUNT(id) "
+        # Undated rows get a date, and their rollups, in c3d8a1f5e902
+        "FROM spending WHERE is_deleted = false AND date IS NOT NULL "
+        f"GROUP BY user_id, COALESCE(category_id, 0), currency, {day}"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('spending_daily_totals')
@@ -0,0 +1,27 @@
+"""add savings contributions goal index
+
+Revision ID: d81b4e6f2a93
+Revises: c5f2a8d913e7
+Create Date: 2026-10-18 14:21:08.352196
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd81b4e6f2a93'
+down_revision: Union[str, Sequence[str], None] = 'c5f2a8d913e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_savings_contributions_goal_date', 'savings_contributions', ['goal_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_savings_contributions_goal_date', table_name='savings_contributions')
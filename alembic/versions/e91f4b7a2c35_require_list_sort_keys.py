@@ -0,0 +1,42 @@
+"""require list sort keys
+
+Revision ID: e91f4b7a2c35
+Revises: c3d8a1f5e902
+Create Date: 2026-10-18 21:37:15.204871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e91f4b7a2c35'
+down_revision: Union[str, Sequence[str], None] = 'c3d8a1f5e902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keyset pages sort on (column, id); a NULL would end up in the next-page cursor.
+# spending.date is handled in c3d8a1f5e902.
+SORT_KEYS = [('income', 'date'), ('savings_goals', 'created_at'), ('savings_contributions', 'date')]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in SORT_KEYS:
+        op.execute(f"UPDATE {table} SET {column} = CURRENT_TIMESTAMP WHERE {column} IS NULL")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column,
+                   existing_type=sa.DateTime(),
+                   nullable=False,
+                   server_default=sa.text('CURRENT_TIMESTAMP'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in reversed(SORT_KEYS):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column,
+                   existing_type=sa.DateTime(),
+                   nullable=True,
+                   server_default=None)
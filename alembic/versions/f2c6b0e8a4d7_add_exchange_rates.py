@@ -0,0 +1,42 @@
+"""add exchange rates
+
+Revision ID: f2c6b0e8a4d7
+Revises: d81b4e6f2a93
+Create Date: 2026-10-18 15:02:44.187305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'f2c6b0e8a4d7'
+down_revision: Union[str, Sequence[str], None] = 'd81b4e6f2a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The currency type already exists on Postgres (see d073e63f6c35)
+    currency_enum = postgresql.ENUM('NGN', 'GBP', 'USD', 'EUR', name='currency', create_type=False)
+    op.create_table(
+        'exchange_rates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('from_currency', currency_enum, nullable=False),
+        sa.Column('to_currency', currency_enum, nullable=False),
+        sa.Column('as_of', sa.Date(), nullable=False),
+        sa.Column('rate', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('from_currency', 'to_currency', 'as_of', name='uix_currency_pair_as_of'),
+    )
+    op.create_index(op.f('ix_exchange_rates_id'), 'exchange_rates', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_exchange_rates_id'), table_name='exchange_rates')
+    op.drop_table('exchange_rates')
@@ -0,0 +1,57 @@
+"""add spending search
+
+Revision ID: f7b3e2a8c614
+Revises: e4a7c1d9b358
+Create Date: 2026-10-18 19:12:40.318262
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f7b3e2a8c614'
+down_revision: Union[str, Sequence[str], None] = 'e4a7c1d9b358'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match SPENDING_SEARCH_DOCUMENT in app/models.py
+DOCUMENT = "coalesce(item_name, '') || ' ' || coalesce(notes, '')"
+
+SQLITE_TRIGGERS = [
+    "CREATE TRIGGER spending_fts_insert AFTER INSERT ON spending BEGIN "
+    "INSERT INTO spending_fts(rowid, item_name, notes) VALUES (new.id, new.item_name, new.notes); END",
+    "CREATE TRIGGER spending_fts_delete AFTER DELETE ON spending BEGIN "
+    "INSERT INTO spending_fts(spending_fts, rowid, item_name, notes) VALUES ('delete', old.id, old.item_name, old.notes); END",
+    "CREATE TRIGGER spending_fts_update AFTER UPDATE OF item_name, notes ON spending BEGIN "
+    "INSERT INTO spending_fts(spending_fts, rowid, item_name, notes) VALUES ('delete', old.id, old.item_name, old.notes); "
+    "INSERT INTO spending_fts(rowid, item_name, notes) VALUES (new.id, new.item_name, new.notes); END",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index('ix_spending_search_tsv', 'spending', [sa.text(f"to_tsvector('simple', {DOCUMENT})")],
+                        postgresql_using='gin')
+        op.create_index('ix_spending_search_trgm', 'spending', [sa.text(f"({DOCUMENT}) gin_trgm_ops")],
+                        postgresql_using='gin')
+    elif op.get_bind().dialect.name == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE spending_fts USING fts5(item_name, notes, content='spending', content_rowid='id')")
+        for statement in SQLITE_TRIGGERS:
+            op.execute(statement)
+        # Index the rows that already exist
+        op.execute("INSERT INTO spending_fts(spending_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_spending_search_trgm', table_name='spending')
+        op.drop_index('ix_spending_search_tsv', table_name='spending')
+    elif op.get_bind().dialect.name == 'sqlite':
+        for trigger in ('spending_fts_insert', 'spending_fts_delete', 'spending_fts_update'):
+            op.execute(f"DROP TRIGGER {trigger}")
+        op.execute("DROP TABLE spending_fts")
@@ -0,0 +1,166 @@
+"""Async counterparts of the crud functions served by the DB_MODE=async routers.
+
+These mirror app/crud.py query for query. Relationships are never lazily
+loaded on an AsyncSession, so anything a response serializes is loaded
+eagerly here.
+"""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from . import models, rollups, schemas, sync
+from .pagination import after_cursor
+from typing import Optional
+from datetime import date, datetime, time, timedelta
+
+# --- User ---
+async def get_user_by_email(db: AsyncSession, email: str):
+    return await db.scalar(select(models.User).where(models.User.email == email))
+
+# --- Categories ---
+async def get_categories(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    stmt = select(models.Category).where(models.Category.user_id == user_id, models.Category.is_deleted == False)
+    stmt = stmt.order_by(models.Category.id)
+    if cursor:
+        stmt = after_cursor(stmt, cursor, models.Category.id, descending=False)
+    else:
+        stmt = stmt.offset(skip)
+    return (await db.scalars(stmt.limit(limit))).all()
+
+async def create_user_category(db: AsyncSession, category: schemas.CategoryCreate, user_id: int):
+    db_category = models.Category(
+        category_name=category.category_name,
+        user_id=user_id,
+        is_deleted=category.is_deleted,
+        version=await _next_version(db, user_id)
+    )
+    db.add(db_category)
+    await db.commit()
+    await db.refresh(db_category)
+    return db_category
+
+# --- Income ---
+async def get_incomes(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    stmt = select(models.Income).where(models.Income.user_id == user_id)
+    stmt = stmt.order_by(models.Income.date.desc(), models.Income.id.desc())
+    if cursor:
+        stmt = after_cursor(stmt, cursor, models.Income.date, models.Income.id)
+    else:
+        stmt = stmt.offset(skip)
+    return (await db.scalars(stmt.limit(limit))).all()
+
+async def create_user_income(db: AsyncSession, income: schemas.IncomeCreate, user_id: int):
+    db_income = models.Income(
+        amount=income.amount,
+        source=income.source,
+        type=income.type,
+        currency=income.currency,
+        date=income.date,
+        user_id=user_id,
+        version=await _next_version(db, user_id)
+    )
+    db.add(db_income)
+    await db.commit()
+    await db.refresh(db_income)
+    return db_income
+
+# --- Spending ---
+async def get_spendings(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100, start_date: Optional[date] = None,
+    end_date: Optional[date] = None, category_id: Optional[int] = None, cursor: Optional[str] = None):
+    stmt = select(models.Spending).where(models.Spending.user_id == user_id, models.Spending.is_deleted == False)
+    if start_date:
+        stmt = stmt.where(models.Spending.date >= datetime.combine(start_date, time.min))
+    if end_date:
+        stmt = stmt.where(models.Spending.date < datetime.combine(end_date + timedelta(days=1), time.min))
+    if category_id:
+        stmt = stmt.where(models.Spending.category_id == category_id)
+    stmt = stmt.order_by(models.Spending.date.desc(), models.Spending.id.desc())
+    if cursor:
+        stmt = after_cursor(stmt, cursor, models.Spending.date, models.Spending.id)
+    else:
+        stmt = stmt.offset(skip)
+    return (await db.scalars(stmt.limit(limit))).all()
+
+async def create_user_spending(db: AsyncSession, spending: schemas.SpendingCreate, user_id: int):
+    db_spending = models.Spending(
+        amount=spending.amount,
+        notes=spending.notes,
+        item_name=spending.item_name,
+        date=spending.date,
+        category_id=spending.category_id,
+        is_deleted=spending.is_deleted,
+        currency=spending.currency,
+        user_id=user_id,
+        version=await _next_version(db, user_id)
+    )
+    db.add(db_spending)
+    await db.flush()
+    if not db_spending.is_deleted:
+        await _record_rollups(db, [rollups.delta(db_spending)])
+    await db.commit()
+    await db.refresh(db_spending)
+    return db_spending
+
+async def delete_user_spending(db: AsyncSession, spending_id: int, user_id: int):
+    db_spending = await db.scalar(
+        select(models.Spending)
+        .where(models.Spending.id == spending_id, models.Spending.user_id == user_id)
+        .with_for_update()
+    )
+    if db_spending is None:
+        return None
+    if not db_spending.is_deleted:
+        db_spending.is_deleted = True
+        db_spending.version = await _next_version(db, user_id)
+        await _record_rollups(db, [rollups.delta(db_spending, -1)])
+    await db.commit()
+    return db_spending
+
+async def _next_version(db: AsyncSession, user_id: int) -> int:
+    return await db.scalar(sync.next_version_statement(user_id))
+
+async def _record_rollups(db: AsyncSession, deltas):
+    stmt = rollups.upsert_statement(db.bind.dialect.name, deltas)
+    if stmt is not None:
+        await db.execute(stmt)
+
+# --- Savings ---
+async def get_savings_goals(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    stmt = select(models.SavingsGoal).where(models.SavingsGoal.user_id == user_id)
+    stmt = stmt.options(selectinload(models.SavingsGoal.savings_contributions))
+    stmt = stmt.order_by(models.SavingsGoal.created_at.desc(), models.SavingsGoal.id.desc())
+    if cursor:
+        stmt = after_cursor(stmt, cursor, models.SavingsGoal.created_at, models.SavingsGoal.id)
+    else:
+        stmt = stmt.offset(skip)
+    return (await db.scalars(stmt.limit(limit))).all()
+
+async def create_user_savings_goal(db: AsyncSession, goal: schemas.SavingsGoalCreate, user_id: int):
+    db_goal = models.SavingsGoal(
+        goal_name=goal.goal_name,
+        target_amount=goal.target_amount,
+        deadline=goal.deadline,
+        user_id=user_id,
+        version=await _next_version(db, user_id)
+    )
+    db.add(db_goal)
+    await db.commit()
+    await db.refresh(db_goal)
+    await db.refresh(db_goal, attribute_names=["savings_contributions"])
+    return db_goal
+
+async def create_savings_contribution(db: AsyncSession, contribution: schemas.SavingsContributionCreate, goal_id: int, user_id: int):
+    goal = await db.scalar(select(models.SavingsGoal).where(models.SavingsGoal.id == goal_id))
+    if not goal:
+        return None
+
+    db_contribution = models.SavingsContribution(
+        amount=contribution.amount,
+        date=contribution.date,
+        goal_id=goal_id,
+        user_id=user_id,
+        version=await _next_version(db, user_id)
+    )
+    db.add(db_contribution)
+    await db.commit()
+    await db.refresh(db_contribution)
+    return db_contribution
@@ -3,12 +3,16 @@ from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import os
+import time
+import uuid
 from dotenv import load_dotenv
 
-from .database import SessionLocal, get_db
-from . import models, crud
+from .database import SessionLocal, get_db, get_async_db
+from . import models, crud, async_crud, schemas
+from .cache import principal_cache
 
 load_dotenv()
 
@@ -16,6 +20,7 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -32,25 +37,71 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 def create_refresh_token(data: dict):
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=7)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    # jti names this token in the revocation list once it is used
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str, token_type: str = "access") -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-    user = crud.get_user_by_email(db, email=email)
+        raise _credentials_exception()
+    if payload.get("sub") is None or payload.get("type", "access") != token_type:
+        raise _credentials_exception()
+    return payload
+
+
+def decode_refresh_token(token: str) -> dict:
+    payload = _decode_token(token, token_type="refresh")
+    if payload.get("jti") is None:
+        raise _credentials_exception()
+    return payload
+
+
+def create_token_pair(email: str) -> dict:
+    """Access and refresh token for a freshly authenticated (or refreshed) user."""
+    return {
+        "access_token": create_access_token(data={"sub": email}),
+        "refresh_token": create_refresh_token(data={"sub": email}),
+    }
+
+
+def _remember_principal(token: str, payload: dict, user: models.User) -> schemas.UserData:
+    principal = schemas.UserData.model_validate(user)
+    exp = payload.get("exp")
+    if exp is not None:
+        # Never serve a cached principal past the token's own expiry
+        principal_cache.set(token, principal, ttl=exp - time.time(), tag=payload["sub"])
+    return principal
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    payload = _decode_token(token)
+    user = crud.get_user_by_email(db, email=payload["sub"])
+    if user is None:
+        raise _credentials_exception()
+    return _remember_principal(token, payload, user)
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    payload = _decode_token(token)
+    user = await async_crud.get_user_by_email(db, email=payload["sub"])
     if user is None:
-        raise credentials_exception
-    return user
+        raise _credentials_exception()
+    return _remember_principal(token, payload, user)
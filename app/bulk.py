@@ -0,0 +1,35 @@
+from typing import Any, Dict, List, Tuple, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from . import schemas
+
+MAX_BULK_ITEMS = 1000
+
+
+def validate_items(raw_items: List[Any], model: Type[BaseModel]) -> Tuple[List[Tuple[int, BaseModel]], Dict[int, schemas.BulkItemResult]]:
+    """Validate every item of a bulk request in one pass.
+
+    Returns the valid items with their position in the request, and a failed
+    result for each invalid one, so a single bad row does not reject the batch.
+    """
+    if len(raw_items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} items per request")
+    valid, failed = [], {}
+    for index, raw in enumerate(raw_items):
+        try:
+            valid.append((index, model.model_validate(raw)))
+        except ValidationError as e:
+            failed[index] = schemas.BulkItemResult(
+                index=index, success=False, error=e.errors(include_url=False, include_context=False)
+            )
+    return valid, failed
+
+
+def collect_results(count: int, created: Dict[int, int], failed: Dict[int, schemas.BulkItemResult]) -> List[schemas.BulkItemResult]:
+    """Per-item results in request order from the created ids and failures."""
+    return [
+        failed.get(index) or schemas.BulkItemResult(index=index, success=True, id=created[index])
+        for index in range(count)
+    ]
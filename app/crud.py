@@ -1,24 +1,11 @@
-from sqlalchemy.orm import Session
-from . import models, schemas
-from sqlalchemy import func
-from passlib.context import CryptContext
-from typing import Optional
-from datetime import date   
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def verify_password(plain_password, hashed_password):
-    if len(plain_password.encode('utf-8')) > 72:
-        print("WARNING: Password provided is > 72 bytes. This will fail with bcrypt. Truncating for check (or returning False).")
-        return False
-        
-    try:
-        return pwd_context.verify(plain_password, hashed_password)
-    except Exception as e:
-        print(f"Error verifying password: {e}")
-        return False
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
+from sqlalchemy.orm import Session, selectinload
+from . import models, rollups, schemas, sync
+from .pagination import after_cursor
+from .cache import principal_cache
+from .passwords import hash_in_pool
+from sqlalchemy import func, insert, select, update
+from typing import List, Optional
+from datetime import date, datetime, time, timedelta
 
 # --- User ---
 def get_user(db: Session, user_id: int):
@@ -28,7 +15,7 @@ def get_user_by_email(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
 
 def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password_val = get_password_hash(user.password)
+    hashed_password_val = hash_in_pool(user.password)
     db_user = models.User(
         email=user.email, 
         password=hashed_password_val, 
@@ -40,15 +27,31 @@ def create_user(db: Session, user: schemas.UserCreate):
     db.refresh(db_user)
     return db_user
 
+def update_user(db: Session, db_user: models.User, updates: schemas.UserUpdateRequest):
+    for field, value in updates.model_dump(exclude_unset=True).items():
+        setattr(db_user, field, value)
+    db.commit()
+    db.refresh(db_user)
+    # Cached principals carry profile fields, so drop them for this user
+    principal_cache.invalidate_tag(db_user.email)
+    return db_user
+
 # --- Categories ---
-def get_categories(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.Category).filter(models.Category.user_id == user_id, models.Category.is_deleted == False).offset(skip).limit(limit).all()
+def get_categories(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Category).filter(models.Category.user_id == user_id, models.Category.is_deleted == False)
+    query = query.order_by(models.Category.id)
+    if cursor:
+        query = after_cursor(query, cursor, models.Category.id, descending=False)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 def create_user_category(db: Session, category: schemas.CategoryCreate, user_id: int):
     db_category = models.Category(
         category_name=category.category_name,
         user_id=user_id,
-        is_deleted=category.is_deleted
+        is_deleted=category.is_deleted,
+        version=sync.next_version(db, user_id)
     )
     db.add(db_category)
     db.commit()
@@ -56,8 +59,14 @@ def create_user_category(db: Session, category: schemas.CategoryCreate, user_id:
     return db_category
 
 # --- Income ---
-def get_incomes(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.Income).filter(models.Income.user_id == user_id).offset(skip).limit(limit).all()
+def get_incomes(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Income).filter(models.Income.user_id == user_id)
+    query = query.order_by(models.Income.date.desc(), models.Income.id.desc())
+    if cursor:
+        query = after_cursor(query, cursor, models.Income.date, models.Income.id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 def create_user_income(db: Session, income: schemas.IncomeCreate, user_id: int):
     # category_id removed from Income model
@@ -65,27 +74,82 @@ def create_user_income(db: Session, income: schemas.IncomeCreate, user_id: int):
         amount=income.amount, 
         source=income.source, 
         type=income.type,
+        currency=income.currency,
         date=income.date,
-        user_id=user_id
+        user_id=user_id,
+        version=sync.next_version(db, user_id)
     )
     db.add(db_income)
     db.commit()
     db.refresh(db_income)
     return db_income
 
+def bulk_create_user_incomes(db: Session, incomes: List[schemas.IncomeCreate], user_id: int) -> List[int]:
+    """Insert many incomes with one multi-row INSERT in a single transaction; returns ids in input order."""
+    if not incomes:
+        return []
+    now = datetime.utcnow()
+    version = sync.next_version(db, user_id)
+    rows = [
+        {
+            "amount": income.amount,
+            "source": income.source,
+            "type": income.type,
+            "currency": income.currency,
+            "date": income.date or now,
+            "user_id": user_id,
+            "version": version,
+        }
+        for income in incomes
+    ]
+    ids = db.scalars(insert(models.Income).returning(models.Income.id, sort_by_parameter_order=True), rows).all()
+    db.commit()
+    return list(ids)
+
+def _finish(db: Session, instance, commit: bool):
+    """Commit and reload, or with commit=False just flush so the caller can batch writes into its own transaction."""
+    if commit:
+        db.commit()
+        db.refresh(instance)
+    else:
+        db.flush()
+
 # --- Spending ---
-def get_spendings(db: Session, user_id: int, skip: int = 0, limit: int = 100, start_date: Optional[date] = None,
-    end_date: Optional[date] = None, category_id: Optional[int] = None):
-    query = db.query(models.Spending).filter(models.Spending.user_id == user_id, models.Spending.is_deleted == False)
+# What rollups.delta reads from a spending row
+SPENDING_ROLLUP_COLUMNS = (
+    models.Spending.id,
+    models.Spending.user_id,
+    models.Spending.category_id,
+    models.Spending.currency,
+    models.Spending.date,
+    models.Spending.amount,
+)
+
+def filter_spendings(query, user_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None,
+    category_id: Optional[int] = None):
+    query = query.filter(models.Spending.user_id == user_id, models.Spending.is_deleted == False)
+    # Half-open [start, end + 1 day) ranges on the raw column so the
+    # (user_id, is_deleted, date) index can be used.
     if start_date:
-        query = query.filter(func.date(models.Spending.date) >= start_date)
+        query = query.filter(models.Spending.date >= datetime.combine(start_date, time.min))
     if end_date:
-        query = query.filter(func.date(models.Spending.date) <= end_date)
+        query = query.filter(models.Spending.date < datetime.combine(end_date + timedelta(days=1), time.min))
     if category_id:
         query = query.filter(models.Spending.category_id == category_id)
-    return query.offset(skip).limit(limit).all()
+    return query
+
+def get_spendings(db: Session, user_id: int, skip: int = 0, limit: int = 100, start_date: Optional[date] = None,
+    end_date: Optional[date] = None, category_id: Optional[int] = None, cursor: Optional[str] = None):
+    query = filter_spendings(db.query(models.Spending), user_id, start_date, end_date, category_id)
+    # Newest first; id breaks ties so keyset pages never skip or repeat rows.
+    query = query.order_by(models.Spending.date.desc(), models.Spending.id.desc())
+    if cursor:
+        query = after_cursor(query, cursor, models.Spending.date, models.Spending.id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
-def create_user_spending(db: Session, spending: schemas.SpendingCreate, user_id: int):
+def create_user_spending(db: Session, spending: schemas.SpendingCreate, user_id: int, client_id: Optional[str] = None, commit: bool = True):
     # description -> notes, added item_name, is_deleted
     db_spending = models.Spending(
         amount=spending.amount,
@@ -94,21 +158,165 @@ def create_user_spending(db: Session, spending: schemas.SpendingCreate, user_id:
         date=spending.date,
         category_id=spending.category_id,
         is_deleted=spending.is_deleted,
-        user_id=user_id
+        currency=spending.currency,
+        user_id=user_id,
+        client_id=client_id,
+        version=sync.next_version(db, user_id)
     )
     db.add(db_spending)
-    db.commit()
-    db.refresh(db_spending)
+    db.flush()  # fills in the date default
+    if not db_spending.is_deleted:
+        rollups.record(db, [rollups.delta(db_spending)])
+    _finish(db, db_spending, commit)
     return db_spending
 
-def delete_user_spending(db: Session, spending_id: int):
-    db.query(models.Spending).filter(models.Spending.id == spending_id).update({"is_deleted": True})
+def get_user_category_ids(db: Session, user_id: int, category_ids) -> set:
+    """The subset of category_ids that exist and belong to the user."""
+    if not category_ids:
+        return set()
+    rows = db.query(models.Category.id).filter(models.Category.user_id == user_id, models.Category.id.in_(category_ids)).all()
+    return {category_id for (category_id,) in rows}
+
+def bulk_create_user_spendings(db: Session, spendings: List[schemas.SpendingCreate], user_id: int) -> List[int]:
+    """Insert many spendings with one multi-row INSERT in a single transaction; returns ids in input order."""
+    if not spendings:
+        return []
+    now = datetime.utcnow()
+    version = sync.next_version(db, user_id)
+    rows = [
+        {
+            "amount": spending.amount,
+            "notes": spending.notes,
+            "item_name": spending.item_name,
+            "date": spending.date or now,
+            "category_id": spending.category_id,
+            "is_deleted": spending.is_deleted,
+            "currency": spending.currency,
+            "user_id": user_id,
+            "version": version,
+        }
+        for spending in spendings
+    ]
+    inserted = db.execute(
+        insert(models.Spending).returning(*SPENDING_ROLLUP_COLUMNS, models.Spending.is_deleted, sort_by_parameter_order=True),
+        rows
+    ).all()
+    rollups.record(db, [rollups.delta(row) for row in inserted if not row.is_deleted])
     db.commit()
-    return True
+    return [row.id for row in inserted]
+
+def bulk_delete_user_spendings(db: Session, spending_ids: List[int], user_id: int) -> set:
+    """Soft-delete the user's spendings among spending_ids in one UPDATE; returns the ids found."""
+    if not spending_ids:
+        return set()
+    # Only rows that were live leave the rollups; the conditional UPDATE
+    # makes that exact even when two requests delete the same rows.
+    newly_deleted = db.execute(
+        update(models.Spending)
+        .where(models.Spending.user_id == user_id, models.Spending.id.in_(spending_ids), models.Spending.is_deleted == False)
+        .values(is_deleted=True, version=sync.next_version(db, user_id))
+        .returning(*SPENDING_ROLLUP_COLUMNS)
+        .execution_options(synchronize_session=False)
+    ).all()
+    rollups.record(db, [rollups.delta(row, -1) for row in newly_deleted])
+    deleted = db.scalars(
+        select(models.Spending.id)
+        .where(models.Spending.user_id == user_id, models.Spending.id.in_(spending_ids), models.Spending.is_deleted == True)
+    ).all()
+    db.commit()
+    return set(deleted)
+
+def _get_user_spending_for_update(db: Session, spending_id: int, user_id: int):
+    # Row lock so concurrent writes to the same spending adjust the rollups one at a time
+    return (
+        db.query(models.Spending)
+        .filter(models.Spending.id == spending_id, models.Spending.user_id == user_id)
+        .with_for_update()
+        .first()
+    )
+
+def update_user_spending(db: Session, spending_id: int, spending: schemas.SpendingUpdate, user_id: int, commit: bool = True):
+    db_spending = _get_user_spending_for_update(db, spending_id, user_id)
+    if db_spending is None:
+        return None
+    deltas = [] if db_spending.is_deleted else [rollups.delta(db_spending, -1)]
+    for field, value in spending.model_dump(exclude={"id"}, exclude_unset=True).items():
+        if field == "date" and value is None:
+            continue
+        setattr(db_spending, field, value)
+    # Covers restoring a soft-deleted spending (is_deleted=False) as well
+    if not db_spending.is_deleted:
+        deltas.append(rollups.delta(db_spending))
+    db_spending.version = sync.next_version(db, user_id)
+    rollups.record(db, deltas)
+    _finish(db, db_spending, commit)
+    return db_spending
+
+def delete_user_spending(db: Session, spending_id: int, user_id: int, commit: bool = True):
+    db_spending = _get_user_spending_for_update(db, spending_id, user_id)
+    if db_spending is None:
+        return None
+    if not db_spending.is_deleted:
+        db_spending.is_deleted = True
+        db_spending.version = sync.next_version(db, user_id)
+        rollups.record(db, [rollups.delta(db_spending, -1)])
+    _finish(db, db_spending, commit)
+    return db_spending
 
 # --- Savings ---
-def get_savings_goals(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.SavingsGoal).filter(models.SavingsGoal.user_id == user_id).offset(skip).limit(limit).all()
+def get_savings_goals(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.SavingsGoal).filter(models.SavingsGoal.user_id == user_id)
+    # One extra IN query for every goal's contributions instead of a lazy load per goal
+    query = query.options(selectinload(models.SavingsGoal.savings_contributions))
+    query = query.order_by(models.SavingsGoal.created_at.desc(), models.SavingsGoal.id.desc())
+    if cursor:
+        query = after_cursor(query, cursor, models.SavingsGoal.created_at, models.SavingsGoal.id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+def get_savings_progress(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    """Goals with their contribution totals, aggregated in the same query instead of loading contributions."""
+    goal = models.SavingsGoal
+    contribution = models.SavingsContribution
+    total = func.coalesce(func.sum(contribution.amount), 0.0)
+    query = (
+        db.query(goal, total, func.count(contribution.id))
+        .outerjoin(contribution, contribution.goal_id == goal.id)
+        .filter(goal.user_id == user_id)
+        .group_by(goal.id)
+        .order_by(goal.created_at.desc(), goal.id.desc())
+    )
+    if cursor:
+        query = after_cursor(query, cursor, goal.created_at, goal.id)
+    else:
+        query = query.offset(skip)
+    return [
+        schemas.SavingsGoalProgress(
+            id=db_goal.id,
+            user_id=db_goal.user_id,
+            goal_name=db_goal.goal_name,
+            target_amount=db_goal.target_amount,
+            deadline=db_goal.deadline,
+            created_at=db_goal.created_at,
+            total_contributed=total_contributed,
+            contribution_count=contribution_count,
+            percent_complete=round(total_contributed / db_goal.target_amount * 100, 2) if db_goal.target_amount else 0.0,
+        )
+        for db_goal, total_contributed, contribution_count in query.limit(limit)
+    ]
+
+def get_user_savings_goal(db: Session, goal_id: int, user_id: int):
+    return db.query(models.SavingsGoal).filter(models.SavingsGoal.id == goal_id, models.SavingsGoal.user_id == user_id).first()
+
+def get_savings_contributions(db: Session, goal_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.SavingsContribution).filter(models.SavingsContribution.goal_id == goal_id)
+    query = query.order_by(models.SavingsContribution.date.desc(), models.SavingsContribution.id.desc())
+    if cursor:
+        query = after_cursor(query, cursor, models.SavingsContribution.date, models.SavingsContribution.id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 def create_user_savings_goal(db: Session, goal: schemas.SavingsGoalCreate, user_id: int):
     # title -> goal_name, current_amount removed
@@ -116,7 +324,8 @@ def create_user_savings_goal(db: Session, goal: schemas.SavingsGoalCreate, user_
         goal_name=goal.goal_name,
         target_amount=goal.target_amount,
         deadline=goal.deadline,
-        user_id=user_id
+        user_id=user_id,
+        version=sync.next_version(db, user_id)
     )
     db.add(db_goal)
     db.commit()
@@ -134,7 +343,8 @@ def create_savings_contribution(db: Session, contribution: schemas.SavingsContri
         amount=contribution.amount,
         date=contribution.date,
         goal_id=goal_id,
-        user_id=user_id
+        user_id=user_id,
+        version=sync.next_version(db, user_id)
     )
     db.add(db_contribution)
     db.commit()
@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .metrics import Histogram
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes", "on")
+
+
+def pool_options(url: str, pool_class=QueuePool) -> dict:
+    """create_engine() pool arguments from DB_POOL_* environment settings.
+
+    Defaults suit Cloud Run: pre-ping drops connections the database closed
+    while the instance was idle, and recycling retires them before any
+    server-side idle timeout does.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite is bound to a single connection; keep SQLAlchemy's pool
+        return {}
+    return {
+        "poolclass": INSTRUMENTED_POOLS[pool_class],
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", "true"),
+    }
+
+
+class PoolStats:
+    """Checkout counters and latency for one pool (reset if the pool is recreated)."""
+
+    def __init__(self):
+        self.checkout_latency = Histogram()
+        self.timeouts = 0
+        self.in_wait = 0
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> dict:
+        return {
+            "waiting": self.in_wait,
+            "timeouts": self.timeouts,
+            "checkout_latency_seconds": self.checkout_latency.snapshot(),
+        }
+
+
+class _TimedCheckout:
+    """Records how long each checkout takes, including waiting for a free
+    connection, connecting and pre-ping."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        stats = self.stats
+        with stats._lock:
+            stats.in_wait += 1
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            with stats._lock:
+                stats.timeouts += 1
+            raise
+        finally:
+            stats.checkout_latency.observe(time.perf_counter() - start)
+            with stats._lock:
+                stats.in_wait -= 1
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+INSTRUMENTED_POOLS = {QueuePool: InstrumentedQueuePool, AsyncAdaptedQueuePool: InstrumentedAsyncQueuePool}
+
+
+def pool_status(engine) -> dict:
+    """Live view of an engine's pool for the stats endpoint."""
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+            "recycle_seconds": pool._recycle,
+            "pre_ping": pool._pre_ping,
+        })
+    if isinstance(pool, _TimedCheckout):
+        status.update(pool.stats.snapshot())
+    return status
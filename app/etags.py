@@ -0,0 +1,78 @@
+"""Conditional GET for the list endpoints.
+
+A list's ETag is derived from the highest change version (see app/sync.py)
+among the user's rows of that resource, plus the query string. Every crud
+write takes a new version, so any change to the resource changes the tag.
+The version lookup is a MAX over the (user_id, synced) index; when the
+client's If-None-Match still matches, the route answers 304 Not Modified
+before the list query runs or anything is serialized.
+
+    @router.get("/", dependencies=[Depends(etags.list_etag(models.Spending))])
+"""
+import hashlib
+from datetime import date
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from . import schemas
+from .auth import get_current_user, get_current_user_async
+from .database import get_async_db, get_db
+
+
+def versions_statement(user_id: int, resource_models):
+    """One round trip for the latest version of each model."""
+    return select(*(
+        select(func.coalesce(func.max(model.version), 0)).where(model.user_id == user_id).scalar_subquery()
+        for model in resource_models
+    ))
+
+
+def make_etag(user_id: int, version: int, request: Request) -> str:
+    # Defaults such as the spending date window are relative to today
+    key = f"{user_id}:{version}:{date.today()}:{request.url.path}?{request.url.query}"
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def matches(request: Request, etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 requires for GET)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def _check(request: Request, response: Response, user_id: int, versions) -> str:
+    etag = make_etag(user_id, max(versions), request)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if matches(request, etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return etag
+
+
+def list_etag(*resource_models):
+    """Route dependency: 304 when the client's copy of these models is current, else set the ETag."""
+    def dependency(request: Request, response: Response, db: Session = Depends(get_db),
+                   current_user: schemas.UserData = Depends(get_current_user)) -> str:
+        versions = db.execute(versions_statement(current_user.id, resource_models)).one()
+        return _check(request, response, current_user.id, versions)
+    return dependency
+
+
+def list_etag_async(*resource_models):
+    """list_etag for the DB_MODE=async routers."""
+    async def dependency(request: Request, response: Response, db: AsyncSession = Depends(get_async_db),
+                         current_user: schemas.UserData = Depends(get_current_user_async)) -> str:
+        versions = (await db.execute(versions_statement(current_user.id, resource_models))).one()
+        return _check(request, response, current_user.id, versions)
+    return dependency
@@ -1,8 +1,11 @@
+import math
+
 
 class AppException(Exception):
-    def __init__(self, message: str, status_code: int = 500):
+    def __init__(self, message: str, status_code: int = 500, headers: dict = None):
         self.message = message
         self.status_code = status_code
+        self.headers = headers
         super().__init__(self.message)
 
 class UserAlreadyExistsException(AppException):
@@ -18,4 +21,25 @@ class DatabaseException(AppException):
 
 class AuthenticationException(AppException):
     def __init__(self, message: str = "Authentication failed"):
-        super().__init__(message=message, status_code=401)
\ No newline at end of file
+        super().__init__(message=message, status_code=401)
+
+class ServiceUnavailableException(AppException):
+    def __init__(self, message: str = "Service temporarily unavailable"):
+        super().__init__(message=message, status_code=503)
+
+class RateLimitExceededException(AppException):
+    def __init__(self, retry_after: float):
+        super().__init__(
+            message="Too many attempts. Please retry later.",
+            status_code=429,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+class InvalidCursorException(AppException):
+    def __init__(self, message: str = "Invalid pagination cursor"):
+        super().__init__(message=message, status_code=400)
+
+class MissingExchangeRateException(AppException):
+    def __init__(self, pairs):
+        missing = ", ".join(f"{from_currency}->{to_currency} on {day}" for from_currency, to_currency, day in pairs)
+        super().__init__(message=f"No exchange rate for {missing}", status_code=400)
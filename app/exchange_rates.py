@@ -0,0 +1,194 @@
+"""Historical exchange rates.
+
+exchange_rates holds one rate per (from, to, as_of); a rate applies from its
+as_of date until the next one for the same pair. Rates come from a local
+file, there is no live FX feed:
+
+    python -m app.exchange_rates load rates.csv
+
+The file has ``from_currency,to_currency,as_of,rate`` columns (CSV, or a JSON
+list of objects with those keys). Each line also implies the inverse rate
+unless the file gives that pair for the same day explicitly.
+
+Aggregates are converted in SQL (``rate_to`` joins each rollup day or income
+row to its as-of rate), and ``missing_rates`` checks coverage with the same
+expression, so the check and the conversion always see the same rates, even
+right after another process loaded new ones. ``rate_cache`` keeps every rate
+in memory, sorted by date per pair, for as-of lookups in Python without a
+query.
+"""
+import argparse
+import bisect
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import case, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from . import models
+
+load_dotenv()
+
+FX_CACHE_TTL_SECONDS = float(os.getenv("FX_CACHE_TTL_SECONDS", "300"))
+
+DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+Pair = Tuple[models.Currency, models.Currency]
+
+
+class RateTable:
+    """Immutable snapshot of every rate, with bisect lookups by date."""
+
+    def __init__(self, rates: Iterable[tuple]):
+        series: Dict[Pair, list] = {}
+        for from_currency, to_currency, as_of, rate in sorted(rates, key=lambda r: r[2]):
+            series.setdefault((models.Currency(from_currency), models.Currency(to_currency)), []).append((as_of, rate))
+        self._dates = {pair: [as_of for as_of, _ in points] for pair, points in series.items()}
+        self._rates = {pair: [rate for _, rate in points] for pair, points in series.items()}
+
+    def rate(self, from_currency, to_currency, on: date) -> Optional[float]:
+        """The rate in effect on ``on`` (latest as_of on or before it), or None if there is none yet."""
+        pair = (models.Currency(from_currency), models.Currency(to_currency))
+        if isinstance(on, datetime):
+            on = on.date()
+        if pair[0] == pair[1]:
+            return 1.0
+        dates = self._dates.get(pair)
+        if not dates:
+            return None
+        index = bisect.bisect_right(dates, on)
+        return self._rates[pair][index - 1] if index else None
+
+    def __len__(self):
+        return sum(len(dates) for dates in self._dates.values())
+
+
+class RateCache:
+    """Process-wide RateTable, reloaded from the database after ``ttl`` seconds or on invalidate()."""
+
+    def __init__(self, ttl: float = FX_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._table: Optional[RateTable] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def table(self, db: Session) -> RateTable:
+        table = self._table
+        if table is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return table
+        with self._lock:
+            if self._table is None or time.monotonic() - self._loaded_at >= self.ttl:
+                rows = db.execute(select(
+                    models.ExchangeRate.from_currency, models.ExchangeRate.to_currency,
+                    models.ExchangeRate.as_of, models.ExchangeRate.rate,
+                ))
+                # Swapped in whole, so readers never see a half-built table
+                self._table = RateTable(rows)
+                self._loaded_at = time.monotonic()
+            return self._table
+
+    def invalidate(self) -> None:
+        self._table = None
+
+
+rate_cache = RateCache()
+
+
+def rate_to(currency_column, day_column, to_currency: models.Currency):
+    """SQL expression for the rate converting ``currency_column`` into ``to_currency`` as of ``day_column``."""
+    rate = models.ExchangeRate
+    as_of_rate = (
+        select(rate.rate)
+        .where(rate.from_currency == currency_column, rate.to_currency == to_currency, rate.as_of <= day_column)
+        .order_by(rate.as_of.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return case((currency_column == to_currency, 1.0), else_=as_of_rate)
+
+
+def missing_rates(db: Session, first_days, to_currency: models.Currency) -> List[tuple]:
+    """(from, to, day) for each currency whose earliest day has no rate into to_currency yet.
+
+    ``first_days`` selects (currency, first day) per currency. Rates only ever
+    start, never stop, so a rate on a currency's first day covers every later
+    day too.
+    """
+    firsts = first_days.subquery()
+    currency, day = firsts.c
+    stmt = select(currency, day).where(rate_to(currency, day, to_currency).is_(None))
+    return [(models.Currency(c).value, to_currency.value, d) for c, d in db.execute(stmt)]
+
+
+# --- Loading ---
+def read_rates_file(path: str) -> List[dict]:
+    with open(path, newline="", encoding="utf-8") as f:
+        raw = json.load(f) if path.endswith(".json") else list(csv.DictReader(f))
+    rates = {}
+    for line, item in enumerate(raw, start=1):
+        try:
+            key = (models.Currency(item["from_currency"].strip().upper()),
+                   models.Currency(item["to_currency"].strip().upper()),
+                   date.fromisoformat(str(item["as_of"]).strip()))
+            value = float(item["rate"])
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"{path}, entry {line}: {e}")
+        if value <= 0:
+            raise ValueError(f"{path}, entry {line}: rate must be positive")
+        rates[key] = value
+    for (from_currency, to_currency, as_of), value in list(rates.items()):
+        rates.setdefault((to_currency, from_currency, as_of), 1 / value)
+    return [
+        {"from_currency": f, "to_currency": t, "as_of": as_of, "rate": value}
+        for (f, t, as_of), value in rates.items()
+    ]
+
+
+def load_rates(db: Session, rates: List[dict], batch_size: int = 1000) -> int:
+    """Insert or update rates by (from, to, as_of) in one transaction; returns the number written."""
+    dialect = db.get_bind().dialect.name
+    if dialect not in DIALECT_INSERTS:
+        raise ValueError(f"Loading rates is not supported on '{dialect}' databases")
+    table = models.ExchangeRate
+    for start in range(0, len(rates), batch_size):
+        stmt = DIALECT_INSERTS[dialect](table).values(rates[start:start + batch_size])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[table.from_currency, table.to_currency, table.as_of],
+            set_={"rate": stmt.excluded.rate, "updated_at": datetime.utcnow()},
+        ))
+    db.commit()
+    rate_cache.invalidate()
+    return len(rates)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.exchange_rates", description="Load historical exchange rates from a file.")
+    parser.add_argument("command", choices=["load"])
+    parser.add_argument("path", help="CSV or JSON file of from_currency, to_currency, as_of, rate")
+    args = parser.parse_args(argv)
+
+    from .database import SessionLocal
+
+    try:
+        rates = read_rates_file(args.path)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    db = SessionLocal()
+    try:
+        print(f"Loaded {load_rates(db, rates)} rates (inverse pairs included)")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
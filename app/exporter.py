@@ -0,0 +1,115 @@
+"""Streaming transaction export.
+
+Rows are selected as plain column tuples (no ORM entities, so no identity
+map) and fetched ``EXPORT_FETCH_SIZE`` at a time from a server-side cursor,
+then encoded into CSV or NDJSON chunks as they arrive. Nothing ever holds
+the full result, so memory stays bounded however long the history is.
+"""
+import csv
+import io
+import itertools
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import models
+
+EXPORT_FETCH_SIZE = 1000
+EXPORT_CHUNK_ROWS = 500
+
+EXPORT_COLUMNS = ("kind", "id", "date", "amount", "currency", "description", "category", "notes")
+
+
+def _date_range(stmt, column, start_date: Optional[date], end_date: Optional[date]):
+    if start_date:
+        stmt = stmt.where(column >= datetime.combine(start_date, time.min))
+    if end_date:
+        stmt = stmt.where(column < datetime.combine(end_date + timedelta(days=1), time.min))
+    return stmt
+
+
+def spending_rows(db: Session, user_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Iterator[tuple]:
+    stmt = (
+        select(
+            models.Spending.id,
+            models.Spending.date,
+            models.Spending.amount,
+            models.Spending.currency,
+            models.Spending.item_name,
+            models.Category.category_name,
+            models.Spending.notes,
+        )
+        .outerjoin(models.Category, models.Spending.category_id == models.Category.id)
+        .where(models.Spending.user_id == user_id, models.Spending.is_deleted == False)
+        .order_by(models.Spending.date, models.Spending.id)
+    )
+    stmt = _date_range(stmt, models.Spending.date, start_date, end_date)
+    for row in db.execute(stmt.execution_options(yield_per=EXPORT_FETCH_SIZE)):
+        yield ("spending",) + tuple(row)
+
+
+def income_rows(db: Session, user_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Iterator[tuple]:
+    stmt = (
+        select(
+            models.Income.id,
+            models.Income.date,
+            models.Income.amount,
+            models.Income.currency,
+            models.Income.source,
+            models.Income.type,
+        )
+        .where(models.Income.user_id == user_id)
+        .order_by(models.Income.date, models.Income.id)
+    )
+    stmt = _date_range(stmt, models.Income.date, start_date, end_date)
+    for row in db.execute(stmt.execution_options(yield_per=EXPORT_FETCH_SIZE)):
+        # income has no category; its type goes in the notes column
+        row_id, row_date, amount, currency, source, income_type = row
+        yield ("income", row_id, row_date, amount, currency, source, None, income_type)
+
+
+def _plain(row: tuple) -> tuple:
+    """JSON/CSV-ready copy of an export row (date and currency as strings)."""
+    kind, row_id, row_date, amount, currency, description, category, notes = row
+    return (
+        kind,
+        row_id,
+        row_date.isoformat() if row_date is not None else None,
+        amount,
+        currency.value if currency is not None else None,
+        description,
+        category,
+        notes,
+    )
+
+
+def encode_csv(rows: Iterable[tuple]) -> Iterator[str]:
+    """CSV text in chunks of EXPORT_CHUNK_ROWS rows, header first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    rows = iter(rows)
+    while chunk := list(itertools.islice(rows, EXPORT_CHUNK_ROWS)):
+        writer.writerows(map(_plain, chunk))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def encode_ndjson(rows: Iterable[tuple]) -> Iterator[str]:
+    """One JSON object per line, in chunks of EXPORT_CHUNK_ROWS rows."""
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    rows = iter(rows)
+    while chunk := list(itertools.islice(rows, EXPORT_CHUNK_ROWS)):
+        yield "".join(encode(dict(zip(EXPORT_COLUMNS, _plain(row)))) + "\n" for row in chunk)
+
+
+ENCODERS = {
+    "csv": (encode_csv, "text/csv"),
+    "ndjson": (encode_ndjson, "application/x-ndjson"),
+}
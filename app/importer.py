@@ -0,0 +1,226 @@
+"""Streaming bank-statement import.
+
+A CSV statement flows through a chain of generators, one row at a time:
+
+    read_rows -> map_columns -> resolve_categories -> batched -> dedupe -> insert
+
+Only the current batch is ever held in memory, and each batch is committed
+on its own, so a statement of any size imports in flat memory without one
+long-running transaction. Progress and row-level errors are yielded as
+events while the import runs.
+"""
+import codecs
+import csv
+import itertools
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Union
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from . import crud, models, schemas
+
+IMPORT_BATCH_SIZE = 500
+
+
+@dataclass
+class ColumnMapping:
+    """Which statement columns hold which transaction fields."""
+    date: str = "date"
+    amount: str = "amount"
+    description: str = "description"
+    category: Optional[str] = None
+    notes: Optional[str] = None
+    date_format: Optional[str] = None
+    # Bank exports usually show money going out as negative amounts
+    negative_is_spending: bool = True
+
+
+@dataclass
+class ParsedRow:
+    line: int
+    kind: str  # "spending" or "income"
+    date: datetime
+    amount: float
+    description: str
+    notes: Optional[str] = None
+    category_name: Optional[str] = None
+    category_id: Optional[int] = None
+
+    def fingerprint(self):
+        return (self.kind, self.date, round(self.amount, 2), self.description)
+
+
+@dataclass
+class RowError:
+    line: int
+    error: str
+
+
+def read_rows(binary_file: IO[bytes], encoding: str = "utf-8-sig") -> Iterator[tuple]:
+    """Yield (line number, row dict) straight off the uploaded file."""
+    text = codecs.getreader(encoding)(binary_file, errors="replace")
+    reader = csv.DictReader(text)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _parse_amount(raw: str) -> float:
+    value = raw.strip().replace(",", "")
+    for symbol in ("₦", "$", "£", "€", "¥"):
+        value = value.replace(symbol, "")
+    if value.startswith("(") and value.endswith(")"):
+        value = "-" + value[1:-1]
+    amount = float(value)
+    if not math.isfinite(amount):
+        raise ValueError(f"amount {raw.strip()!r} is not a finite number")
+    return amount
+
+
+def _parse_date(raw: str, date_format: Optional[str]) -> datetime:
+    raw = raw.strip()
+    return datetime.strptime(raw, date_format) if date_format else datetime.fromisoformat(raw)
+
+
+def _optional(row: dict, column: Optional[str]) -> Optional[str]:
+    value = (row.get(column) or "").strip() if column else ""
+    return value or None
+
+
+def map_columns(rows: Iterable[tuple], mapping: ColumnMapping) -> Iterator[Union[ParsedRow, RowError]]:
+    for line, row in rows:
+        try:
+            amount = _parse_amount(row[mapping.amount] or "")
+            date = _parse_date(row[mapping.date] or "", mapping.date_format)
+        except KeyError as e:
+            yield RowError(line, f"Missing column {e.args[0]!r}")
+            continue
+        except ValueError as e:
+            yield RowError(line, f"Could not parse row: {e}")
+            continue
+        if amount == 0:
+            yield RowError(line, "Zero amount")
+            continue
+        is_spending = (amount < 0) == mapping.negative_is_spending
+        yield ParsedRow(
+            line=line,
+            kind="spending" if is_spending else "income",
+            date=date,
+            amount=abs(amount),
+            description=_optional(row, mapping.description) or "",
+            notes=_optional(row, mapping.notes),
+            category_name=_optional(row, mapping.category),
+        )
+
+
+def resolve_categories(items: Iterable[Union[ParsedRow, RowError]], db: Session, user_id: int) -> Iterator[Union[ParsedRow, RowError]]:
+    """Attach category ids by name, creating categories the user does not have yet."""
+    by_name: Dict[str, int] = {
+        c.category_name.lower(): c.id
+        for c in db.query(models.Category).filter(models.Category.user_id == user_id, models.Category.is_deleted == False)
+        if c.category_name
+    }
+    for item in items:
+        if isinstance(item, ParsedRow) and item.kind == "spending" and item.category_name:
+            key = item.category_name.lower()
+            if key not in by_name:
+                category = crud.create_user_category(db, schemas.CategoryCreate(category_name=item.category_name), user_id)
+                by_name[key] = category.id
+            item.category_id = by_name[key]
+        yield item
+
+
+def batched(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+@dataclass
+class DedupeState:
+    """Rows stored before the import began, and how many of them the file has matched."""
+    last_spending_id: int
+    last_income_id: int
+    used: Counter = field(default_factory=Counter)
+
+
+def start_dedupe(db: Session, user_id: int) -> DedupeState:
+    last_spending_id = db.query(func.max(models.Spending.id)).filter(models.Spending.user_id == user_id).scalar()
+    last_income_id = db.query(func.max(models.Income.id)).filter(models.Income.user_id == user_id).scalar()
+    return DedupeState(last_spending_id or 0, last_income_id or 0)
+
+
+def dedupe(batch: List[ParsedRow], db: Session, user_id: int, state: DedupeState) -> tuple:
+    """Split a batch into new rows and rows already stored before this import.
+
+    Matching is by count: a row is a duplicate only while its fingerprint has
+    stored rows not yet matched by earlier rows in the file. A re-imported
+    file is skipped entirely, but two identical charges on one day in the same
+    statement both import. Only rows that existed when the import started are
+    counted, so rows committed by earlier batches never match later ones, and
+    only matched fingerprints are remembered, not every row seen.
+    """
+    if not batch:
+        return [], []
+    dates = {row.date for row in batch}
+    stored = Counter()
+    spending_rows = db.query(models.Spending.date, models.Spending.amount, models.Spending.item_name).filter(
+        models.Spending.user_id == user_id, models.Spending.is_deleted == False, models.Spending.date.in_(dates),
+        models.Spending.id <= state.last_spending_id,
+    )
+    stored.update(("spending", d, round(a, 2), n or "") for d, a, n in spending_rows)
+    income_rows = db.query(models.Income.date, models.Income.amount, models.Income.source).filter(
+        models.Income.user_id == user_id, models.Income.date.in_(dates),
+        models.Income.id <= state.last_income_id,
+    )
+    stored.update(("income", d, round(a, 2), s or "") for d, a, s in income_rows)
+
+    fresh, duplicates = [], []
+    for row in batch:
+        key = row.fingerprint()
+        if state.used[key] < stored[key]:
+            state.used[key] += 1
+            duplicates.append(row)
+        else:
+            fresh.append(row)
+    return fresh, duplicates
+
+
+def insert_batch(rows: List[ParsedRow], db: Session, user_id: int) -> int:
+    spendings = [
+        schemas.SpendingCreate(amount=r.amount, item_name=r.description, notes=r.notes, date=r.date, category_id=r.category_id)
+        for r in rows if r.kind == "spending"
+    ]
+    incomes = [
+        schemas.IncomeCreate(amount=r.amount, source=r.description, type="import", date=r.date)
+        for r in rows if r.kind == "income"
+    ]
+    # Each call commits, so every batch is its own short transaction
+    return (len(crud.bulk_create_user_spendings(db, spendings, user_id))
+            + len(crud.bulk_create_user_incomes(db, incomes, user_id)))
+
+
+def import_statement(binary_file: IO[bytes], mapping: ColumnMapping, db: Session, user_id: int,
+                     skip_duplicates: bool = True, batch_size: int = IMPORT_BATCH_SIZE) -> Iterator[dict]:
+    """Run the pipeline, yielding error, progress and summary events."""
+    totals = {"rows_read": 0, "inserted": 0, "duplicates": 0, "errors": 0}
+    parsed = resolve_categories(map_columns(read_rows(binary_file), mapping), db, user_id)
+    dedupe_state = start_dedupe(db, user_id) if skip_duplicates else None
+    for batch in batched(parsed, batch_size):
+        rows = []
+        for item in batch:
+            totals["rows_read"] += 1
+            if isinstance(item, RowError):
+                totals["errors"] += 1
+                yield {"type": "error", "line": item.line, "error": item.error}
+            else:
+                rows.append(item)
+        if skip_duplicates:
+            rows, duplicates = dedupe(rows, db, user_id, dedupe_state)
+            totals["duplicates"] += len(duplicates)
+        totals["inserted"] += insert_batch(rows, db, user_id)
+        yield {"type": "progress", **totals}
+    yield {"type": "summary", **totals}
@@ -1,15 +1,21 @@
 # app/main.py
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.gzip import GZipMiddleware
 from dotenv import load_dotenv
 import logging
+import os
 from typing import Any
 
-from .routers import auth, categories, income, spending, savings, users
-from .database import engine
-from . import models
+from .routers import auth, categories, income, spending, savings, users, imports, exports, summary, sync
+from .database import engine, async_engine, DB_MODE
+from .db_pool import pool_status
 from .exceptions import AppException
+from .cache import principal_cache
+from . import passwords, rate_limit
+from .metrics import MetricsMiddleware, request_metrics
+from .startup import lifespan
 
 # Load environment variables
 load_dotenv()
@@ -18,22 +24,37 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
-
 # Initialize FastAPI app
 app = FastAPI(
     title="FinTrack API",
     description="Financial Tracker API for managing income, expenses, and savings",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
+# List pages and sync pulls are large, repetitive JSON; small bodies are not worth compressing
+app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", "1000")))
+# Outermost, so latency includes compression
+app.add_middleware(MetricsMiddleware)
 # Include Routers
+if DB_MODE == "async":
+    # Registered first so they take precedence; routes without an async
+    # version fall through to the sync routers below.
+    from .routers.aio import categories as aio_categories, income as aio_income, savings as aio_savings, spending as aio_spending
+    app.include_router(aio_categories.router)
+    app.include_router(aio_income.router)
+    app.include_router(aio_spending.router)
+    app.include_router(aio_savings.router)
+
 app.include_router(auth.router)
 app.include_router(categories.router)
 app.include_router(income.router)
 app.include_router(spending.router)
 app.include_router(savings.router)
 app.include_router(users.router)
+app.include_router(imports.router)
+app.include_router(exports.router)
+app.include_router(summary.router)
+app.include_router(sync.router)
 
 # Health Check Endpoint
 @app.get("/", tags=["Health"])
@@ -48,6 +69,22 @@ async def root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/stats", tags=["Health"])
+def runtime_stats():
+    stats = {
+        "auth_cache": principal_cache.stats(),
+        "password_pool": passwords.password_pool.stats(),
+        "auth_rate_limit": rate_limit.auth_limiter.stats(),
+        "db_pool": pool_status(engine),
+    }
+    if async_engine is not None:
+        stats["async_db_pool"] = pool_status(async_engine.sync_engine)
+    return stats
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(request_metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Error response helper
 def error_response(message: str, status_code: int, details: Any = None):
     return {
@@ -75,7 +112,8 @@ async def app_exception_handler(request: Request, exc: AppException):
     logger.error(f"AppException: {exc.message} - Path: {request.url.path}")
     return JSONResponse(
         status_code=exc.status_code,
-        content=error_response(exc.message, exc.status_code)
+        content=error_response(exc.message, exc.status_code),
+        headers=exc.headers
     )
 
 @app.exception_handler(RequestValidationError)
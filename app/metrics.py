@@ -0,0 +1,194 @@
+"""In-process metrics: histograms, per-route request metrics and DB usage.
+
+``MetricsMiddleware`` records every request under its route template (not
+the raw path, which would give one series per id), and ``instrument_engine``
+adds each cursor execution to the current request's DB query count and time
+through a context variable. Sync routes run in the threadpool and async
+engines run queries in greenlets; both inherit the request's context.
+Everything is served in the Prometheus text format at /metrics.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+# Latency buckets in seconds, shared by everything that records a duration
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Queries per request; a route whose count grows with the page size shows up in the top buckets
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus style: cumulative ``le`` buckets)."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            count, total, peak = self.count, self.sum, self.max
+        cumulative, running = {}, 0
+        for bound, n in zip(self.buckets + (float("inf"),), counts):
+            running += n
+            cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+        return {"count": count, "sum": round(total, 6), "max": round(peak, 6), "buckets": cumulative}
+
+
+class _RequestDB:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+_request_db: ContextVar[Optional[_RequestDB]] = ContextVar("request_db", default=None)
+
+
+def instrument_engine(engine):
+    """Count queries and DB time against the request being served (if any)."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _request_db.get() is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        usage = _request_db.get()
+        start = getattr(context, "_metrics_start", None)
+        if usage is not None and start is not None:
+            usage.queries += 1
+            usage.seconds += time.perf_counter() - start
+
+
+class RequestMetrics:
+    """Request counts by status, plus latency and DB usage histograms, per route."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.db_time: Dict[Tuple[str, str], Histogram] = {}
+        self.db_queries: Dict[Tuple[str, str], Histogram] = {}
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float, usage: _RequestDB):
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            status_key = (method, route, str(status))
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            if key not in self.latency:
+                self.latency[key] = Histogram()
+                self.db_time[key] = Histogram()
+                self.db_queries[key] = Histogram(QUERY_COUNT_BUCKETS)
+            latency, db_time, db_queries = self.latency[key], self.db_time[key], self.db_queries[key]
+        latency.observe(seconds)
+        db_time.observe(usage.seconds)
+        db_queries.observe(usage.queries)
+
+    def clear(self):
+        with self._lock:
+            self.requests.clear()
+            self.latency.clear()
+            self.db_time.clear()
+            self.db_queries.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            requests = dict(self.requests)
+            in_flight = self.in_flight
+            histograms = [
+                ("http_request_duration_seconds", "Request latency by route.", dict(self.latency)),
+                ("http_request_db_seconds", "Time spent in database queries per request.", dict(self.db_time)),
+                ("http_request_db_queries", "Database queries per request.", dict(self.db_queries)),
+            ]
+        lines = [
+            "# HELP http_requests_total Requests by route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(requests.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {in_flight}",
+        ]
+        for name, help_text, by_route in histograms:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for (method, route), histogram in sorted(by_route.items()):
+                lines += _histogram_lines(name, histogram.snapshot(), method=method, route=route)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _histogram_lines(name: str, snapshot: dict, **labels) -> List[str]:
+    lines = [f"{name}_bucket{_labels(**labels, le=bound)} {count}" for bound, count in snapshot["buckets"].items()]
+    lines.append(f"{name}_sum{_labels(**labels)} {snapshot['sum']}")
+    lines.append(f"{name}_count{_labels(**labels)} {snapshot['count']}")
+    return lines
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no per-request task or body buffering, unlike BaseHTTPMiddleware)."""
+
+    def __init__(self, app, registry: RequestMetrics = request_metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500  # an exception escaping the app becomes a 500 further out
+        usage = _RequestDB()
+        token = _request_db.set(usage)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.registry.started()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_db.reset(token)
+            # The router stores the matched route in the scope; unmatched paths share one series
+            route = getattr(scope.get("route"), "path", "unmatched")
+            self.registry.finished(scope["method"], route, status, time.perf_counter() - start, usage)
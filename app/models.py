@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Float, func
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Date, DateTime, Float, Index, UniqueConstraint, DDL, event, func, text
 from sqlalchemy.orm import relationship
 from .database import Base
 import datetime
@@ -31,6 +31,8 @@ class User(Base): # User model DONE
     savings_goals = relationship("SavingsGoal", back_populates="user")
     savings_contributions = relationship("SavingsContribution", back_populates="user")
     default_currency = Column(SQLEnum(Currency), default=Currency.NGN, nullable=False)
+    # Highest change version handed out to this user's rows (see app/sync.py)
+    version = Column("synced", Integer, default=0, nullable=False)
 
 class Category(Base): # Category model DONE
     __tablename__ = "categories"
@@ -39,31 +41,47 @@ class Category(Base): # Category model DONE
     category_name = Column(String, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     is_deleted = Column(Boolean, default=False)
+    # Change version for delta sync: bumped from users.synced on every write
+    version = Column("synced", Integer, default=0, nullable=False)
 
     user = relationship("User", back_populates="categories")
     spendings = relationship("Spending", back_populates="category")
 
+    __table_args__ = (
+        Index("ix_categories_user_deleted", "user_id", "is_deleted"),
+        Index("ix_categories_user_version", "user_id", "synced"),
+    )
+
 class Income(Base): # Income model DONE
     __tablename__ = "income"
 
     id = Column(Integer, primary_key=True, index=True)
     amount = Column(Float)
     source = Column(String)
-    date = Column(DateTime, default=datetime.datetime.utcnow)
+    date = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"))
     type = Column(String) # "cash" or "card"
     currency = Column(SQLEnum(Currency), default=Currency.NGN, nullable=False)
-
+    version = Column("synced", Integer, default=0, nullable=False)
 
     user = relationship("User", back_populates="incomes")
 
+    __table_args__ = (
+        Index("ix_income_user_date", "user_id", "date"),
+        Index("ix_income_user_version", "user_id", "synced"),
+    )
+
+# The text searched by GET /spending/search
+SPENDING_SEARCH_DOCUMENT = "coalesce(item_name, '') || ' ' || coalesce(notes, '')"
+
 class Spending(Base): # Spending model DONE
     __tablename__ = "spending"
 
     id = Column(Integer, primary_key=True, index=True)
     amount = Column(Float)
     notes = Column(String)
-    date = Column(DateTime, default=datetime.datetime.utcnow)
+    # Part of the rollup key (app/rollups.py), so never NULL
+    date = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"))
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
     item_name = Column(String)
@@ -71,6 +89,59 @@ class Spending(Base): # Spending model DONE
     user = relationship("User", back_populates="spendings")
     category = relationship("Category", back_populates="spendings")
     currency = Column(SQLEnum(Currency), default=Currency.NGN, nullable=False)
+    version = Column("synced", Integer, default=0, nullable=False)
+    # Id assigned by an offline client that created the row via /sync/push
+    client_id = Column(String, nullable=True)
+
+    __table_args__ = (
+        # GET /spending/ always filters on the owner and the soft-delete flag,
+        # then on a date range and optionally a category.
+        Index("ix_spending_user_deleted_date", "user_id", "is_deleted", "date"),
+        Index("ix_spending_user_category_date", "user_id", "category_id", "date"),
+        Index("ix_spending_user_version", "user_id", "synced"),
+        Index("uix_spending_user_client", "user_id", "client_id", unique=True),
+        # Full-text search (app/search.py). The expressions must match the
+        # ones the search queries use, or Postgres will not use the indexes.
+        Index("ix_spending_search_tsv", text(f"to_tsvector('simple', {SPENDING_SEARCH_DOCUMENT})"),
+              postgresql_using="gin").ddl_if(dialect="postgresql"),
+        Index("ix_spending_search_trgm", text(f"({SPENDING_SEARCH_DOCUMENT}) gin_trgm_ops"),
+              postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
+# SQLite has no expression indexes for text search: an FTS5 table indexes the
+# same columns instead, kept in step with spending by triggers.
+SPENDING_FTS_SQLITE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS spending_fts USING fts5("
+    "item_name, notes, content='spending', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS spending_fts_insert AFTER INSERT ON spending BEGIN "
+    "INSERT INTO spending_fts(rowid, item_name, notes) VALUES (new.id, new.item_name, new.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS spending_fts_delete AFTER DELETE ON spending BEGIN "
+    "INSERT INTO spending_fts(spending_fts, rowid, item_name, notes) VALUES ('delete', old.id, old.item_name, old.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS spending_fts_update AFTER UPDATE OF item_name, notes ON spending BEGIN "
+    "INSERT INTO spending_fts(spending_fts, rowid, item_name, notes) VALUES ('delete', old.id, old.item_name, old.notes); "
+    "INSERT INTO spending_fts(rowid, item_name, notes) VALUES (new.id, new.item_name, new.notes); END",
+]
+
+for _statement in SPENDING_FTS_SQLITE:
+    event.listen(Spending.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Spending.__table__, "after_drop", DDL("DROP TABLE IF EXISTS spending_fts").execute_if(dialect="sqlite"))
+# Trigram operator class for ix_spending_search_trgm
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+
+class SpendingDailyTotal(Base):
+    """Live (not soft-deleted) spending summed per user, category, currency and day.
+
+    Maintained by app/rollups.py in the same transaction as every spending write.
+    """
+    __tablename__ = "spending_daily_totals"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    # 0 stands for uncategorized: primary key columns cannot be NULL
+    category_id = Column(Integer, primary_key=True, default=0)
+    currency = Column(SQLEnum(Currency), primary_key=True)
+    day = Column(Date, primary_key=True)
+    total = Column(Float, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
 
 class SavingsGoal(Base): # SavingsGoal model DONE
     __tablename__ = "savings_goals"
@@ -80,34 +151,61 @@ class SavingsGoal(Base): # SavingsGoal model DONE
     target_amount = Column(Float)
     deadline = Column(DateTime, nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
 
     user = relationship("User", back_populates="savings_goals")
     savings_contributions = relationship("SavingsContribution", back_populates="savings_goal")
     currency = Column(SQLEnum(Currency), default=Currency.NGN, nullable=False)
+    version = Column("synced", Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        Index("ix_savings_goals_user_created", "user_id", "created_at"),
+        Index("ix_savings_goals_user_version", "user_id", "synced"),
+    )
 
 class SavingsContribution(Base): # SavingsContribution model DONE
     __tablename__ = "savings_contributions"
 
     id = Column(Integer, primary_key=True, index=True)
     amount = Column(Float)
-    date = Column(DateTime, default=datetime.datetime.utcnow)
+    date = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     goal_id = Column(Integer, ForeignKey("savings_goals.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
     savings_goal = relationship("SavingsGoal", back_populates="savings_contributions")
     user = relationship("User", back_populates="savings_contributions")
     currency = Column(SQLEnum(Currency), default=Currency.NGN, nullable=False)
+    version = Column("synced", Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        Index("ix_savings_contributions_goal_date", "goal_id", "date"),
+        Index("ix_savings_contributions_user_version", "user_id", "synced"),
+    )
+
+
+class ExchangeRate(Base):
+    """Rate for converting one unit of from_currency into to_currency, effective from as_of."""
+    __tablename__ = "exchange_rates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    from_currency = Column(SQLEnum(Currency), nullable=False)
+    to_currency = Column(SQLEnum(Currency), nullable=False)
+    as_of = Column(Date, nullable=False)
+    rate = Column(Float, nullable=False)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        # Also serves the "latest rate on or before a day" lookups
+        UniqueConstraint("from_currency", "to_currency", "as_of", name="uix_currency_pair_as_of"),
+    )
+
+
+class RevokedToken(Base):
+    """Refresh tokens that have been used or logged out, kept until they would have expired.
 
+    Inserting the jti is how a refresh token is consumed: the primary key lets
+    only one request win, however many processes race for it.
+    """
+    __tablename__ = "revoked_tokens"
 
-# class ExchangeRate(Base):
-#     __tablename__ = "exchange_rates"
-    
-#     id = Column(Integer, primary_key=True, index=True)
-#     from_currency = Column(SQLEnum(Currency), nullable=False)
-#     to_currency = Column(SQLEnum(Currency), nullable=False)
-#     rate = Column(Float, nullable=False)
-#     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
-    
-#     __table_args__ = (
-#         UniqueConstraint('from_currency', 'to_currency', name='uix_currency_pair'),
-#     )
\ No newline at end of file
+    jti = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,51 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import DateTime, tuple_
+from sqlalchemy.orm import Query
+
+from .exceptions import InvalidCursorException
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Pack the sort key of the last row on a page into an opaque token."""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> list:
+    """Unpack a token produced by encode_cursor for the given sort columns."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        return [
+            datetime.fromisoformat(v) if isinstance(col.type, DateTime) else int(v)
+            for v, col in zip(values, columns)
+        ]
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise InvalidCursorException()
+
+
+def after_cursor(query: Query, cursor: str, *columns, descending: bool = True) -> Query:
+    """Restrict an ordered query to the rows strictly after the cursor position.
+
+    The comparison is on the full (sort key, id) tuple so it stays on the
+    index and every page costs the same no matter how deep it is. Sort key
+    columns are NOT NULL, so the tuple comparison never meets a NULL.
+    """
+    values = decode_cursor(cursor, columns)
+    key = tuple_(*columns)
+    return query.filter(key < tuple_(*values) if descending else key > tuple_(*values))
+
+
+def next_cursor(items: Sequence[Any], limit: int, *attrs: str) -> Optional[str]:
+    """Cursor for the page after ``items``, or None when this was the last page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor([getattr(last, attr) for attr in attrs])
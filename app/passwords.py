@@ -0,0 +1,142 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from dotenv import load_dotenv
+from passlib.context import CryptContext
+
+from .exceptions import ServiceUnavailableException
+
+# This module is imported by the password worker processes, so it must stay
+# free of database/app imports.
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def verify_password(plain_password, hashed_password):
+    if len(plain_password.encode('utf-8')) > 72:
+        logger.warning("Password provided is > 72 bytes, which bcrypt cannot check; rejecting it.")
+        return False
+
+    try:
+        return pwd_context.verify(plain_password, hashed_password)
+    except Exception as e:
+        logger.error(f"Error verifying password: {e}")
+        return False
+
+def get_password_hash(password):
+    return pwd_context.hash(password)
+
+
+class PasswordPool:
+    """Bounded process pool for bcrypt hashing and verification.
+
+    bcrypt holds a core for hundreds of milliseconds per call. Running it in
+    separate processes keeps it off the request threadpool and lets it use
+    every core, and the pending limit makes a burst fail fast with a 503
+    instead of queueing behind (and starving) every other request.
+    With ``workers=0`` the work runs inline but the pending limit still applies.
+
+    The routes that call it are sync, so every pending call also holds a
+    request thread; ``fit_to_threadpool`` keeps the limit below the threadpool
+    size so that a burst of logins cannot take every thread.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def run(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise ServiceUnavailableException("Too many authentication requests in progress. Please retry shortly.")
+            self.pending += 1
+            executor = self._get_executor()
+        try:
+            if executor is None:
+                return fn(*args)
+            try:
+                return executor.submit(fn, *args).result()
+            except BrokenProcessPool:
+                # A worker died; start a fresh pool for the next caller
+                with self._lock:
+                    if self._executor is executor:
+                        self._executor = None
+                raise ServiceUnavailableException("Authentication service restarting. Please retry shortly.")
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    def fit_to_threadpool(self, thread_limit: int) -> int:
+        """Lower ``max_pending`` to at most half of ``thread_limit`` request threads."""
+        cap = max(thread_limit // 2, 1)
+        with self._lock:
+            if self.max_pending > cap:
+                logger.warning(
+                    f"Password pool limit {self.max_pending} would use most of the "
+                    f"{thread_limit} request threads; lowering it to {cap}"
+                )
+                self.max_pending = cap
+            return self.max_pending
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def _get_executor(self):
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            # spawn, not fork: the parent has threads (uvicorn, DB pool) that
+            # must not be duplicated into the children
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_MAX_PENDING = int(os.getenv("PASSWORD_MAX_PENDING", str(4 * max(PASSWORD_WORKERS, 1))))
+
+password_pool = PasswordPool(workers=PASSWORD_WORKERS, max_pending=PASSWORD_MAX_PENDING)
+
+
+def configure_pool(workers: int, max_pending: int) -> PasswordPool:
+    """Replace the shared pool, e.g. to benchmark different worker counts."""
+    global password_pool
+    old, password_pool = password_pool, PasswordPool(workers=workers, max_pending=max_pending)
+    old.shutdown()
+    return password_pool
+
+
+def hash_in_pool(password: str) -> str:
+    return password_pool.run(get_password_hash, password)
+
+
+def verify_in_pool(plain_password: str, hashed_password: str) -> bool:
+    return password_pool.run(verify_password, plain_password, hashed_password)
@@ -0,0 +1,93 @@
+"""Batched push of offline spending edits.
+
+A client that queued creates, edits and deletes while offline sends them in
+one request. Each mutation names its row by the client's own id (for rows it
+created) or the server id, plus the version it last saw. The whole batch is
+applied in one transaction through the usual crud write functions, so
+rollups and change versions stay exact:
+
+* upsert on an unknown client id inserts the row, otherwise updates it
+* a row whose version moved past ``base_version`` is a conflict, reported
+  back with the server's copy ("reject") or overwritten ("last_writer_wins");
+  later mutations of a row written earlier in the same batch never conflict
+
+Conflicts and invalid mutations do not abort the batch; they are reported
+per mutation while the rest are applied.
+"""
+from typing import Dict, List
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from . import crud, models, schemas, sync
+
+
+def _load_targets(db: Session, user_id: int, mutations: List[schemas.SyncMutation]) -> tuple:
+    client_ids = {m.client_id for m in mutations if m.client_id}
+    ids = {m.id for m in mutations if m.id is not None}
+    by_client_id: Dict[str, models.Spending] = {}
+    by_id: Dict[int, models.Spending] = {}
+    if client_ids or ids:
+        rows = (
+            db.query(models.Spending)
+            .filter(models.Spending.user_id == user_id,
+                    or_(models.Spending.client_id.in_(client_ids), models.Spending.id.in_(ids)))
+            .with_for_update()
+            .all()
+        )
+        for row in rows:
+            by_id[row.id] = row
+            if row.client_id:
+                by_client_id[row.client_id] = row
+    return by_client_id, by_id
+
+
+def push(db: Session, user_id: int, request: schemas.SyncPushRequest) -> List[schemas.SyncMutationResult]:
+    mutations = request.mutations
+    # Taking a version first locks the user's row, so concurrent pushes for
+    # the same user run one after the other and an unknown client id cannot
+    # be inserted twice.
+    sync.next_version(db, user_id)
+    by_client_id, by_id = _load_targets(db, user_id, mutations)
+    owned_categories = crud.get_user_category_ids(
+        db, user_id, {m.data.category_id for m in mutations if m.data and m.data.category_id is not None}
+    )
+
+    results = []
+    written = set()  # later mutations of a row build on the client's own earlier ones
+    for index, mutation in enumerate(mutations):
+        result = schemas.SyncMutationResult(index=index, status="error", client_id=mutation.client_id, id=mutation.id)
+        results.append(result)
+        if not mutation.client_id and mutation.id is None:
+            result.error = "client_id or id is required"
+            continue
+        if mutation.op == "upsert" and mutation.data is None:
+            result.error = "data is required for upsert"
+            continue
+        if mutation.data and mutation.data.category_id is not None and mutation.data.category_id not in owned_categories:
+            result.error = "Category not found"
+            continue
+
+        existing = by_id.get(mutation.id) if mutation.id is not None else by_client_id.get(mutation.client_id)
+        if existing is None and (mutation.op == "delete" or mutation.id is not None):
+            result.error = "Transaction not found"
+            continue
+        if (existing is not None and existing.id not in written and request.on_conflict == "reject"
+                and (mutation.base_version is None or existing.version != mutation.base_version)):
+            result.status, result.id, result.version = "conflict", existing.id, existing.version
+            result.server = schemas.Spending.model_validate(existing)
+            continue
+
+        if existing is None:
+            row = crud.create_user_spending(db, mutation.data, user_id, client_id=mutation.client_id, commit=False)
+            by_client_id[mutation.client_id] = by_id[row.id] = row
+        elif mutation.op == "delete":
+            row = crud.delete_user_spending(db, existing.id, user_id, commit=False)
+        else:
+            update = schemas.SpendingUpdate(id=existing.id, **mutation.data.model_dump())
+            row = crud.update_user_spending(db, existing.id, update, user_id, commit=False)
+        written.add(row.id)
+        result.status, result.id, result.version, result.client_id = "applied", row.id, row.version, row.client_id
+
+    db.commit()
+    return results
@@ -0,0 +1,81 @@
+"""Record the SQL a block of code runs, to keep query counts in check.
+
+Lazy relationship loads (``Spending.category``, ``SavingsGoal.savings_contributions``,
+...) turn one list query into one query per row without any visible change
+in the code. The recorder makes that measurable, in tests or a dev shell:
+
+    with QueryRecorder(engine) as queries:
+        client.get("/savings/")
+    queries.assert_budget(3)      # fails listing every statement that ran
+    queries.assert_no_repeats()   # fails if one statement ran with several parameter sets
+
+A multi-row INSERT that the dialect sends in several "insertmanyvalues"
+batches (SQLite sends RETURNING inserts one row at a time) counts as one
+query: it is one execute() in the code, and one round trip per batch of
+1000 rows on Postgres.
+
+``bind`` may be an Engine or a Connection. Tests bind their session to one
+connection, and events registered on an Engine do not reach connections
+that are already open, so pass ``session.get_bind()`` there.
+"""
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import ExecuteStyle
+
+# A statement run this many times with different parameters is an N+1 pattern
+REPEAT_THRESHOLD = 2
+
+
+class RecordedQuery(NamedTuple):
+    statement: str
+    parameters: Any
+    executemany: bool
+
+
+class QueryRecorder:
+    def __init__(self, bind):
+        self.bind = bind
+        self.queries: List[RecordedQuery] = []
+        self._last_context = None
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None and context is self._last_context and context.execute_style is ExecuteStyle.INSERTMANYVALUES:
+            return  # a further batch of the same execute()
+        self._last_context = context
+        self.queries.append(RecordedQuery(statement, parameters, executemany))
+
+    def __enter__(self) -> "QueryRecorder":
+        event.listen(self.bind, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.bind, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    def repeated(self, threshold: int = REPEAT_THRESHOLD) -> Dict[str, int]:
+        """Statements run at least ``threshold`` times with differing parameters."""
+        runs: Dict[str, List[str]] = defaultdict(list)
+        for query in self.queries:
+            runs[query.statement].append(repr(query.parameters))
+        return {
+            statement: len(parameters) for statement, parameters in runs.items()
+            if len(parameters) >= threshold and len(set(parameters)) > 1
+        }
+
+    def report(self) -> str:
+        return "\n".join(f"  {i}. {' '.join(q.statement.split())}" for i, q in enumerate(self.queries, 1))
+
+    def assert_budget(self, max_queries: int, label: str = "block"):
+        if self.count > max_queries:
+            raise AssertionError(f"{label} ran {self.count} queries, budget is {max_queries}:\n{self.report()}")
+
+    def assert_no_repeats(self, threshold: int = REPEAT_THRESHOLD, label: str = "block"):
+        repeats = self.repeated(threshold)
+        if repeats:
+            listing = "\n".join(f"  {count}x {' '.join(statement.split())}" for statement, count in repeats.items())
+            raise AssertionError(f"{label} repeated statements with different parameters (N+1?):\n{listing}")
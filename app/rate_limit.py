@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from dotenv import load_dotenv
+from fastapi import Request
+
+from .exceptions import RateLimitExceededException
+
+load_dotenv()
+
+
+class Limit(NamedTuple):
+    """``capacity`` requests per ``period`` seconds, refilled continuously; 0 disables."""
+    name: str
+    capacity: int
+    period: float = 60.0
+
+
+class MemoryBackend:
+    """Token buckets in this process, least recently used evicted past ``max_keys``.
+
+    Any backend with the same ``take`` can replace it, e.g. one on a shared
+    store so that every instance sees the same buckets.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, period: float) -> float:
+        """Take a token; returns 0 if one was available, else the seconds until one is."""
+        now = time.monotonic()
+        rate = capacity / period
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (float(capacity), now))
+            tokens = min(float(capacity), tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class RateLimiter:
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryBackend()
+        self.allowed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def check(self, *checks: tuple):
+        """Take a token from each (limit, key) bucket; raises 429 on the first that is empty."""
+        for limit, key in checks:
+            if limit.capacity <= 0 or key is None:
+                continue
+            wait = self.backend.take(f"{limit.name}:{key}", limit.capacity, limit.period)
+            if wait > 0:
+                with self._lock:
+                    self.rejected += 1
+                raise RateLimitExceededException(retry_after=wait)
+        with self._lock:
+            self.allowed += 1
+
+    def reset(self):
+        self.backend.clear()
+        with self._lock:
+            self.allowed = self.rejected = 0
+
+    def stats(self) -> dict:
+        stats = {"allowed": self.allowed, "rejected": self.rejected}
+        if isinstance(self.backend, MemoryBackend):
+            stats["buckets"] = len(self.backend)
+        return stats
+
+
+AUTH_LIMIT_PER_IP = Limit("auth-ip", int(os.getenv("AUTH_RATE_LIMIT_PER_IP", "20")))
+AUTH_LIMIT_PER_EMAIL = Limit("auth-email", int(os.getenv("AUTH_RATE_LIMIT_PER_EMAIL", "5")))
+
+auth_limiter = RateLimiter()
+
+
+def client_ip(request: Request) -> Optional[str]:
+    # Behind a proxy, run uvicorn with --proxy-headers so this is the caller's address
+    return request.client.host if request.client else None
+
+
+def check_auth(request: Request, email: Optional[str] = None):
+    """Admission check for the bcrypt routes; call before any database or password work."""
+    auth_limiter.check(
+        (AUTH_LIMIT_PER_IP, client_ip(request)),
+        (AUTH_LIMIT_PER_EMAIL, email.strip().lower() if email else None),
+    )
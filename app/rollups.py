@@ -0,0 +1,161 @@
+"""Daily spending rollups.
+
+spending_daily_totals holds one row per (user, category, currency, day) with
+the sum and count of the user's live spendings. Every spending write in
+crud/async_crud hands its +/- contribution to ``record`` before committing,
+so the rollup moves in the same transaction as the rows it summarizes, and
+period summaries read a handful of rollup rows instead of rescanning
+spending.
+
+If the rollups ever drift (manual SQL, a write path that bypasses crud),
+compare or recompute them from the raw rows:
+
+    python -m app.rollups verify [--user-id ID]
+    python -m app.rollups rebuild [--user-id ID]
+"""
+import argparse
+import math
+import sys
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from . import models
+from .summary import period_bucket
+
+UNCATEGORIZED = 0
+
+DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+Key = Tuple[int, int, models.Currency, date]
+
+
+def _day(value) -> date:
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value.date() if isinstance(value, datetime) else value
+
+
+def delta(spending, sign: int = 1) -> tuple:
+    """The (key, amount, count) a live spending row adds to (sign=1) or removes from (sign=-1) the rollups.
+
+    ``spending`` is anything with the spending columns as attributes: a
+    model instance or a row returned by ``RETURNING``.
+    """
+    key = (spending.user_id, spending.category_id or UNCATEGORIZED, models.Currency(spending.currency), _day(spending.date))
+    return key, sign * (spending.amount or 0.0), sign
+
+
+def upsert_statement(dialect: str, deltas: Iterable[tuple]):
+    """One INSERT .. ON CONFLICT DO UPDATE applying every delta, or None if they cancel out."""
+    totals: Dict[Key, list] = {}
+    for key, amount, count in deltas:
+        entry = totals.setdefault(key, [0.0, 0])
+        entry[0] += amount
+        entry[1] += count
+    # Sorted so concurrent writers lock rollup rows in the same order
+    rows = [
+        {"user_id": k[0], "category_id": k[1], "currency": k[2], "day": k[3], "total": amount, "count": count}
+        for k, (amount, count) in sorted(totals.items(), key=lambda item: (item[0][0], item[0][1], item[0][2].value, item[0][3]))
+        if count or amount
+    ]
+    if not rows:
+        return None
+    if dialect not in DIALECT_INSERTS:
+        raise ValueError(f"Rollups are not supported on '{dialect}' databases")
+    table = models.SpendingDailyTotal
+    stmt = DIALECT_INSERTS[dialect](table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.user_id, table.category_id, table.currency, table.day],
+        set_={"total": table.total + stmt.excluded.total, "count": table.count + stmt.excluded.count},
+    )
+
+
+def record(db: Session, deltas: Iterable[tuple]) -> None:
+    """Apply deltas within the session's current transaction; the caller commits."""
+    stmt = upsert_statement(db.get_bind().dialect.name, deltas)
+    if stmt is not None:
+        db.execute(stmt)
+
+
+# --- Repair ---
+def _expected_query(db: Session, user_id: Optional[int]):
+    spending = models.Spending
+    day = period_bucket(spending.date, "day", db.get_bind().dialect.name)
+    category = func.coalesce(spending.category_id, UNCATEGORIZED)
+    stmt = (
+        select(spending.user_id, category, spending.currency, day,
+               func.coalesce(func.sum(spending.amount), 0.0), func.count(spending.id))
+        .where(spending.is_deleted == False)
+        .group_by(spending.user_id, category, spending.currency, day)
+    )
+    if user_id is not None:
+        stmt = stmt.where(spending.user_id == user_id)
+    return stmt
+
+
+def _rollup_scope(stmt, user_id: Optional[int]):
+    return stmt if user_id is None else stmt.where(models.SpendingDailyTotal.user_id == user_id)
+
+
+def verify(db: Session, user_id: Optional[int] = None) -> List[tuple]:
+    """(key, expected (total, count), stored (total, count)) for every rollup that disagrees with spending."""
+    expected = {
+        (u, c, cur, _day(d)): (total, count)
+        for u, c, cur, d, total, count in db.execute(_expected_query(db, user_id))
+    }
+    table = models.SpendingDailyTotal
+    stored = {
+        (u, c, cur, _day(d)): (total, count)
+        for u, c, cur, d, total, count in db.execute(_rollup_scope(
+            select(table.user_id, table.category_id, table.currency, table.day, table.total, table.count)
+            .where(table.count != 0), user_id))
+    }
+    drift = []
+    for key in sorted(expected.keys() | stored.keys(), key=lambda k: (k[0], k[1], k[2].value, k[3])):
+        want, have = expected.get(key, (0.0, 0)), stored.get(key, (0.0, 0))
+        if want[1] != have[1] or not math.isclose(want[0], have[0], abs_tol=0.005):
+            drift.append((key, want, have))
+    return drift
+
+
+def rebuild(db: Session, user_id: Optional[int] = None) -> int:
+    """Recompute the rollups from spending in one transaction; returns the number of rollup rows."""
+    table = models.SpendingDailyTotal
+    db.execute(_rollup_scope(delete(table), user_id))
+    db.execute(insert(table).from_select(
+        [table.user_id, table.category_id, table.currency, table.day, table.total, table.count],
+        _expected_query(db, user_id),
+    ))
+    db.commit()
+    return db.scalar(_rollup_scope(select(func.count()).select_from(table), user_id))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.rollups", description="Check or repair the daily spending rollups.")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    parser.add_argument("--user-id", type=int, help="only this user's rollups")
+    args = parser.parse_args(argv)
+
+    from .database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            print(f"Rebuilt {rebuild(db, args.user_id)} rollup rows")
+            return 0
+        drift = verify(db, args.user_id)
+        for (user, category, currency, day), want, have in drift:
+            print(f"user {user} category {category or '-'} {currency.value} {day}: "
+                  f"expected {want[0]:.2f} ({want[1]}), stored {have[0]:.2f} ({have[1]})")
+        print(f"{len(drift)} rollup rows drifted" if drift else "Rollups match spending")
+        return 1 if drift else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from ... import models, schemas, async_crud
+from ...auth import get_current_user_async
+from ...database import get_async_db
+from ...pagination import next_cursor
+from ... import etags, serialization
+
+router = APIRouter(
+    prefix="/categories",
+    tags=['categories']
+)
+
+# --- Category Endpoints (DB_MODE=async) ---
+@router.get("/", response_model=schemas.StandardResponse[List[schemas.Category]], dependencies=[Depends(etags.list_etag_async(models.Category))])
+async def read_categories(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db), current_user: schemas.UserData = Depends(get_current_user_async)):
+    categories = await async_crud.get_categories(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    return serialization.respond(schemas.StandardResponse[List[schemas.Category]], response, data=categories, message="Categories retrieved successfully", next_cursor=next_cursor(categories, limit, "id"))
+
+@router.post("/", response_model=schemas.StandardResponse[schemas.Category])
+async def create_category(category: schemas.CategoryCreate, db: AsyncSession = Depends(get_async_db), current_user: schemas.UserData = Depends(get_current_user_async)):
+    new_category = await async_crud.create_user_category(db=db, category=category, user_id=current_user.id)
+    return schemas.StandardResponse(data=new_category, message="Category created successfully")
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from ... import models, schemas, async_crud
+from ...auth import get_current_user_async
+from ...database import get_async_db
+from ...pagination import next_cursor
+from ... import etags, serialization
+
+router = APIRouter(
+    prefix="/income",
+    tags=["Income"]
+)
+
+# --- Income Endpoints (DB_MODE=async) ---
+@router.get("/", response_model=schemas.StandardResponse[List[schemas.Income]], dependencies=[Depends(etags.list_etag_async(models.Income))])
+async def read_incomes(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db), current_user: schemas.UserData = Depends(get_current_user_async)):
+    incomes = await async_crud.get_incomes(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    return serialization.respond(schemas.StandardResponse[List[schemas.Income]], response, data=incomes, message="Incomes retrieved successfully", next_cursor=next_cursor(incomes, limit, "date", "id"))
+
+@router.post("/", response_model=schemas.StandardResponse[schemas.Income])
+async def create_income(income: schemas.IncomeCreate, db: AsyncSession = Depends(get_async_db), current_user: schemas.UserData = Depends(get_current_user_async)):
+    new_income = await async_crud.create_user_income(db=db, income=income, user_id=current_user.id)
+    return schemas.StandardResponse(data=new_income, message="Income added successfully")
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from ... import models, schemas, async_crud
+from ...auth import get_current_user_async
+from ...database import get_async_db
+from ...pagination import next_cursor
+from ... import etags, serialization
+
+router = APIRouter(
+    prefix="/savings",
+    tags=["Savings"]
+)
+
+# --- Savings Endpoints (DB_MODE=async) ---
+@router.get("/", response_model=schemas.StandardResponse[List[schemas.SavingsGoal]], dependencies=[Depends(etags.list_etag_async(models.SavingsGoal, models.SavingsContribution))])
+async def read_savings_goals(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db), current_user: schemas.UserData = Depends(get_current_user_async)):
+    goals = await async_crud.get_savings_goals(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    return serialization.respond(schemas.StandardResponse[List[schemas.SavingsGoal]], response, data=goals, message="Savings goals retrieved successfully", next_cursor=next_cursor(goals, limit, "created_at", "id"))
+
+@router.post("/", response_model=schemas.StandardResponse[schemas.SavingsGoal])
+async def create_savings_goal(goal: schemas.SavingsGoalCreate, db: AsyncSession = Depends(get_async_db), current_user: schemas.UserData = Depends(get_current_user_async)):
+    new_goal = await async_crud.create_user_savings_goal(db=db, goal=goal, user_id=current_user.id)
+    return schemas.StandardResponse(data=new_goal, message="Savings goal created successfully")
+
+@router.post("/{goal_id}/contributions/", response_model=schemas.StandardResponse[schemas.SavingsContribution])
+async def create_contribution(goal_id: int, contribution: schemas.SavingsContributionCreate, db: AsyncSession = Depends(get_async_db), current_user: schemas.UserData = Depends(get_current_user_async)):
+    new_contribution = await async_crud.create_savings_contribution(db=db, contribution=contribution, goal_id=goal_id, user_id=current_user.id)
+    return schemas.StandardResponse(data=new_contribution, message="Contribution added successfully")
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date, timedelta
+from ... import models, schemas, async_crud
+from ...auth import get_current_user_async
+from ...database import get_async_db
+from ...pagination import next_cursor
+from ... import etags, serialization
+
+router = APIRouter(
+    prefix="/spending",
+    tags=["Spending"]
+)
+
+# --- Spending Endpoints (DB_MODE=async) ---
+@router.get("/", response_model=schemas.StandardResponse[List[schemas.Spending]], dependencies=[Depends(etags.list_etag_async(models.Spending))])
+async def read_spendings(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.UserData = Depends(get_current_user_async)
+):
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=400,
+            detail="start_date cannot be after end_date",
+        )
+    today = date.today()
+
+    if end_date is None:
+        end_date = today
+
+    if start_date is None:
+        start_date = today - timedelta(days=7)
+    spendings = await async_crud.get_spendings(db, user_id=current_user.id, skip=skip, limit=limit, start_date=start_date, end_date=end_date, category_id=category_id, cursor=cursor)
+    return serialization.respond(schemas.StandardResponse[List[schemas.Spending]], response, data=spendings, message="Transactions retrieved successfully", next_cursor=next_cursor(spendings, limit, "date", "id"))
+
+@router.post("/", response_model=schemas.StandardResponse[schemas.Spending])
+async def create_spending(spending: schemas.SpendingCreate, db: AsyncSession = Depends(get_async_db), current_user: schemas.UserData = Depends(get_current_user_async)):
+    new_spending = await async_crud.create_user_spending(db=db, spending=spending, user_id=current_user.id)
+    return schemas.StandardResponse(data=new_spending, message="Transaction added successfully")
+
+@router.delete("/{spending_id}", response_model=schemas.StandardResponse[schemas.Spending])
+async def delete_spending(spending_id: int, db: AsyncSession = Depends(get_async_db), current_user: schemas.UserData = Depends(get_current_user_async)):
+    deleted_spending = await async_crud.delete_user_spending(db=db, spending_id=spending_id, user_id=current_user.id)
+    if deleted_spending is None:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return schemas.StandardResponse(data=deleted_spending, message="Transaction deleted successfully")
@@ -1,19 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException,status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError, OperationalError
 from ..database import get_db
 from ..models import User
 from .. import schemas
-from ..crud import get_password_hash, verify_password
-from ..auth import create_access_token
+from ..passwords import hash_in_pool, verify_in_pool
+from ..auth import create_token_pair, decode_refresh_token
+from ..token_revocation import revoked_tokens
+from ..rate_limit import check_auth
 import logging
 
-from app.exceptions import UserAlreadyExistsException, DatabaseException
+from app.exceptions import UserAlreadyExistsException, DatabaseException, ServiceUnavailableException
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.post("/register", response_model=schemas.AuthResponse, status_code=status.HTTP_201_CREATED)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+def register(user: schemas.UserCreate, request: Request, db: Session = Depends(get_db)):
+    check_auth(request, user.email)
 
     try:
         # Check if user already exists
@@ -21,8 +25,8 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
         if existing_user:
             raise UserAlreadyExistsException(email=user.email)
         
-        # Hash password
-        hashed_password = get_password_hash(user.password)
+        # Hash password (in the password pool, off this worker thread)
+        hashed_password = hash_in_pool(user.password)
         
         # Create user object
         db_user = User(
@@ -40,7 +44,7 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
         
         logger.info(f"User registered successfully: {user.email}")
         
-    except UserAlreadyExistsException:
+    except (UserAlreadyExistsException, ServiceUnavailableException):
         # Re-raise custom exceptions
         raise
         
@@ -60,9 +64,9 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
         logger.error(f"Unexpected error during registration: {str(e)}", exc_info=True)
         raise DatabaseException("Registration failed. Please try again later.")
     
-    # Generate access token
+    # Generate access and refresh tokens
     try:
-        access_token = create_access_token(data={"sub": db_user.email})
+        tokens = create_token_pair(db_user.email)
     except Exception as e:
         logger.error(f"Token creation failed: {str(e)}", exc_info=True)
         raise DatabaseException("Failed to create authentication token")
@@ -70,7 +74,7 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
     user_data = schemas.UserData.model_validate(db_user)
     auth_data = schemas.AuthData(
             user=user_data,
-            access_token=access_token,
+            **tokens,
             token_type="bearer"
         )
         
@@ -87,18 +91,37 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login",response_model=schemas.AuthResponse)
-def login(user: schemas.UserLogin, db: Session = Depends(get_db)):
+def login(user: schemas.UserLogin, request: Request, db: Session = Depends(get_db)):
+    check_auth(request, user.email)
     db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.password):
+    if not db_user or not verify_in_pool(user.password, db_user.password):
         raise HTTPException(status_code=401, detail="Incorrect email or password")
     
-    access_token = create_access_token(data={"sub": db_user.email})
     return schemas.AuthResponse(
         success=True,
         data=schemas.AuthData(
             user=schemas.UserData.model_validate(db_user),
-            access_token=access_token,
+            **create_token_pair(db_user.email),
             token_type="bearer"
         ),
         message="User logged in successfully"
-    )
\ No newline at end of file
+    )
+
+
+@router.post("/refresh", response_model=schemas.TokenPairResponse)
+def refresh(body: schemas.RefreshRequest, db: Session = Depends(get_db)):
+    # A signature check, an indexed lookup and one INSERT: no password verify, so no rate limit either
+    payload = decode_refresh_token(body.refresh_token)
+    if db.query(User.id).filter(User.email == payload["sub"]).first() is None:
+        raise HTTPException(status_code=401, detail="User no longer exists")
+    if not revoked_tokens.revoke(db, payload["jti"], payload["exp"]):
+        raise HTTPException(status_code=401, detail="Refresh token has already been used")
+    return schemas.TokenPairResponse(data=schemas.TokenPairData(**create_token_pair(payload["sub"])))
+
+
+@router.post("/logout", response_model=schemas.MessageResponse)
+def logout(body: schemas.RefreshRequest, db: Session = Depends(get_db)):
+    # Access tokens are not revoked; they are short-lived and simply run out
+    payload = decode_refresh_token(body.refresh_token)
+    revoked_tokens.revoke(db, payload["jti"], payload["exp"])
+    return schemas.MessageResponse(message="Logged out successfully")
\ No newline at end of file
@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 from typing import  List, Optional
 from sqlalchemy import func
 from ..auth import get_current_user
+from ..pagination import next_cursor
+from .. import etags, serialization
 
 
 router = APIRouter(
@@ -12,10 +14,10 @@ router = APIRouter(
     tags=['categories']
 )
 # --- Category Endpoints ---
-@router.get("/", response_model=schemas.StandardResponse[List[schemas.Category]])
-def read_categories(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
-    categories = crud.get_categories(db, user_id=current_user.id, skip=skip, limit=limit)
-    return schemas.StandardResponse(data=categories, message="Categories retrieved successfully")
+@router.get("/", response_model=schemas.StandardResponse[List[schemas.Category]], dependencies=[Depends(etags.list_etag(models.Category))])
+def read_categories(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
+    categories = crud.get_categories(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    return serialization.respond(schemas.StandardResponse[List[schemas.Category]], response, data=categories, message="Categories retrieved successfully", next_cursor=next_cursor(categories, limit, "id"))
 
 @router.post("/", response_model=schemas.StandardResponse[schemas.Category])
 def create_category(category: schemas.CategoryCreate, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
@@ -0,0 +1,45 @@
+import itertools
+from datetime import date
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from .. import schemas, exporter
+from ..auth import get_current_user
+from ..database import get_db
+
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"]
+)
+
+# --- Transaction Export ---
+@router.get("/transactions")
+def export_transactions(
+    format: Literal["csv", "ndjson"] = "csv",
+    kind: Literal["all", "spending", "income"] = "all",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: schemas.UserData = Depends(get_current_user)
+):
+    """Stream every matching spending and/or income row as CSV or NDJSON."""
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=400,
+            detail="start_date cannot be after end_date",
+        )
+    sources = []
+    if kind in ("all", "spending"):
+        sources.append(exporter.spending_rows(db, current_user.id, start_date, end_date))
+    if kind in ("all", "income"):
+        sources.append(exporter.income_rows(db, current_user.id, start_date, end_date))
+
+    encode, media_type = exporter.ENCODERS[format]
+    return StreamingResponse(
+        encode(itertools.chain(*sources)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format}"'},
+    )
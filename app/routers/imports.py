@@ -0,0 +1,65 @@
+import json
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Form, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .. import schemas, importer
+from ..auth import get_current_user
+from ..database import get_db
+
+router = APIRouter(
+    prefix="/import",
+    tags=["Import"]
+)
+logger = logging.getLogger(__name__)
+
+# --- Statement Import ---
+@router.post("/statement")
+def import_statement(
+    file: UploadFile = File(...),
+    date_column: str = Form("date"),
+    amount_column: str = Form("amount"),
+    description_column: str = Form("description"),
+    category_column: Optional[str] = Form(None),
+    notes_column: Optional[str] = Form(None),
+    date_format: Optional[str] = Form(None),
+    negative_is_spending: bool = Form(True),
+    skip_duplicates: bool = Form(True),
+    db: Session = Depends(get_db),
+    current_user: schemas.UserData = Depends(get_current_user)
+):
+    """Import a CSV bank statement, streaming NDJSON progress events back.
+
+    Events are ``error`` (one per rejected row, with its line number),
+    ``progress`` (after every committed batch) and a final ``summary``.
+    """
+    mapping = importer.ColumnMapping(
+        date=date_column,
+        amount=amount_column,
+        description=description_column,
+        category=category_column,
+        notes=notes_column,
+        date_format=date_format,
+        negative_is_spending=negative_is_spending,
+    )
+
+    def events():
+        try:
+            for event in importer.import_statement(file.file, mapping, db, current_user.id, skip_duplicates):
+                yield json.dumps(event) + "\n"
+        except SQLAlchemyError as e:
+            # Batches committed so far stay imported; report where it stopped
+            db.rollback()
+            logger.error(f"Statement import failed: {str(e)}", exc_info=True)
+            yield json.dumps({"type": "failed", "error": "Import stopped because of a database error"}) + "\n"
+        except Exception as e:
+            # The 200 has already been sent, so unreadable files end with an event too
+            db.rollback()
+            logger.error(f"Statement import failed: {str(e)}", exc_info=True)
+            yield json.dumps({"type": "failed", "error": "Import stopped because the file could not be read"}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, List, Optional
 from .. import models, schemas, crud
 from ..auth import get_current_user
 from ..database import get_db
+from ..pagination import next_cursor
+from .. import etags, serialization
+from ..bulk import validate_items, collect_results
 
 router = APIRouter(
     prefix="/income",
@@ -11,12 +14,22 @@ router = APIRouter(
 )
 
 # --- Income Endpoints ---
-@router.get("/", response_model=schemas.StandardResponse[List[schemas.Income]])
-def read_incomes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
-    incomes = crud.get_incomes(db, user_id=current_user.id, skip=skip, limit=limit)
-    return schemas.StandardResponse(data=incomes, message="Incomes retrieved successfully")
+@router.get("/", response_model=schemas.StandardResponse[List[schemas.Income]], dependencies=[Depends(etags.list_etag(models.Income))])
+def read_incomes(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
+    incomes = crud.get_incomes(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    return serialization.respond(schemas.StandardResponse[List[schemas.Income]], response, data=incomes, message="Incomes retrieved successfully", next_cursor=next_cursor(incomes, limit, "date", "id"))
 
 @router.post("/", response_model=schemas.StandardResponse[schemas.Income])
 def create_income(income: schemas.IncomeCreate, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
     new_income = crud.create_user_income(db=db, income=income, user_id=current_user.id)
-    return schemas.StandardResponse(data=new_income, message="Income added successfully")
\ No newline at end of file
+    return schemas.StandardResponse(data=new_income, message="Income added successfully")
+
+@router.post("/bulk", response_model=schemas.StandardResponse[List[schemas.BulkItemResult]])
+def create_incomes_bulk(items: List[Any] = Body(...), db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
+    valid, failed = validate_items(items, schemas.IncomeCreate)
+    ids = crud.bulk_create_user_incomes(db=db, incomes=[i for _, i in valid], user_id=current_user.id)
+    created = {index: new_id for (index, _), new_id in zip(valid, ids)}
+    return schemas.StandardResponse(
+        data=collect_results(len(items), created, failed),
+        message=f"{len(created)} of {len(items)} incomes added"
+    )
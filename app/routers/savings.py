@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from .. import models, schemas, crud
 from ..auth import get_current_user
 from ..database import get_db
+from ..pagination import next_cursor
+from .. import etags, serialization
 
 router = APIRouter(
     prefix="/savings",
@@ -14,10 +16,23 @@ router = APIRouter(
 
 
 # --- Savings Endpoints ---
-@router.get("/", response_model=schemas.StandardResponse[List[schemas.SavingsGoal]])
-def read_savings_goals(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
-    goals = crud.get_savings_goals(db, user_id=current_user.id, skip=skip, limit=limit)
-    return schemas.StandardResponse(data=goals, message="Savings goals retrieved successfully")
+@router.get("/", response_model=schemas.StandardResponse[List[schemas.SavingsGoal]], dependencies=[Depends(etags.list_etag(models.SavingsGoal, models.SavingsContribution))])
+def read_savings_goals(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
+    goals = crud.get_savings_goals(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    return serialization.respond(schemas.StandardResponse[List[schemas.SavingsGoal]], response, data=goals, message="Savings goals retrieved successfully", next_cursor=next_cursor(goals, limit, "created_at", "id"))
+
+@router.get("/progress", response_model=schemas.StandardResponse[List[schemas.SavingsGoalProgress]])
+def read_savings_progress(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
+    """Goals with total_contributed, contribution_count and percent_complete instead of every contribution."""
+    goals = crud.get_savings_progress(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    return serialization.respond(schemas.StandardResponse[List[schemas.SavingsGoalProgress]], response, data=goals, message="Savings progress retrieved successfully", next_cursor=next_cursor(goals, limit, "created_at", "id"))
+
+@router.get("/{goal_id}/contributions/", response_model=schemas.StandardResponse[List[schemas.SavingsContribution]])
+def read_contributions(goal_id: int, response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
+    if crud.get_user_savings_goal(db, goal_id=goal_id, user_id=current_user.id) is None:
+        raise HTTPException(status_code=404, detail="Savings goal not found")
+    contributions = crud.get_savings_contributions(db, goal_id=goal_id, skip=skip, limit=limit, cursor=cursor)
+    return serialization.respond(schemas.StandardResponse[List[schemas.SavingsContribution]], response, data=contributions, message="Contributions retrieved successfully", next_cursor=next_cursor(contributions, limit, "date", "id"))
 
 @router.post("/", response_model=schemas.StandardResponse[schemas.SavingsGoal])
 def create_savings_goal(goal: schemas.SavingsGoalCreate, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
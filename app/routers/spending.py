@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status, Response
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, List, Optional
 from datetime import date, timedelta
 from .. import models, schemas, crud
 from ..auth import get_current_user
 from ..database import get_db
+from ..pagination import next_cursor
+from .. import etags, search, serialization
+from ..bulk import MAX_BULK_ITEMS, validate_items, collect_results
 
 router = APIRouter(
     prefix="/spending",
@@ -12,13 +15,15 @@ router = APIRouter(
 )
 
 # --- Spending Endpoints ---
-@router.get("/", response_model=schemas.StandardResponse[List[schemas.Spending]])
+@router.get("/", response_model=schemas.StandardResponse[List[schemas.Spending]], dependencies=[Depends(etags.list_etag(models.Spending))])
 def read_spendings(
+    response: Response,
     skip: int = 0, 
     limit: int = 100,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None, 
     category_id: Optional[int] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db), 
     current_user: schemas.UserData = Depends(get_current_user)
 ):
@@ -34,8 +39,31 @@ def read_spendings(
 
     if start_date is None:
         start_date = today - timedelta(days=7)
-    spendings = crud.get_spendings(db, user_id=current_user.id, skip=skip, limit=limit, start_date=start_date, end_date=end_date, category_id=category_id)
-    return schemas.StandardResponse(data=spendings, message="Transactions retrieved successfully")
+    spendings = crud.get_spendings(db, user_id=current_user.id, skip=skip, limit=limit, start_date=start_date, end_date=end_date, category_id=category_id, cursor=cursor)
+    return serialization.respond(schemas.StandardResponse[List[schemas.Spending]], response, data=spendings, message="Transactions retrieved successfully", next_cursor=next_cursor(spendings, limit, "date", "id"))
+
+@router.get("/search", response_model=schemas.StandardResponse[List[schemas.Spending]], dependencies=[Depends(etags.list_etag(models.Spending))])
+def search_spendings(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = 0,
+    limit: int = Query(50, ge=1, le=200),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: schemas.UserData = Depends(get_current_user)
+):
+    # Unlike the list, no date range by default: search covers all history
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=400,
+            detail="start_date cannot be after end_date",
+        )
+    if not search.terms(q):
+        raise HTTPException(status_code=400, detail="Search query must contain letters or digits")
+    spendings = search.search_spendings(db, user_id=current_user.id, q=q, skip=skip, limit=limit, start_date=start_date, end_date=end_date, category_id=category_id)
+    return serialization.respond(schemas.StandardResponse[List[schemas.Spending]], response, data=spendings, message="Transactions retrieved successfully")
 
 @router.post("/", response_model=schemas.StandardResponse[schemas.Spending])
 def create_spending(spending: schemas.SpendingCreate, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
@@ -43,12 +71,46 @@ def create_spending(spending: schemas.SpendingCreate, db: Session = Depends(get_
     return schemas.StandardResponse(data=new_spending, message="Transaction added successfully")
 
 
+@router.post("/bulk", response_model=schemas.StandardResponse[List[schemas.BulkItemResult]])
+def create_spendings_bulk(items: List[Any] = Body(...), db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
+    valid, failed = validate_items(items, schemas.SpendingCreate)
+    # One query for every referenced category instead of one per item
+    owned = crud.get_user_category_ids(db, current_user.id, {s.category_id for _, s in valid if s.category_id is not None})
+    to_create = []
+    for index, spending in valid:
+        if spending.category_id is not None and spending.category_id not in owned:
+            failed[index] = schemas.BulkItemResult(index=index, success=False, error="Category not found")
+        else:
+            to_create.append((index, spending))
+    ids = crud.bulk_create_user_spendings(db=db, spendings=[s for _, s in to_create], user_id=current_user.id)
+    created = {index: new_id for (index, _), new_id in zip(to_create, ids)}
+    return schemas.StandardResponse(
+        data=collect_results(len(items), created, failed),
+        message=f"{len(created)} of {len(items)} transactions added"
+    )
+
+@router.post("/bulk/delete", response_model=schemas.StandardResponse[List[schemas.BulkItemResult]])
+def delete_spendings_bulk(request: schemas.BulkDeleteRequest, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
+    if len(request.ids) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} items per request")
+    deleted = crud.bulk_delete_user_spendings(db=db, spending_ids=request.ids, user_id=current_user.id)
+    results = [
+        schemas.BulkItemResult(index=index, success=spending_id in deleted, id=spending_id,
+                               error=None if spending_id in deleted else "Transaction not found")
+        for index, spending_id in enumerate(request.ids)
+    ]
+    return schemas.StandardResponse(data=results, message=f"{len(deleted)} of {len(request.ids)} transactions deleted")
+
 @router.put("/{spending_id}", response_model=schemas.StandardResponse[schemas.Spending])
 def update_spending(spending_id: int, spending: schemas.SpendingUpdate, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
     updated_spending = crud.update_user_spending(db=db, spending_id=spending_id, spending=spending, user_id=current_user.id)
+    if updated_spending is None:
+        raise HTTPException(status_code=404, detail="Transaction not found")
     return schemas.StandardResponse(data=updated_spending, message="Transaction updated successfully")
 
 @router.delete("/{spending_id}", response_model=schemas.StandardResponse[schemas.Spending])
 def delete_spending(spending_id: int, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
-    deleted_spending = crud.delete_user_spending(db=db, spending_id=spending_id)
+    deleted_spending = crud.delete_user_spending(db=db, spending_id=spending_id, user_id=current_user.id)
+    if deleted_spending is None:
+        raise HTTPException(status_code=404, detail="Transaction not found")
     return schemas.StandardResponse(data=deleted_spending, message="Transaction deleted successfully")
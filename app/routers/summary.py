@@ -0,0 +1,54 @@
+from datetime import date
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from .. import models, schemas, summary
+from ..auth import get_current_user
+from ..database import get_db
+
+router = APIRouter(
+    prefix="/summary",
+    tags=["Summary"]
+)
+
+# --- Summary Endpoints ---
+@router.get("/", response_model=schemas.StandardResponse[schemas.Summary])
+def read_summary(
+    period: Literal["day", "week", "month"] = "month",
+    kind: Literal["all", "spending", "income"] = "all",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category_id: Optional[int] = None,
+    convert: bool = False,
+    db: Session = Depends(get_db),
+    current_user: schemas.UserData = Depends(get_current_user)
+):
+    """Totals, counts and averages per period and category (spending) or source (income).
+
+    By default there is one row per currency; convert=true folds every
+    currency into the user's default currency at each day's exchange rate.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=400,
+            detail="start_date cannot be after end_date",
+        )
+    if end_date is None:
+        end_date = date.today()
+    if start_date is None:
+        # Default to the month containing end_date
+        start_date = end_date.replace(day=1)
+
+    to_currency = models.Currency(current_user.default_currency) if convert else None
+
+    spending = income = []
+    if kind in ("all", "spending"):
+        spending = summary.spending_summary(db, current_user.id, period, start_date, end_date, category_id, to_currency)
+    if kind in ("all", "income"):
+        income = summary.income_summary(db, current_user.id, period, start_date, end_date, to_currency)
+    result = schemas.Summary(period=period, start_date=start_date, end_date=end_date,
+                             currency=to_currency.value if to_currency else None,
+                             spending=spending, income=income)
+    return schemas.StandardResponse(data=result, message="Summary retrieved successfully")
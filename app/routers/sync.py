@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from typing import List
+
+from .. import push, schemas, serialization, sync
+from ..bulk import MAX_BULK_ITEMS
+from ..auth import get_current_user
+from ..database import get_db
+
+router = APIRouter(
+    prefix="/sync",
+    tags=["Sync"]
+)
+
+# --- Sync Endpoints ---
+@router.get("/pull", response_model=schemas.StandardResponse[schemas.SyncPull])
+def pull_changes(
+    response: Response,
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user: schemas.UserData = Depends(get_current_user)
+):
+    """Everything created, updated or soft-deleted after the `since` token, oldest change first.
+
+    Keep pulling with the returned token while has_more is true.
+    """
+    changes = sync.pull(db, current_user.id, since=since, limit=limit)
+    return serialization.respond(schemas.StandardResponse[schemas.SyncPull], response, data=changes, message="Changes retrieved successfully")
+
+@router.post("/push", response_model=schemas.StandardResponse[List[schemas.SyncMutationResult]])
+def push_changes(request: schemas.SyncPushRequest, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
+    """Apply a batch of offline spending mutations in one transaction; one result per mutation, in order."""
+    if len(request.mutations) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} mutations per request")
+    results = push.push(db, current_user.id, request)
+    applied = sum(r.status == "applied" for r in results)
+    return schemas.StandardResponse(data=results, message=f"{applied} of {len(results)} changes applied")
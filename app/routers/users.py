@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from ..database import get_db
 from .. import crud, schemas
 from ..auth import get_current_user
+from ..rate_limit import check_auth
 
 router = APIRouter(
     prefix="/users",
@@ -13,8 +14,17 @@ router = APIRouter(
 async def read_users_me(current_user: schemas.UserData = Depends(get_current_user)):
     return schemas.StandardResponse(data=current_user, message="User profile retrieved successfully")
 
+@router.put("/me/", response_model=schemas.StandardResponse[schemas.UserData])
+def update_users_me(updates: schemas.UserUpdateRequest, db: Session = Depends(get_db), current_user: schemas.UserData = Depends(get_current_user)):
+    db_user = crud.get_user(db, user_id=current_user.id)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    updated_user = crud.update_user(db=db, db_user=db_user, updates=updates)
+    return schemas.StandardResponse(data=updated_user, message="User profile updated successfully")
+
 @router.post("/", response_model=schemas.StandardResponse[schemas.UserData])
-def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+def create_user(user: schemas.UserCreate, request: Request, db: Session = Depends(get_db)):
+    check_auth(request, user.email)
     db_user = crud.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
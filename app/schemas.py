@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, validator
-from typing import Optional, Any,List
-from datetime import datetime
+from typing import Optional, Any, List, Literal
+from datetime import date, datetime
 from enum import Enum
 
 
@@ -39,6 +39,7 @@ class StandardResponse(BaseModel, Generic[T]):
     success: bool = True
     data: Optional[T] = None
     message: Optional[str] = None
+    next_cursor: Optional[str] = None  # set on list responses when another page exists
 
 
 class UserCreate(BaseModel):
@@ -74,6 +75,7 @@ class AuthData(BaseModel):
     """Authentication response data structure"""
     user: UserData
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
 
 
@@ -84,6 +86,24 @@ class AuthResponse(BaseModel):
     message: Optional[str] = "Authentication successful"
 
 
+class RefreshRequest(BaseModel):
+    """Refresh token to exchange (POST /refresh) or revoke (POST /logout)"""
+    refresh_token: str
+
+
+class TokenPairData(BaseModel):
+    """New tokens issued by POST /refresh; the refresh token sent is no longer valid"""
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+
+
+class TokenPairResponse(BaseModel):
+    success: bool = True
+    data: TokenPairData
+    message: Optional[str] = "Token refreshed successfully"
+
+
 class UserProfileResponse(BaseModel):
     """Response for getting user profile (no token)"""
     success: bool = True
@@ -110,6 +130,18 @@ class MessageResponse(BaseModel):
     success: bool = True
     message: str
 
+class BulkItemResult(BaseModel):
+    """Outcome of one item in a bulk request"""
+    index: int
+    success: bool
+    id: Optional[int] = None
+    error: Optional[Any] = None
+
+
+class BulkDeleteRequest(BaseModel):
+    """Ids to soft-delete in one request"""
+    ids: List[int]
+
 # --- Auth Schemas ---
 class Token(BaseModel):
     access_token: str
@@ -131,6 +163,7 @@ class CategoryCreate(CategoryBase):
 class Category(CategoryBase):
     id: int
     user_id: int
+    version: int = 0
 
     class Config:
         from_attributes = True
@@ -141,6 +174,7 @@ class IncomeBase(BaseModel):
     source: str
     type: Optional[str] = None 
     date: Optional[datetime] = None
+    currency: Currency = Currency.NGN
 
 
 class IncomeCreate(IncomeBase):
@@ -149,6 +183,7 @@ class IncomeCreate(IncomeBase):
 class Income(IncomeBase):
     id: int
     user_id: int
+    version: int = 0
 
     class Config:
         from_attributes = True
@@ -161,6 +196,7 @@ class SpendingBase(BaseModel):
     date: Optional[datetime] = None
     category_id: Optional[int] = None # This is still in Spending model (line 55)
     is_deleted: bool = False
+    currency: Currency = Currency.NGN
 
 class SpendingCreate(SpendingBase):
     pass
@@ -172,6 +208,8 @@ class SpendingUpdate(SpendingBase):
 class Spending(SpendingBase):
     id: int
     user_id: int
+    version: int = 0
+    client_id: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -188,6 +226,7 @@ class SavingsContribution(SavingsContributionBase):
     id: int
     goal_id: int
     user_id: Optional[int] = None
+    version: int = 0
 
     class Config:
         from_attributes = True
@@ -201,12 +240,82 @@ class SavingsGoalBase(BaseModel):
 class SavingsGoalCreate(SavingsGoalBase):
     pass
 
-class SavingsGoal(SavingsGoalBase):
+class SavingsGoalRecord(SavingsGoalBase):
     id: int
     user_id: int
     created_at: datetime
-    # contributions -> savings_contributions in model
-    savings_contributions: List[SavingsContribution] = []
+    version: int = 0
 
     class Config:
         from_attributes = True
+
+class SavingsGoal(SavingsGoalRecord):
+    # contributions -> savings_contributions in model
+    savings_contributions: List[SavingsContribution] = []
+
+class SavingsGoalProgress(SavingsGoalBase):
+    id: int
+    user_id: int
+    created_at: datetime
+    total_contributed: float = 0.0
+    contribution_count: int = 0
+    percent_complete: float = 0.0
+
+# --- Summary Schemas ---
+class SpendingSummary(BaseModel):
+    period: date  # first day of the day/week/month bucket
+    category_id: Optional[int] = None
+    currency: str
+    total: float
+    count: int
+    average: float
+
+class IncomeSummary(BaseModel):
+    period: date
+    source: Optional[str] = None
+    currency: str
+    total: float
+    count: int
+    average: float
+
+class Summary(BaseModel):
+    period: str
+    start_date: date
+    end_date: date
+    currency: Optional[str] = None  # set when totals were converted into one currency
+    spending: List[SpendingSummary] = []
+    income: List[IncomeSummary] = []
+
+# --- Sync Schemas ---
+class SyncPull(BaseModel):
+    token: int  # pass back as `since` on the next pull
+    has_more: bool = False
+    categories: List[Category] = []
+    incomes: List[Income] = []
+    spendings: List[Spending] = []  # soft-deleted rows included, with is_deleted=true
+    savings_goals: List[SavingsGoalRecord] = []
+    savings_contributions: List[SavingsContribution] = []
+
+class SyncMutation(BaseModel):
+    op: Literal["upsert", "delete"]
+    # The row is identified by the client's own id, or by the server id for
+    # rows the client did not create itself
+    client_id: Optional[str] = None
+    id: Optional[int] = None
+    base_version: Optional[int] = None  # version the client last saw; None when creating
+    data: Optional[SpendingCreate] = None  # required for upsert
+
+class SyncPushRequest(BaseModel):
+    mutations: List[SyncMutation]
+    # "reject": a row changed on the server since base_version is reported as a conflict
+    # "last_writer_wins": the pushed change is applied anyway
+    on_conflict: Literal["reject", "last_writer_wins"] = "reject"
+
+class SyncMutationResult(BaseModel):
+    index: int
+    status: Literal["applied", "conflict", "error"]
+    client_id: Optional[str] = None
+    id: Optional[int] = None
+    version: Optional[int] = None
+    error: Optional[str] = None
+    server: Optional[Spending] = None  # current server row, on conflict
@@ -0,0 +1,66 @@
+"""Full-text search over spending item names and notes.
+
+The query is split into words; every word must match, and the last letters
+of a word may be missing ("ube" finds "Uber"). Results are ordered by
+relevance, then newest first, and take the same date and category filters
+as GET /spending/.
+
+Postgres matches against a GIN-indexed tsvector of the two columns, with
+trigram similarity (pg_trgm, also GIN-indexed) as a fallback for misspelt
+words. SQLite, for local runs and tests, uses the spending_fts FTS5 table.
+Both are defined in app/models.py.
+"""
+import re
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import bindparam, column, func, literal_column, or_, table
+from sqlalchemy.orm import Session
+
+from . import crud, models
+
+MAX_TERMS = 8
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+_spending_fts = table("spending_fts", column("rowid"), column("rank"))
+
+
+def terms(q: str) -> List[str]:
+    """Lowercase words of the query; punctuation never reaches the match syntax."""
+    return _WORD.findall(q.lower())[:MAX_TERMS]
+
+
+def _postgres(db: Session, words: List[str]):
+    document = literal_column(f"({models.SPENDING_SEARCH_DOCUMENT})")
+    vector = literal_column(f"to_tsvector('simple', {models.SPENDING_SEARCH_DOCUMENT})")
+    tsquery = func.to_tsquery(literal_column("'simple'"), bindparam("tsquery", " & ".join(f"{w}:*" for w in words)))
+    phrase = bindparam("phrase", " ".join(words))
+    rank = func.ts_rank(vector, tsquery) + func.word_similarity(phrase, document)
+    # <% is "phrase is similar to some part of the document"
+    query = db.query(models.Spending).filter(or_(vector.bool_op("@@")(tsquery), phrase.bool_op("<%")(document)))
+    return query, rank.desc()
+
+
+def _sqlite(db: Session, words: List[str]):
+    # Quoted so FTS5 operators in user input are plain words; * matches prefixes
+    match = " ".join(f'"{w}"*' for w in words)
+    query = (
+        db.query(models.Spending)
+        .join(_spending_fts, _spending_fts.c.rowid == models.Spending.id)
+        .filter(literal_column("spending_fts").bool_op("MATCH")(match))
+    )
+    # FTS5's rank is bm25, lower is better
+    return query, _spending_fts.c.rank
+
+
+def search_spendings(db: Session, user_id: int, q: str, skip: int = 0, limit: int = 50,
+    start_date: Optional[date] = None, end_date: Optional[date] = None, category_id: Optional[int] = None):
+    words = terms(q)
+    if not words:
+        return []
+    build = _postgres if db.get_bind().dialect.name == "postgresql" else _sqlite
+    query, relevance = build(db, words)
+    query = crud.filter_spendings(query, user_id, start_date, end_date, category_id)
+    query = query.order_by(relevance, models.Spending.date.desc(), models.Spending.id.desc())
+    return query.offset(skip).limit(limit).all()
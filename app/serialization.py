@@ -0,0 +1,49 @@
+"""Single-pass JSON responses for large payloads.
+
+Returning a pydantic model from a route makes FastAPI validate it again
+against ``response_model``, convert it to plain Python and ``json.dumps``
+the result, so every row of a list goes through ``from_attributes``
+conversion twice. ``respond`` validates the ORM rows once with a cached
+``TypeAdapter`` and has pydantic-core write the JSON bytes directly; routes
+keep their ``response_model`` for the OpenAPI schema.
+
+    return serialization.respond(SpendingList, response, data=spendings, message="...")
+"""
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def adapter(response_type: Any) -> TypeAdapter:
+    """TypeAdapters build a validator and serializer, so build each once."""
+    return TypeAdapter(response_type)
+
+
+class PydanticJSONResponse(JSONResponse):
+    """JSONResponse that passes already-serialized bytes through unchanged."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return super().render(content)
+
+
+def dump_json(response_type: Any, **fields) -> bytes:
+    type_adapter = adapter(response_type)
+    return type_adapter.dump_json(type_adapter.validate_python(fields, from_attributes=True))
+
+
+def respond(response_type: Any, response: Response, status_code: int = 200, **fields) -> PydanticJSONResponse:
+    """Serialize ``response_type(**fields)`` in one pass.
+
+    ``response`` is the route's injected Response: FastAPI only copies the
+    headers dependencies set on it (such as the ETag) when the route returns
+    a model, so they are carried over here.
+    """
+    json_response = PydanticJSONResponse(dump_json(response_type, **fields), status_code=status_code)
+    json_response.raw_headers.extend(response.headers.raw)
+    return json_response
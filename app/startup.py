@@ -0,0 +1,93 @@
+"""Application startup and shutdown.
+
+Nothing here runs at import time: the lifespan hook does the one-off work
+an instance needs before serving, so it happens before the first request
+instead of during it.
+
+* tables are only created when AUTO_CREATE_TABLES is on (the default
+  outside ENVIRONMENT=production); in production Alembic owns the schema
+* DB_POOL_WARM connections are opened, so the first request does not pay
+  for connecting (and TLS on managed Postgres)
+* the OpenAPI document and the response TypeAdapters are built up front
+* the password pool's pending limit is fitted to the request threadpool
+"""
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from . import models, passwords, serialization
+from .database import async_engine, engine
+
+logger = logging.getLogger(__name__)
+
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development").lower()
+AUTO_CREATE_TABLES = os.getenv(
+    "AUTO_CREATE_TABLES", "false" if ENVIRONMENT == "production" else "true"
+).lower() in ("1", "true", "yes", "on")
+DB_POOL_WARM = int(os.getenv("DB_POOL_WARM", "1"))
+
+
+def create_tables():
+    models.Base.metadata.create_all(bind=engine)
+
+
+def warm_pool(count: int = DB_POOL_WARM):
+    """Open ``count`` connections at once, then return them all to the pool."""
+    connections = []
+    try:
+        for _ in range(count):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+async def warm_async_pool(count: int = DB_POOL_WARM):
+    connections = []
+    try:
+        for _ in range(count):
+            connection = await async_engine.connect()
+            connections.append(connection)
+            await connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            await connection.close()
+
+
+def prebuild(app: FastAPI):
+    """Build the OpenAPI document and the serializers the list routes use."""
+    app.openapi()
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.response_model is not None:
+            serialization.adapter(route.response_model)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    if AUTO_CREATE_TABLES:
+        await run_in_threadpool(create_tables)
+    try:
+        await run_in_threadpool(warm_pool)
+        if async_engine is not None:
+            await warm_async_pool()
+    except Exception as exc:
+        # Serve anyway: requests will connect on demand and report their own errors
+        logger.warning(f"Could not warm the database pool: {exc}")
+    prebuild(app)
+    # Sync auth routes wait on the pool from a request thread; leave most threads for everything else
+    passwords.password_pool.fit_to_threadpool(anyio.to_thread.current_default_thread_limiter().total_tokens)
+    logger.info(f"Startup finished in {(time.perf_counter() - started) * 1000:.0f} ms")
+    yield
+    engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
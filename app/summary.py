@@ -0,0 +1,104 @@
+"""Spending and income totals aggregated in the database.
+
+Each summary is a single GROUP BY over the user's rows for a date range,
+bucketed by day, week (starting Monday) or month, so the client receives one
+row per (period, category or source, currency) instead of every transaction.
+Spending is summed from the daily rollups in app/rollups.py; income, which
+has far fewer rows, straight from the income table. Either can be folded
+into a single currency using the as-of rates in app/exchange_rates.py.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+
+from sqlalchemy import Date, cast, func, literal_column, select
+from sqlalchemy.orm import Session
+
+from . import exchange_rates, models
+from .exceptions import MissingExchangeRateException
+
+PERIODS = ("day", "week", "month")
+
+
+def period_bucket(column, period: str, dialect: str):
+    """SQL expression truncating a DateTime column to the start of its period."""
+    if period not in PERIODS:
+        raise ValueError(f"period must be one of {', '.join(PERIODS)}")
+    # The period is inlined rather than bound: Postgres only matches the SELECT
+    # expression to the GROUP BY one when they are textually identical.
+    if dialect == "postgresql":
+        return cast(func.date_trunc(literal_column(f"'{period}'"), column), Date)
+    if dialect == "sqlite":
+        if period == "day":
+            return func.date(column)
+        if period == "week":
+            # Forward to the coming Sunday (or stay on it), then back to Monday
+            return func.date(column, literal_column("'weekday 0'"), literal_column("'-6 days'"))
+        return func.strftime(literal_column("'%Y-%m-01'"), column)
+    raise ValueError(f"Summaries are not supported on '{dialect}' databases")
+
+
+def _as_date(value) -> date:
+    # SQLite returns the bucket as an ISO string, Postgres as a date
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _require_rates(db: Session, stmt, to_currency: models.Currency) -> None:
+    """Fail up front rather than silently dropping rows that have no rate to convert with."""
+    missing = exchange_rates.missing_rates(db, stmt, to_currency)
+    if missing:
+        raise MissingExchangeRateException(missing)
+
+
+def spending_summary(db: Session, user_id: int, period: str, start_date: date, end_date: date,
+                     category_id: Optional[int] = None, to_currency: Optional[models.Currency] = None) -> List[dict]:
+    """Read from the daily rollups, so the cost follows the number of days, not of transactions.
+
+    With ``to_currency`` every currency is folded into it, each rollup day
+    converted at that day's rate in the same query.
+    """
+    rollup = models.SpendingDailyTotal
+    bucket = period_bucket(rollup.day, period, db.get_bind().dialect.name).label("period")
+    criteria = [rollup.user_id == user_id, rollup.day >= start_date, rollup.day <= end_date]
+    if category_id:
+        criteria.append(rollup.category_id == category_id)
+    groups = [bucket, rollup.category_id]
+    if to_currency is None:
+        groups.append(rollup.currency)
+        total = func.sum(rollup.total)
+    else:
+        _require_rates(db, select(rollup.currency, func.min(rollup.day)).where(*criteria, rollup.count != 0)
+                       .group_by(rollup.currency), to_currency)
+        total = func.sum(rollup.total * exchange_rates.rate_to(rollup.currency, rollup.day, to_currency))
+    count = func.sum(rollup.count)
+    stmt = select(*groups, total, count).where(*criteria).group_by(*groups).having(count > 0).order_by(*groups)
+    return [
+        {"period": _as_date(row[0]), "category_id": row[1] or None,
+         "currency": (to_currency or row[2]).value, "total": row[-2], "count": row[-1], "average": row[-2] / row[-1]}
+        for row in db.execute(stmt)
+    ]
+
+
+def income_summary(db: Session, user_id: int, period: str, start_date: date, end_date: date,
+                   to_currency: Optional[models.Currency] = None) -> List[dict]:
+    income = models.Income
+    bucket = period_bucket(income.date, period, db.get_bind().dialect.name).label("period")
+    criteria = [
+        income.user_id == user_id,
+        income.date >= datetime.combine(start_date, time.min),
+        income.date < datetime.combine(end_date + timedelta(days=1), time.min),
+    ]
+    groups = [bucket, income.source]
+    if to_currency is None:
+        groups.append(income.currency)
+        total = func.sum(income.amount)
+    else:
+        _require_rates(db, select(income.currency, func.min(income.date)).where(*criteria).group_by(income.currency),
+                       to_currency)
+        total = func.sum(income.amount * exchange_rates.rate_to(income.currency, income.date, to_currency))
+    count = func.count(income.id)
+    stmt = select(*groups, total, count).where(*criteria).group_by(*groups).order_by(*groups)
+    return [
+        {"period": _as_date(row[0]), "source": row[1],
+         "currency": (to_currency or row[2]).value, "total": row[-2], "count": row[-1], "average": row[-2] / row[-1]}
+        for row in db.execute(stmt)
+    ]
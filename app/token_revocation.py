@@ -0,0 +1,89 @@
+"""Single-use refresh tokens.
+
+A refresh token is consumed by inserting its jti into ``revoked_tokens``;
+the primary key makes that atomic, so two requests racing with the same
+token (or a replay of a stolen one) get exactly one new pair between them.
+Logout inserts the same row.
+
+Revoked jtis are also remembered in this process until the token would have
+expired, so a replay is refused without a database round trip. The set only
+holds tokens that were used here, 32 hex characters each, in the order they
+were revoked; past ``max_size`` the oldest are dropped (the table still has
+them, so a replay of one costs a round trip, not a new pair). Rows past their
+expiry are deleted from the table every PURGE_EVERY revocations.
+"""
+import datetime
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import models
+
+PURGE_EVERY = 1000
+
+
+class RevocationList:
+    def __init__(self, max_size: int = 100_000):
+        self.max_size = max_size
+        self._expiry: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._since_purge = 0
+
+    def __contains__(self, jti: str) -> bool:
+        return jti in self._expiry
+
+    def __len__(self):
+        return len(self._expiry)
+
+    def remember(self, jti: str, exp: float):
+        with self._lock:
+            self._expiry[jti] = exp
+            # Refresh tokens all live equally long, so the oldest entries expire first
+            now = time.time()
+            while self._expiry:
+                oldest, oldest_exp = next(iter(self._expiry.items()))
+                if len(self._expiry) <= self.max_size and oldest_exp > now:
+                    break
+                del self._expiry[oldest]
+
+    def revoke(self, db: Session, jti: str, exp: float) -> bool:
+        """Revoke ``jti``; False if it already was, here or by another process."""
+        if jti in self._expiry:
+            return False
+        db.add(models.RevokedToken(jti=jti, expires_at=datetime.datetime.utcfromtimestamp(exp)))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            self.remember(jti, exp)
+            return False
+        self.remember(jti, exp)
+        with self._lock:
+            self._since_purge += 1
+            purge = self._since_purge >= PURGE_EVERY
+            if purge:
+                self._since_purge = 0
+        if purge:
+            purge_expired(db)
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._expiry.clear()
+            self._since_purge = 0
+
+
+def purge_expired(db: Session) -> int:
+    deleted = (
+        db.query(models.RevokedToken)
+        .filter(models.RevokedToken.expires_at < datetime.datetime.utcnow())
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
+
+
+revoked_tokens = RevocationList()
@@ -0,0 +1,76 @@
+"""POST /spending/bulk vs. the same transactions sent one POST /spending/ at a time.
+
+    python benchmarks/bench_bulk.py --items 50,200,1000
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--url", help="database URL (default: a temporary SQLite file)")
+parser.add_argument("--items", default="50,200,1000", help="comma separated batch sizes")
+args = parser.parse_args()
+
+db_url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_bulk.db')}"
+os.environ["DATABASE_URL"] = db_url
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import models  # noqa: E402
+from app.auth import create_access_token  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def payload(n):
+    now = datetime.utcnow()
+    return [
+        {"amount": 1.0 + i, "item_name": f"item {i}", "notes": "bench", "date": (now - timedelta(minutes=i)).isoformat()}
+        for i in range(n)
+    ]
+
+
+def main():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(models.User(email="bench@example.com", first_name="Bench", last_name="User"))
+    db.commit()
+    db.close()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'bench@example.com'}, timedelta(hours=1))}"}
+
+    with TestClient(app) as client:
+        client.get("/categories/", headers=headers)  # warm up auth cache and pool
+        for n in [int(x) for x in args.items.split(",")]:
+            items = payload(n)
+            t0 = time.perf_counter()
+            for item in items:
+                assert client.post("/spending/", json=item, headers=headers).status_code == 200
+            one_by_one = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            r = client.post("/spending/bulk", json=items, headers=headers)
+            bulk = time.perf_counter() - t0
+            assert r.status_code == 200 and all(x["success"] for x in r.json()["data"])
+
+            print(f"  {n:>5} items  one-by-one {one_by_one * 1000:9.1f} ms ({n / one_by_one:8.0f} rows/s)   "
+                  f"bulk {bulk * 1000:8.1f} ms ({n / bulk:8.0f} rows/s)   x{one_by_one / bulk:.1f}")
+
+    Base.metadata.drop_all(bind=engine)
+    if not args.url:
+        os.remove(engine.url.database)
+
+
+if __name__ == "__main__":
+    main()
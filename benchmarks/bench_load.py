@@ -0,0 +1,245 @@
+"""End-to-end load test: mixed API traffic, throughput and latency percentiles.
+
+Drives the ASGI app in-process (default, against a temporary SQLite database
+unless DATABASE_URL is set) or a running server with --url. The dataset is
+created through the API, so both targets see the same requests: --users
+accounts, each with --spendings rows spread over --days and a few savings
+goals. Accounts that already exist (a re-run against the same server) are
+logged into and not seeded again.
+
+Workers then send requests for --duration seconds, picking operations by the
+--mix weights:
+
+    login          POST /login (bcrypt)
+    list_spending  GET /spending/ with a random 30-day window
+    create         POST /spending/
+    savings        GET /savings/
+
+Reports req/s and p50/p95/p99 per operation and overall. --output writes the
+results, run settings and git commit as JSON; --compare prints the change
+against an earlier results file.
+
+    python benchmarks/bench_load.py --users 20 --spendings 500 --concurrency 32 --duration 30
+    python benchmarks/bench_load.py --url http://localhost:8080 --output results/load.json
+    python benchmarks/bench_load.py --output new.json --compare results/load.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--url", default=None, help="base URL of a running server (default: the app in-process)")
+parser.add_argument("--users", type=int, default=10, help="accounts to create and spread traffic across")
+parser.add_argument("--spendings", type=int, default=200, help="spending rows per account")
+parser.add_argument("--goals", type=int, default=3, help="savings goals per account, two contributions each")
+parser.add_argument("--days", type=int, default=365, help="history the spending rows are spread over")
+parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before the run")
+parser.add_argument("--mix", default="login=5,list_spending=50,create=20,savings=25",
+                    help="operation weights, name=weight,...")
+parser.add_argument("--seed", type=int, default=42, help="random seed for data and operation choice")
+parser.add_argument("--output", default=None, help="write results JSON here")
+parser.add_argument("--compare", default=None, help="results JSON of an earlier run to compare against")
+args = parser.parse_args()
+
+if args.url is None:
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_load.db')}")
+    os.environ.setdefault("SECRET_KEY", "bench-secret")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+    os.environ.setdefault("AUTO_CREATE_TABLES", "true")
+    # every simulated client shares one address
+    os.environ.setdefault("AUTH_RATE_LIMIT_PER_IP", "0")
+    os.environ.setdefault("AUTH_RATE_LIMIT_PER_EMAIL", "0")
+
+import httpx  # noqa: E402
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+PASSWORD = "load-test-password"
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct))] if samples else float("nan")
+
+
+class Account:
+    def __init__(self, email):
+        self.email = email
+        self.headers = {}
+
+
+async def seed_account(client, index, rng):
+    account = Account(f"load{index}@example.com")
+    response = await client.post("/register", json={
+        "email": account.email, "password": PASSWORD, "first_name": "Load", "last_name": f"User {index}",
+        "default_currency": "NGN",
+    })
+    created = response.status_code == 201
+    if not created:
+        response = await client.post("/login", json={"email": account.email, "password": PASSWORD})
+    response.raise_for_status()
+    account.headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+    if not created:
+        return account
+
+    categories = []
+    for name in ("Food", "Transport", "Rent", "Fun"):
+        r = await client.post("/categories/", json={"category_name": name}, headers=account.headers)
+        categories.append(r.json()["data"]["id"])
+    start = datetime.now() - timedelta(days=args.days)
+    rows = [
+        {"amount": round(rng.uniform(1, 500), 2), "item_name": "item", "category_id": rng.choice(categories),
+         "date": (start + timedelta(seconds=rng.randrange(args.days * 86400))).isoformat(timespec="seconds")}
+        for _ in range(args.spendings)
+    ]
+    for offset in range(0, len(rows), 1000):
+        r = await client.post("/spending/bulk", json=rows[offset:offset + 1000], headers=account.headers)
+        r.raise_for_status()
+    for g in range(args.goals):
+        r = await client.post("/savings/", json={"goal_name": f"Goal {g}", "target_amount": 1000.0}, headers=account.headers)
+        goal_id = r.json()["data"]["id"]
+        for amount in (50.0, 75.0):
+            await client.post(f"/savings/{goal_id}/contributions/", json={"amount": amount}, headers=account.headers)
+    return account
+
+
+def operations(rng):
+    async def login(client, account):
+        return await client.post("/login", json={"email": account.email, "password": PASSWORD})
+
+    async def list_spending(client, account):
+        end = date.today() - timedelta(days=rng.randrange(args.days))
+        params = {"start_date": (end - timedelta(days=30)).isoformat(), "end_date": end.isoformat(), "limit": 100}
+        return await client.get("/spending/", params=params, headers=account.headers)
+
+    async def create(client, account):
+        return await client.post("/spending/", json={"amount": round(rng.uniform(1, 100), 2), "item_name": "load"},
+                                 headers=account.headers)
+
+    async def savings(client, account):
+        return await client.get("/savings/", headers=account.headers)
+
+    return {"login": login, "list_spending": list_spending, "create": create, "savings": savings}
+
+
+async def drive(client, accounts, ops, weights, deadline, samples, errors, rng):
+    names = list(weights)
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights=[weights[n] for n in names])[0]
+        t0 = time.perf_counter()
+        try:
+            response = await ops[name](client, rng.choice(accounts))
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        elapsed = (time.perf_counter() - t0) * 1000
+        if samples is not None:
+            (samples[name] if ok else errors[name]).append(elapsed)
+
+
+async def run(client):
+    rng = random.Random(args.seed)
+    weights = {name: float(weight) for name, weight in (item.split("=") for item in args.mix.split(","))}
+    ops = operations(rng)
+    unknown = set(weights) - set(ops)
+    if unknown:
+        raise SystemExit(f"Unknown operations in --mix: {', '.join(sorted(unknown))}")
+
+    t0 = time.perf_counter()
+    accounts = [await seed_account(client, i, rng) for i in range(args.users)]
+    print(f"seeded {args.users} accounts x {args.spendings} spendings in {time.perf_counter() - t0:.1f}s")
+
+    workers = [random.Random(args.seed + i) for i in range(args.concurrency)]
+    warmup_end = time.perf_counter() + args.warmup
+    await asyncio.gather(*(drive(client, accounts, ops, weights, warmup_end, None, None, r) for r in workers))
+
+    samples = {name: [] for name in weights}
+    errors = {name: [] for name in weights}
+    started = time.perf_counter()
+    await asyncio.gather(*(drive(client, accounts, ops, weights, started + args.duration, samples, errors, r)
+                           for r in workers))
+    return summarize(samples, errors, time.perf_counter() - started)
+
+
+def summarize(samples, errors, elapsed):
+    def stats(latencies, failed):
+        return {
+            "requests": len(latencies), "errors": len(failed), "rps": round(len(latencies) / elapsed, 2),
+            **{f"p{int(p * 100)}_ms": round(percentile(latencies, p), 2) for p in PERCENTILES},
+        }
+    operations = {name: stats(samples[name], errors[name]) for name in samples}
+    overall = stats([s for v in samples.values() for s in v], [e for v in errors.values() for e in v])
+    return {"elapsed_seconds": round(elapsed, 2), "overall": overall, "operations": operations}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    print(f"\n{'operation':<14}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    rows = list(results["operations"].items()) + [("overall", results["overall"])]
+    for name, r in rows:
+        line = f"{name:<14}{r['rps']:>9.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['errors']:>8}"
+        before = baseline and (baseline["overall"] if name == "overall" else baseline["operations"].get(name))
+        if before:
+            line += (f"   req/s {100 * (r['rps'] / before['rps'] - 1):+6.1f}%"
+                     f"  p95 {100 * (r['p95_ms'] / before['p95_ms'] - 1):+6.1f}%")
+        print(line)
+
+
+async def main():
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+            results = await run(client)
+    else:
+        from app.main import app
+        # ASGITransport does not run the lifespan itself
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+                results = await run(client)
+
+    document = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "target": args.url or "in-process",
+        "python": platform.python_version(),
+        "settings": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        **results,
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"compared with {baseline.get('commit')} ({baseline.get('timestamp')})")
+    print_results(document, baseline)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"\nresults written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+"""Login throughput with bcrypt inline vs. in the password process pool.
+
+Fires concurrent POST /login requests at the in-process app for each worker
+count and reports logins/sec, logins/sec per worker, latency, and the p99 of
+a /health probe running alongside (which is what suffers when bcrypt starves
+the request threadpool).
+
+    python benchmarks/bench_login.py --workers 0,1,2,4 --requests 200 --concurrency 16
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--workers", default=f"0,{os.cpu_count() or 1}",
+                    help="comma separated password pool sizes; 0 = inline bcrypt")
+parser.add_argument("--requests", type=int, default=100, help="logins per configuration")
+parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+args = parser.parse_args()
+
+db_path = os.path.join(tempfile.mkdtemp(), "bench_login.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("AUTH_RATE_LIMIT_PER_IP", "0")
+os.environ.setdefault("AUTH_RATE_LIMIT_PER_EMAIL", "0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import models, passwords  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+def run(client, workers):
+    passwords.configure_pool(workers=workers, max_pending=10_000)
+    # Warm up: start the worker processes outside the measured window
+    client.post("/login", json={"email": "bench@example.com", "password": "password123"})
+
+    stop = threading.Event()
+    probe = []
+
+    def health_probe():
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            client.get("/health")
+            probe.append((time.perf_counter() - t0) * 1000)
+            time.sleep(0.01)
+
+    def login(_):
+        t0 = time.perf_counter()
+        r = client.post("/login", json={"email": "bench@example.com", "password": "password123"})
+        assert r.status_code == 200, r.text
+        return (time.perf_counter() - t0) * 1000
+
+    prober = threading.Thread(target=health_probe)
+    prober.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = list(pool.map(login, range(args.requests)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    prober.join()
+
+    rate = args.requests / elapsed
+    return {
+        "rate": rate,
+        "per_core": rate / max(workers, 1),
+        "p50": statistics.median(latencies),
+        "p99": percentile(latencies, 0.99),
+        "health_p99": percentile(probe, 0.99) if probe else float("nan"),
+    }
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(models.User(email="bench@example.com", password=passwords.get_password_hash("password123"),
+                       first_name="Bench", last_name="User"))
+    db.commit()
+    db.close()
+
+    print(f"{os.cpu_count()} CPUs, {args.requests} logins at concurrency {args.concurrency}")
+    with TestClient(app) as client:
+        for workers in [int(w) for w in args.workers.split(",")]:
+            r = run(client, workers)
+            label = "inline" if workers == 0 else f"{workers} worker(s)"
+            print(f"  {label:<12} {r['rate']:7.1f} logins/s  {r['per_core']:7.1f} /s/core  "
+                  f"p50 {r['p50']:7.1f} ms  p99 {r['p99']:7.1f} ms  /health p99 {r['health_p99']:7.1f} ms")
+    passwords.password_pool.shutdown()
+    os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main()
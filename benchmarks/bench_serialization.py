@@ -0,0 +1,83 @@
+"""Cost of turning a page of Spending rows into a JSON response body.
+
+"before" is the old route path: build ``schemas.StandardResponse`` from the
+ORM rows in the route, then FastAPI's ``serialize_response`` validates it
+again against ``response_model`` and ``JSONResponse`` runs ``json.dumps``.
+"after" is ``serialization.respond``: one validation with a cached
+TypeAdapter and pydantic-core writing the bytes. Also reports the gzip size.
+
+    python benchmarks/bench_serialization.py --rows 1000,10000 --runs 20
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--rows", default="1000,10000", help="comma separated page sizes")
+parser.add_argument("--runs", type=int, default=20, help="serializations per variant")
+args = parser.parse_args()
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import Response  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from app import models, schemas, serialization  # noqa: E402
+
+SpendingList = schemas.StandardResponse[List[schemas.Spending]]
+response_field = create_model_field(name="Response_read_spendings", type_=SpendingList, mode="serialization")
+
+
+def make_rows(count):
+    start = datetime(2024, 1, 1)
+    return [
+        models.Spending(id=i, amount=round(i * 1.37, 2), notes="weekly shop", item_name=f"item {i}",
+                        date=start + timedelta(minutes=i), user_id=1, category_id=i % 10 or None,
+                        currency=models.Currency.NGN, is_deleted=False, version=i)
+        for i in range(1, count + 1)
+    ]
+
+
+def before(rows):
+    content = schemas.StandardResponse(data=rows, message="Transactions retrieved successfully")
+    encoded = asyncio.run(serialize_response(field=response_field, response_content=content))
+    return JSONResponse(encoded).body
+
+
+def after(rows):
+    return serialization.respond(SpendingList, Response(), data=rows, message="Transactions retrieved successfully").body
+
+
+def timed(fn, rows):
+    samples = []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        body = fn(rows)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), body
+
+
+def main():
+    for count in (int(n) for n in args.rows.split(",")):
+        rows = make_rows(count)
+        after(rows[:1])  # build the cached adapter outside the timings
+        before_ms, before_body = timed(before, rows)
+        after_ms, after_body = timed(after, rows)
+        print(f"{count:,} rows")
+        print(f"  before  p50 {before_ms:8.2f} ms   {len(before_body):>10,} bytes")
+        print(f"  after   p50 {after_ms:8.2f} ms   {len(after_body):>10,} bytes   "
+              f"({before_ms / after_ms:.1f}x, gzip {len(gzip.compress(after_body)):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Latency of the GET /spending/ date-range query on a large spending table.
+
+Compares the old ``func.date(Spending.date)`` filters against the half-open
+timestamp ranges used by ``crud.get_spendings`` on the composite spending
+indexes, plus the original query on a table without them as a baseline.
+
+    python benchmarks/bench_spending_range.py --rows 1000000
+    python benchmarks/bench_spending_range.py --url postgresql://... --rows 2000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--url", default="sqlite:///./bench_spending.db", help="database to benchmark against")
+parser.add_argument("--rows", type=int, default=1_000_000, help="spending rows to generate")
+parser.add_argument("--users", type=int, default=200, help="users the rows are spread across")
+parser.add_argument("--days", type=int, default=3 * 365, help="history length in days")
+parser.add_argument("--runs", type=int, default=200, help="queries per variant")
+parser.add_argument("--keep", action="store_true", help="reuse/keep the generated data")
+args = parser.parse_args()
+
+os.environ["DATABASE_URL"] = args.url
+
+from sqlalchemy import create_engine, func, insert, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import crud, models  # noqa: E402
+from app.database import Base  # noqa: E402
+
+engine = create_engine(args.url)
+Session = sessionmaker(bind=engine)
+
+
+def populate():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    start = datetime.utcnow() - timedelta(days=args.days)
+    with engine.begin() as conn:
+        conn.execute(insert(models.User.__table__), [
+            {"id": uid, "email": f"bench{uid}@example.com", "default_currency": models.Currency.NGN}
+            for uid in range(1, args.users + 1)
+        ])
+        conn.execute(insert(models.Category.__table__), [
+            {"id": cid, "category_name": f"cat{cid}", "user_id": (cid % args.users) + 1, "is_deleted": False}
+            for cid in range(1, 11)
+        ])
+    batch = 50_000
+    t0 = time.perf_counter()
+    for offset in range(0, args.rows, batch):
+        rows = [
+            {
+                "amount": round(rng.uniform(1, 500), 2),
+                "notes": "bench",
+                "item_name": "item",
+                "date": start + timedelta(seconds=rng.randrange(args.days * 86400)),
+                "user_id": rng.randint(1, args.users),
+                "category_id": rng.randint(1, 10),
+                "is_deleted": rng.random() < 0.02,
+                "currency": models.Currency.NGN,
+            }
+            for _ in range(min(batch, args.rows - offset))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(models.Spending.__table__), rows)
+    print(f"inserted {args.rows:,} rows in {time.perf_counter() - t0:.1f}s")
+
+
+def legacy_get_spendings(db, user_id, start_date, end_date, limit=100):
+    return db.query(models.Spending).filter(
+        models.Spending.user_id == user_id,
+        models.Spending.is_deleted == False,
+        func.date(models.Spending.date) >= start_date,
+        func.date(models.Spending.date) <= end_date,
+    ).limit(limit).all()
+
+
+def timed(fn):
+    db = Session()
+    rng = random.Random(7)
+    samples = []
+    try:
+        for _ in range(args.runs):
+            user_id = rng.randint(1, args.users)
+            end = date.today() - timedelta(days=rng.randrange(args.days))
+            start = end - timedelta(days=30)
+            t0 = time.perf_counter()
+            fn(db, user_id, start, end)
+            samples.append((time.perf_counter() - t0) * 1000)
+            db.expunge_all()
+    finally:
+        db.close()
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p95": samples[int(len(samples) * 0.95) - 1],
+        "mean": statistics.fmean(samples),
+    }
+
+
+def explain(query):
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    compiled = query.statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        for row in conn.execute(text(prefix + str(compiled))):
+            print("   ", row[-1])
+
+
+def main():
+    with engine.connect() as conn:
+        exists = engine.dialect.has_table(conn, "spending")
+        existing = conn.execute(text("SELECT COUNT(*) FROM spending")).scalar() if exists else 0
+    if not args.keep or existing < args.rows:
+        populate()
+
+    today = date.today()
+    db = Session()
+    print("legacy plan:")
+    explain(db.query(models.Spending).filter(
+        models.Spending.user_id == 1, models.Spending.is_deleted == False,
+        func.date(models.Spending.date) >= today - timedelta(days=30),
+        func.date(models.Spending.date) <= today,
+    ))
+    print("range plan:")
+    explain(db.query(models.Spending).filter(
+        models.Spending.user_id == 1, models.Spending.is_deleted == False,
+        models.Spending.date >= datetime.combine(today - timedelta(days=30), datetime.min.time()),
+        models.Spending.date < datetime.combine(today + timedelta(days=1), datetime.min.time()),
+    ))
+    db.close()
+
+    results = {
+        "func.date filter": timed(legacy_get_spendings),
+        "crud.get_spendings": timed(lambda db, u, s, e: crud.get_spendings(db, u, start_date=s, end_date=e)),
+    }
+    # Baseline: the original query against a table without the composite indexes.
+    indexes = [ix for ix in models.Spending.__table__.indexes if ix.name.startswith("ix_spending_user_")]
+    for ix in indexes:
+        ix.drop(bind=engine)
+    results["no indexes (before)"] = timed(legacy_get_spendings)
+    for ix in indexes:
+        ix.create(bind=engine)
+    print(f"\n{args.rows:,} rows, {args.users} users, {args.runs} queries of a 30-day window")
+    for name, r in results.items():
+        print(f"  {name:<22} p50 {r['p50']:8.2f} ms   p95 {r['p95']:8.2f} ms   mean {r['mean']:8.2f} ms")
+
+    if not args.keep:
+        Base.metadata.drop_all(bind=engine)
+        if engine.dialect.name == "sqlite" and engine.url.database:
+            os.remove(engine.url.database)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Cold start: import time, startup time and first-request latency.
+
+Each run is a fresh interpreter, as on a new Cloud Run instance. "before"
+reproduces the old behaviour: ``create_all`` at import, no lifespan work, so
+the first requests connect to the database and build the OpenAPI document.
+"after" is ENVIRONMENT=production with the startup lifespan (no DDL, warm
+pool, prebuilt OpenAPI and serializers).
+
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --url postgresql://... --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--url", default=None, help="database to start against (default: a temporary SQLite file)")
+parser.add_argument("--runs", type=int, default=5, help="cold starts per variant")
+args = parser.parse_args()
+
+url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_startup.db')}"
+os.environ["DATABASE_URL"] = url
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+EMAIL = "startup-bench@example.com"
+
+# Runs in the child interpreter; prints one JSON line of timings in ms
+CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import app
+if sys.argv[1] == "before":
+    from app import models
+    from app.database import engine
+    models.Base.metadata.create_all(bind=engine)
+imported = time.perf_counter()
+
+from app.auth import create_access_token
+headers = {"Authorization": "Bearer " + create_access_token({"sub": %r})}
+client = TestClient(app)
+if sys.argv[1] == "after":
+    client.__enter__()  # runs the lifespan
+started = time.perf_counter()
+
+def timed(path):
+    t = time.perf_counter()
+    assert client.get(path, headers=headers).status_code == 200, path
+    return (time.perf_counter() - t) * 1000
+
+result = {
+    "import": (imported - t0) * 1000,
+    "startup": (started - imported) * 1000,
+    "first /spending/": timed("/spending/"),
+    "first /openapi.json": timed("/openapi.json"),
+    "second /spending/": timed("/spending/"),
+}
+print(json.dumps(result))
+""" % EMAIL
+
+
+def prepare():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app import models
+
+    engine = create_engine(url)
+    models.Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        if db.query(models.User).filter(models.User.email == EMAIL).first() is None:
+            db.add(models.User(email=EMAIL, first_name="Bench", last_name="User",
+                               default_currency=models.Currency.NGN))
+            db.commit()
+    engine.dispose()
+
+
+def cold_start(variant):
+    env = dict(os.environ)
+    if variant == "after":
+        env.update(ENVIRONMENT="production", AUTO_CREATE_TABLES="false")
+    else:
+        env.update(AUTO_CREATE_TABLES="false")  # the create_all is done in CHILD instead
+    output = subprocess.run([sys.executable, "-c", CHILD, variant], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    prepare()
+    print(f"{args.runs} cold starts per variant against {url.split('://')[0]} (median ms)")
+    for variant in ("before", "after"):
+        runs = [cold_start(variant) for _ in range(args.runs)]
+        medians = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        print(f"  {variant:<7}" + "".join(f"  {key} {value:7.1f}" for key, value in medians.items()))
+        total = medians["import"] + medians["startup"] + medians["first /spending/"]
+        print(f"  {'':<7}  import + startup + first request {total:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,198 +1,272 @@
+"""Synthetic data generator.
+
+Creates --users accounts with --transactions spendings each, plus monthly
+rent and salary, freelance income, and savings goals with contributions.
+Everything is derived from --seed, --end-date and the user's position, so
+a run is reproducible regardless of --workers.
+
+Data is shaped like real usage: categories have their own frequency and
+amount range (log-normal around a typical price), weekends are busier,
+most rows use the account currency and a few are in USD/GBP/EUR, and about
+2% of spendings are soft-deleted. Rows get increasing sync versions per user
+and the daily rollups are rebuilt, so sync and summaries work on the data.
+
+Users are split into chunks across worker processes. Each chunk goes in one
+transaction, with COPY on Postgres and batched multi-row inserts elsewhere.
+SQLite allows one writer at a time, so it always runs in a single process.
+Accounts whose email already exists are skipped.
+
+    python seed.py                                       # test@example.com, 50 spendings
+    python seed.py --users 10000 --transactions 1000 --workers 8
+"""
+import argparse
+import csv
+import io
+import math
+import multiprocessing
+import os
 import random
-from datetime import datetime, timedelta
-from faker import Faker
+import time
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import insert, select, update
+
+from app import models, rollups
 from app.database import SessionLocal, engine
-from app import models, crud
-from sqlalchemy.orm import Session
+from app.models import Currency
+from app.passwords import get_password_hash
+
+PASSWORD = "password123"
+FIRST_EMAIL = "test@example.com"
+
+# name: (relative frequency, typical amount in NGN, spread, items)
+CATEGORIES = {
+    "Groceries": (22, 9000, 0.6, ["Supermarket", "Market run", "Bread and eggs", "Fruit", "Rice"]),
+    "Food": (18, 3500, 0.5, ["Lunch", "Suya", "Shawarma", "Coffee", "Snacks"]),
+    "Transport": (16, 2500, 0.7, ["Bolt ride", "Uber", "Fuel", "Bus fare", "Keke"]),
+    "Dining Out": (8, 15000, 0.6, ["Dinner", "Brunch", "Drinks", "Takeout"]),
+    "Utilities": (6, 12000, 0.4, ["Electricity", "Water", "Internet", "Airtime", "Data"]),
+    "Shopping": (8, 25000, 0.9, ["Clothes", "Shoes", "Electronics", "Household items"]),
+    "Entertainment": (7, 8000, 0.7, ["Cinema", "Streaming", "Concert", "Games"]),
+    "Health": (5, 10000, 0.8, ["Pharmacy", "Clinic visit", "Gym"]),
+    "Travel": (2, 120000, 0.7, ["Flight", "Hotel", "Car hire"]),
+    "Rent": (0, 350000, 0.3, ["Rent"]),  # monthly, not drawn at random
+}
+DRAWN = [name for name, spec in CATEGORIES.items() if spec[0]]
+DRAWN_WEIGHTS = [CATEGORIES[name][0] for name in DRAWN]
+# Share of rows in each currency, and rough NGN per unit to keep amounts plausible
+CURRENCIES = [(Currency.NGN, 0.90, 1.0), (Currency.USD, 0.05, 1500.0), (Currency.GBP, 0.03, 1900.0),
+              (Currency.EUR, 0.02, 1650.0)]
+GOALS = [("Emergency Fund", 1_000_000.0), ("New Laptop", 900_000.0), ("Vacation", 2_500_000.0),
+         ("Car", 8_000_000.0), ("Wedding", 5_000_000.0)]
+SPENDING_COLUMNS = ["amount", "notes", "item_name", "date", "user_id", "category_id", "is_deleted", "currency", "synced"]
+INCOME_COLUMNS = ["amount", "source", "date", "user_id", "type", "currency", "synced"]
+BATCH_SIZE = 10_000
+
+
+def user_rng(seed: int, index: int) -> random.Random:
+    return random.Random(f"{seed}:{index}")
+
+
+def email_for(index: int) -> str:
+    return FIRST_EMAIL if index == 0 else f"seed{index}@example.com"
+
+
+class UserData:
+    """Every row for one user; foreign keys are filled in once ids exist."""
+
+    def __init__(self, user_id: int, index: int, args):
+        rng = user_rng(args.seed, index)
+        self.user_id = user_id
+        self.version = 0
+        end = args.end
+        start = end - timedelta(days=args.days)
+        self.categories = list(CATEGORIES)
+        days = [start.replace(hour=0, minute=0, second=0) + timedelta(days=d) for d in range(args.days)]
+        # Weekends are about 40% busier
+        cum_weights = list(accumulate(1.4 if day.weekday() >= 5 else 1.0 for day in days))
+
+        self.spendings = []  # (category name, row dict)
+        for day in rng.choices(days, cum_weights=cum_weights, k=args.transactions):
+            name = rng.choices(DRAWN, weights=DRAWN_WEIGHTS)[0]
+            self.spendings.append((name, self._spending(rng, name, day + timedelta(seconds=rng.randrange(7 * 3600, 23 * 3600)))))
+        paydays = []
+        month = start.replace(day=1, hour=0, minute=0, second=0)
+        while month <= end:
+            rent_day = month + timedelta(days=rng.randrange(3), hours=9)
+            if start <= rent_day <= end:
+                self.spendings.append(("Rent", self._spending(rng, "Rent", rent_day)))
+            payday = month.replace(day=28, hour=8)
+            if start <= payday <= end:
+                paydays.append(payday)
+            month = (month + timedelta(days=32)).replace(day=1)
+
+        self.incomes = [self._income(rng, "Salary", round(rng.uniform(300_000, 900_000), -3), payday, Currency.NGN)
+                        for payday in paydays]
+        for _ in range(max(1, args.transactions // 20)):
+            currency, amount = self._currency_amount(rng, 60000, 0.8)
+            self.incomes.append(self._income(rng, rng.choice(["Freelance", "Gift", "Bonus", "Dividend", "Refund"]),
+                                             amount, rng.choice(days) + timedelta(hours=rng.randrange(8, 20)), currency))
+
+        self.goals = []
+        for name, target in rng.sample(GOALS, k=min(args.goals, len(GOALS))):
+            created = start + timedelta(days=rng.randrange(max(args.days // 2, 1)))
+            contributions = sorted(created + timedelta(days=rng.randrange(max((end - created).days, 1)))
+                                   for _ in range(rng.randint(3, 6)))
+            self.goals.append((
+                {"goal_name": name, "target_amount": target, "user_id": user_id, "created_at": created,
+                 "deadline": end + timedelta(days=rng.randrange(30, 540)), "currency": Currency.NGN,
+                 "synced": self.next_version()},
+                [{"amount": round(target * rng.uniform(0.02, 0.1), -2), "date": day, "user_id": user_id,
+                  "currency": Currency.NGN, "synced": self.next_version()} for day in contributions],
+            ))
 
-# Initialize Faker
-fake = Faker()
+    def next_version(self) -> int:
+        self.version += 1
+        return self.version
+
+    def _currency_amount(self, rng, typical, spread):
+        currency = rng.choices([c for c, _, _ in CURRENCIES], weights=[w for _, w, _ in CURRENCIES])[0]
+        rate = next(r for c, _, r in CURRENCIES if c is currency)
+        amount = rng.lognormvariate(math.log(typical), spread) / rate
+        return currency, round(amount, 2 if currency is not Currency.NGN else 0)
+
+    def _spending(self, rng, name, day):
+        _, typical, spread, items = CATEGORIES[name]
+        currency, amount = (Currency.NGN, round(typical * rng.uniform(0.95, 1.05), -2)) if name == "Rent" \
+            else self._currency_amount(rng, typical, spread)
+        return {"amount": amount, "notes": None if rng.random() < 0.7 else f"{name.lower()} note",
+                "item_name": rng.choice(items), "date": day, "user_id": self.user_id, "category_id": None,
+                "is_deleted": rng.random() < 0.02, "currency": currency, "synced": 0}
+
+    def _income(self, rng, source, amount, day, currency):
+        return {"amount": amount, "source": source, "date": day, "user_id": self.user_id,
+                "type": rng.choice(["card", "cash"]), "currency": currency, "synced": 0}
+
+
+def _rows(conn, table, rows, columns):
+    """Bulk insert: COPY on Postgres (psycopg2), multi-row INSERT batches elsewhere."""
+    if not rows:
+        return
+    if conn.dialect.driver == "psycopg2":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(["" if row[c] is None else row[c].name if isinstance(row[c], Currency)
+                             else row[c].isoformat() if isinstance(row[c], datetime) else row[c] for c in columns])
+        buffer.seek(0)
+        with conn.connection.dbapi_connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        return
+    for offset in range(0, len(rows), BATCH_SIZE):
+        conn.execute(insert(table), rows[offset:offset + BATCH_SIZE])
+
+
+def seed_chunk(task) -> tuple:
+    """Insert everything for one chunk of users in one transaction; returns (users, rows)."""
+    users, args = task
+    data = [UserData(user_id, index, args) for index, user_id in users]
+    written = 0
+    with engine.begin() as conn:
+        category_ids = {}
+        for row in conn.execute(insert(models.Category.__table__).returning(
+                models.Category.id, models.Category.user_id, models.Category.category_name), [
+                {"category_name": name, "user_id": d.user_id, "is_deleted": False, "synced": d.next_version()}
+                for d in data for name in d.categories]):
+            category_ids[(row.user_id, row.category_name)] = row.id
+
+        spendings, incomes, contributions = [], [], []
+        for d in data:
+            for name, row in sorted(d.spendings, key=lambda item: item[1]["date"]):
+                row["category_id"] = category_ids[(d.user_id, name)]
+                row["synced"] = d.next_version()
+                spendings.append(row)
+            for row in sorted(d.incomes, key=lambda r: r["date"]):
+                row["synced"] = d.next_version()
+                incomes.append(row)
+            for goal, goal_contributions in d.goals:
+                goal_id = conn.execute(insert(models.SavingsGoal.__table__).returning(models.SavingsGoal.id), goal).scalar_one()
+                contributions += [{**c, "goal_id": goal_id} for c in goal_contributions]
+            written += len(d.categories) + len(d.goals)
+
+        _rows(conn, models.Spending.__table__, spendings, SPENDING_COLUMNS)
+        _rows(conn, models.Income.__table__, incomes, INCOME_COLUMNS)
+        _rows(conn, models.SavingsContribution.__table__, contributions,
+              ["amount", "date", "goal_id", "user_id", "currency", "synced"])
+        for d in data:
+            conn.execute(update(models.User.__table__).where(models.User.id == d.user_id).values(synced=d.version))
+        written += len(spendings) + len(incomes) + len(contributions)
 
-def seed_data():
     db = SessionLocal()
-    
     try:
-        # Create user
-        user_email = "test@example.com"
-        user = crud.get_user_by_email(db, email=user_email)
-        
-        if not user:
-            print(f"Creating user {user_email}...")
-            hashed_password = crud.get_password_hash("password123")
-            user = models.User(
-                email=user_email,
-                password=hashed_password,
-                first_name="Test",
-                last_name="User"
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-        else:
-            print(f"User {user_email} already exists.")
-            
-        user_id = user.id
-        
-        # Create Categories
-        categories = [
-            "Food", "Transport", "Utilities", "Entertainment", 
-            "Shopping", "Health", "Rent", "Groceries", "Dining Out", "Travel"
-        ]
-        
-        db_categories = []
-        existing_categories = db.query(models.Category).filter(models.Category.user_id == user_id).all()
-        existing_names = [c.category_name for c in existing_categories]
-        
-        print("Seeding categories...")
-        for cat_name in categories:
-            if cat_name not in existing_names:
-                cat = models.Category(
-                    category_name=cat_name,
-                    user_id=user_id,
-                    is_deleted=False
-                )
-                db.add(cat)
-                db_categories.append(cat)
-        
-        db.commit()
-        # Refresh to get IDs
-        all_categories = db.query(models.Category).filter(models.Category.user_id == user_id).all()
-        
-        if not all_categories:
-            print("No categories found/created. Aborting spending seed.")
-            return
-
-        # Time range: past 3 months (90 days)
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=90)
-        
-        print("Seeding income...")
-        # 1. Monthly Salary (3 times)
-        current_date_month = start_date
-        while current_date_month < end_date:
-            salary_date = current_date_month.replace(day=28) # Payday 28th
-            if salary_date > end_date:
-                break
-                
-            # Check if salary already exists for this month roughly
-            existing_salary = db.query(models.Income).filter(
-                models.Income.user_id == user_id,
-                models.Income.source == "Salary",
-                models.Income.date >= salary_date - timedelta(days=2),
-                models.Income.date <= salary_date + timedelta(days=2)
-            ).first()
-            
-            if not existing_salary:
-                salary = models.Income(
-                    amount=5000.0,
-                    source="Salary",
-                    date=salary_date,
-                    user_id=user_id,
-                    type="transaction", # Assuming 'transaction' or check schema
-                    currency=models.Currency.NGN
-                )
-                db.add(salary)
-            
-            # Next month 
-            if current_date_month.month == 12:
-                current_date_month = current_date_month.replace(year=current_date_month.year + 1, month=1)
-            else:
-                current_date_month = current_date_month.replace(month=current_date_month.month + 1)
-        
-        # 2. Random Incomes (Freelance, Gift, etc)
-        for _ in range(5):
-            date = fake.date_time_between(start_date=start_date, end_date=end_date)
-            income_amount = round(random.uniform(100.0, 1500.0), 2)
-            income = models.Income(
-                amount=income_amount,
-                source=random.choice(["Freelance", "Gift", "Bonus", "Dividend"]),
-                date=date,
-                user_id=user_id,
-                type="transaction",
-                currency=models.Currency.NGN
-            )
-            db.add(income)
-            
-        db.commit()
-
-        print("Seeding spending...")
-        # Generate random spending
-        for _ in range(50): # 50 transactions over 90 days
-            date = fake.date_time_between(start_date=start_date, end_date=end_date)
-            amount = round(random.uniform(10.0, 300.0), 2)
-            category = random.choice(all_categories)
-            item_name = fake.word().capitalize()
-            
-            spending = models.Spending(
-                amount=amount,
-                notes=fake.sentence(),
-                item_name=item_name,
-                date=date,
-                user_id=user_id,
-                category_id=category.id,
-                is_deleted=False,
-                currency=models.Currency.NGN
-            )
-            db.add(spending)
-            
-        db.commit()
-        
-        print("Seeding savings goals...")
-        goals = [
-            ("New Laptop", 2000.0),
-            ("Vacation", 5000.0),
-            ("Emergency Fund", 10000.0)
-        ]
-        
-        db_goals = []
-        for name, target in goals:
-            existing_goal = db.query(models.SavingsGoal).filter(
-                models.SavingsGoal.user_id == user_id, 
-                models.SavingsGoal.goal_name == name
-            ).first()
-            
-            if not existing_goal:
-                goal = models.SavingsGoal(
-                    goal_name=name,
-                    target_amount=target,
-                    deadline=fake.date_time_between(start_date=end_date, end_date=end_date + timedelta(days=180)),
-                    user_id=user_id,
-                    created_at=start_date,
-                    currency=models.Currency.NGN
-                )
-                db.add(goal)
-                db.flush() # flush to get ID
-                db_goals.append(goal)
-            else:
-                db_goals.append(existing_goal)
-                
-        db.commit()
-        
-        print("Seeding savings contributions...")
-        for goal in db_goals:
-            # Add 3-5 contributions per goal
-            for _ in range(random.randint(3, 5)):
-                amount = round(random.uniform(50.0, 500.0), 2)
-                date = fake.date_time_between(start_date=start_date, end_date=end_date)
-                
-                contribution = models.SavingsContribution(
-                    amount=amount,
-                    date=date,
-                    goal_id=goal.id,
-                    user_id=user_id,
-                    currency=models.Currency.NGN
-                )
-                db.add(contribution)
-                
-        db.commit()
-        
-        print("Database seeded successfully!")
-
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        db.rollback()
+        for d in data:
+            rollups.rebuild(db, d.user_id)
     finally:
         db.close()
+    return len(data), written
+
+
+def create_users(args) -> list:
+    """(index, user id) of the accounts to seed; existing emails are left alone."""
+    emails = [email_for(i) for i in range(args.users)]
+    with engine.begin() as conn:
+        existing = set(conn.scalars(select(models.User.email).where(models.User.email.in_(emails))))
+        new = [(i, email) for i, email in enumerate(emails) if email not in existing]
+        if existing:
+            print(f"Skipping {len(existing)} existing accounts")
+        if new:
+            password = get_password_hash(PASSWORD)  # one hash for everyone; bcrypt per user would dominate
+            for offset in range(0, len(new), BATCH_SIZE):
+                conn.execute(insert(models.User.__table__), [
+                    {"email": email, "password": password, "first_name": "Test" if i == 0 else "Seed",
+                     "last_name": "User" if i == 0 else str(i), "default_currency": Currency.NGN, "synced": 0}
+                    for i, email in new[offset:offset + BATCH_SIZE]
+                ])
+        ids = dict(conn.execute(select(models.User.email, models.User.id).where(
+            models.User.email.in_([email for _, email in new]))).all()) if new else {}
+    return [(i, ids[email]) for i, email in new]
+
+
+def _init_worker():
+    # Connections inherited from the parent must not be shared with it
+    engine.dispose(close=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1, help="accounts to create (the first is test@example.com)")
+    parser.add_argument("--transactions", type=int, default=50, help="random spendings per user, on top of rent")
+    parser.add_argument("--days", type=int, default=90, help="history length")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today(), help="last day of the history")
+    parser.add_argument("--goals", type=int, default=3, help="savings goals per user")
+    parser.add_argument("--seed", type=int, default=42, help="random seed; the same seed gives the same data")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="insert processes")
+    parser.add_argument("--chunk-users", type=int, default=0,
+                        help="users per transaction (default: about 50k spendings per chunk)")
+    args = parser.parse_args(argv)
+    args.end = datetime.combine(args.end_date, datetime.max.time()).replace(microsecond=0)
+    if engine.dialect.name == "sqlite":
+        args.workers = 1
+    chunk = args.chunk_users or max(1, 50_000 // max(args.transactions, 1))
+
+    started = time.perf_counter()
+    users = create_users(args)
+    chunks = [(users[i:i + chunk], args) for i in range(0, len(users), chunk)]
+    total_users = total_rows = 0
+    if args.workers > 1 and len(chunks) > 1:
+        with multiprocessing.Pool(args.workers, initializer=_init_worker) as pool:
+            results = pool.imap_unordered(seed_chunk, chunks)
+            for done_users, rows in results:
+                total_users, total_rows = total_users + done_users, total_rows + rows
+                print(f"  {total_users:,}/{len(users):,} users, {total_rows:,} rows, "
+                      f"{total_rows / (time.perf_counter() - started):,.0f} rows/s")
+    else:
+        for task in chunks:
+            done_users, rows = seed_chunk(task)
+            total_users, total_rows = total_users + done_users, total_rows + rows
+    print(f"Seeded {total_users:,} users and {total_rows:,} rows in {time.perf_counter() - started:.1f}s")
+
 
 if __name__ == "__main__":
-    seed_data()
+    main()
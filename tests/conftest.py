@@ -8,6 +8,12 @@ import os
 from app.database import Base, get_db
 from app.main import app
 from app.models import User
+from app.cache import principal_cache
+from app.exchange_rates import rate_cache
+from app.rate_limit import auth_limiter
+from app.token_revocation import revoked_tokens
+from app.metrics import instrument_engine
+from app.query_recorder import QueryRecorder
 
 # Use a separate SQLite database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -15,8 +21,23 @@ SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
+instrument_engine(engine)  # as the app's engine is, so /metrics sees test queries
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def pytest_addoption(parser):
+    parser.addoption("--run-slow", action="store_true", help="also run tests marked slow")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: multi-million row runs, skipped unless --run-slow is given")
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow; run with --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_database():
     # Create the tables
@@ -28,6 +49,15 @@ def setup_database():
     if os.path.exists("test.db"):
         os.remove("test.db")
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    # Each test rolls its data back, so cached principals must not leak across tests
+    principal_cache.clear()
+    rate_cache.invalidate()
+    auth_limiter.reset()
+    revoked_tokens.clear()
+    yield
+
 @pytest.fixture
 def db():
     connection = engine.connect()
@@ -56,7 +86,7 @@ def client(db):
 @pytest.fixture
 def test_user(db):
     # Helper to create a user for tests
-    from app.crud import get_password_hash
+    from app.passwords import get_password_hash
     user = User(
         email="testuser@example.com",
         password=get_password_hash("password123"),
@@ -77,3 +107,8 @@ def auth_headers(client, test_user):
     )
     token = response.json()["data"]["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+def queries(db):
+    # Factory: `with queries() as q: client.get(...)` records what the request ran
+    return lambda: QueryRecorder(db.get_bind())
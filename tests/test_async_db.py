@@ -0,0 +1,73 @@
+import asyncio
+from datetime import date, datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app import schemas
+from app.auth import get_current_user_async
+from app.database import Base, get_async_db, to_async_url
+from app.models import User
+from app.routers.aio import categories, income, savings, spending
+
+
+def test_to_async_url():
+    assert to_async_url("postgresql://u:p@db/fintrack") == "postgresql+asyncpg://u:p@db/fintrack"
+    assert to_async_url("postgresql+psycopg2://u:p@db/fintrack") == "postgresql+asyncpg://u:p@db/fintrack"
+    assert to_async_url("sqlite:///./sql_app.db") == "sqlite+aiosqlite:///./sql_app.db"
+
+@pytest.fixture
+def async_client():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            # Writes take their change version from the owner's users row
+            await conn.execute(insert(User).values(id=1, email="async@example.com", version=0))
+    asyncio.run(create_tables())
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    for module in (categories, income, spending, savings):
+        app.include_router(module.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_user_async] = lambda: schemas.UserData(
+        id=1, email="async@example.com", first_name="A", last_name="User",
+        default_currency="NGN", created_at=datetime.utcnow()
+    )
+    with TestClient(app) as c:
+        yield c
+    asyncio.run(engine.dispose())
+
+def test_async_spending_roundtrip(async_client):
+    category_id = async_client.post("/categories/", json={"category_name": "Food"}).json()["data"]["id"]
+    for i in range(3):
+        async_client.post(
+            "/spending/",
+            json={"amount": 10.0 + i, "item_name": f"Item {i}", "category_id": category_id, "date": f"{date.today()}T0{i}:00:00"}
+        )
+
+    first = async_client.get("/spending/?limit=2").json()
+    assert [s["item_name"] for s in first["data"]] == ["Item 2", "Item 1"]
+    rest = async_client.get(f"/spending/?limit=2&cursor={first['next_cursor']}").json()
+    assert [s["item_name"] for s in rest["data"]] == ["Item 0"]
+
+    spending_id = rest["data"][0]["id"]
+    assert async_client.delete(f"/spending/{spending_id}").status_code == 200
+    assert len(async_client.get("/spending/").json()["data"]) == 2
+
+def test_async_savings_goals_include_contributions(async_client):
+    goal_id = async_client.post("/savings/", json={"goal_name": "Trip", "target_amount": 500.0}).json()["data"]["id"]
+    async_client.post(f"/savings/{goal_id}/contributions/", json={"amount": 50.0})
+
+    goals = async_client.get("/savings/").json()["data"]
+    assert goals[0]["savings_contributions"][0]["amount"] == 50.0
@@ -28,3 +28,126 @@ def test_login_failure(client, test_user):
         json={"email": test_user.email, "password": "wrongpassword"}
     )
     assert response.status_code == 401
+
+def test_principal_cache_hits(client, auth_headers):
+    client.get("/users/me/", headers=auth_headers)
+    client.get("/users/me/", headers=auth_headers)
+
+    stats = client.get("/health/stats").json()["auth_cache"]
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+def test_profile_update_invalidates_principal_cache(client, auth_headers):
+    assert client.get("/users/me/", headers=auth_headers).json()["data"]["first_name"] == "Test"
+
+    response = client.put("/users/me/", json={"first_name": "Renamed"}, headers=auth_headers)
+    assert response.status_code == 200
+
+    me = client.get("/users/me/", headers=auth_headers).json()["data"]
+    assert me["first_name"] == "Renamed"
+
+def test_login_rejected_when_password_pool_saturated(client, test_user, monkeypatch):
+    from app import passwords
+    monkeypatch.setattr(passwords.password_pool, "max_pending", 0)
+
+    response = client.post(
+        "/login",
+        json={"email": test_user.email, "password": "password123"}
+    )
+    assert response.status_code == 503
+
+def test_password_pool_limit_stays_below_threadpool():
+    from app.passwords import PasswordPool
+    pool = PasswordPool(workers=0, max_pending=64)
+    assert pool.fit_to_threadpool(40) == 20
+    assert PasswordPool(workers=0, max_pending=8).fit_to_threadpool(40) == 8
+
+def test_token_bucket_refills():
+    from app.rate_limit import MemoryBackend
+    backend = MemoryBackend()
+    assert [backend.take("k", 2, 60.0) for _ in range(2)] == [0.0, 0.0]
+    wait = backend.take("k", 2, 60.0)
+    assert 29 < wait <= 30  # one token every 30 seconds
+    assert backend.take("other", 2, 60.0) == 0.0
+
+def test_login_rate_limited_before_hashing(client, test_user, queries, monkeypatch):
+    from app import rate_limit
+    from app.routers import auth as auth_router
+    monkeypatch.setattr(rate_limit, "AUTH_LIMIT_PER_EMAIL", rate_limit.Limit("auth-email", 2))
+    for _ in range(2):
+        assert client.post("/login", json={"email": test_user.email, "password": "wrong"}).status_code == 401
+
+    def fail(*args):
+        raise AssertionError("password hashed for a rejected request")
+    monkeypatch.setattr(auth_router, "verify_in_pool", fail)
+    with queries() as recorded:
+        response = client.post("/login", json={"email": test_user.email.upper(), "password": "password123"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert recorded.count == 0
+    assert client.get("/health/stats").json()["auth_rate_limit"]["rejected"] == 1
+
+def test_register_rate_limited_per_ip(client, monkeypatch):
+    from app import rate_limit
+    monkeypatch.setattr(rate_limit, "AUTH_LIMIT_PER_IP", rate_limit.Limit("auth-ip", 1))
+    body = {"email": "a@example.com", "password": "password123", "first_name": "A", "last_name": "B",
+            "default_currency": "USD"}
+    assert client.post("/register", json=body).status_code == 201
+    response = client.post("/register", json={**body, "email": "b@example.com"})
+    assert response.status_code == 429
+
+def test_refresh_rotates_tokens(client, test_user, monkeypatch):
+    from app.routers import auth as auth_router
+    tokens = client.post("/login", json={"email": test_user.email, "password": "password123"}).json()["data"]
+
+    def fail(*args):
+        raise AssertionError("refresh verified a password")
+    monkeypatch.setattr(auth_router, "verify_in_pool", fail)
+    response = client.post("/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    refreshed = response.json()["data"]
+    assert refreshed["refresh_token"] != tokens["refresh_token"]
+    me = client.get("/users/me/", headers={"Authorization": f"Bearer {refreshed['access_token']}"})
+    assert me.json()["data"]["email"] == test_user.email
+
+    # The old refresh token was consumed by the rotation
+    assert client.post("/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    assert client.post("/refresh", json={"refresh_token": refreshed["refresh_token"]}).status_code == 200
+
+def test_refresh_reuse_detected_across_processes(client, test_user, db):
+    from app.models import RevokedToken
+    from app.token_revocation import revoked_tokens
+    token = client.post("/login", json={"email": test_user.email, "password": "password123"}).json()["data"]["refresh_token"]
+    assert client.post("/refresh", json={"refresh_token": token}).status_code == 200
+    assert db.query(RevokedToken).count() == 1
+    revoked_tokens.clear()  # another worker: only the table knows
+    assert client.post("/refresh", json={"refresh_token": token}).status_code == 401
+
+def test_logout_revokes_refresh_token(client, test_user):
+    token = client.post("/login", json={"email": test_user.email, "password": "password123"}).json()["data"]["refresh_token"]
+    assert client.post("/logout", json={"refresh_token": token}).status_code == 200
+    assert client.post("/refresh", json={"refresh_token": token}).status_code == 401
+
+def test_refresh_rejected_for_deleted_user(client, test_user, db):
+    token = client.post("/login", json={"email": test_user.email, "password": "password123"}).json()["data"]["refresh_token"]
+    db.delete(test_user)
+    db.commit()
+    assert client.post("/refresh", json={"refresh_token": token}).status_code == 401
+
+def test_revocation_list_evicts_oldest_past_max_size():
+    import time
+    from app.token_revocation import RevocationList
+    revoked = RevocationList(max_size=3)
+    exp = time.time() + 3600
+    revoked.remember("expired", time.time() - 1)
+    for jti in ("a", "b", "c", "d"):
+        revoked.remember(jti, exp)
+    assert len(revoked) == 3
+    assert "expired" not in revoked and "a" not in revoked
+    assert "d" in revoked
+
+def test_token_types_not_interchangeable(client, test_user):
+    tokens = client.post("/login", json={"email": test_user.email, "password": "password123"}).json()["data"]
+    assert client.post("/refresh", json={"refresh_token": tokens["access_token"]}).status_code == 401
+    me = client.get("/users/me/", headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+    assert me.status_code == 401
@@ -0,0 +1,37 @@
+from sqlalchemy import create_engine, text
+
+from app.db_pool import InstrumentedQueuePool, pool_options, pool_status
+
+
+def test_pool_options_from_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+    options = pool_options("postgresql://u:p@db/fintrack")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 0
+    assert options["pool_pre_ping"] is False
+    assert pool_options("sqlite://") == {}
+
+def test_pool_status_tracks_checkouts(tmp_path):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **pool_options(url))
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        status = pool_status(engine)
+        assert status["checked_out"] == 1
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    status = pool_status(engine)
+    assert status["checked_out"] == 0
+    assert status["checkout_latency_seconds"]["count"] == 2
+    assert status["checkout_latency_seconds"]["buckets"]["+Inf"] == 2
+    engine.dispose()
+
+def test_stats_endpoint_reports_pool(client):
+    stats = client.get("/health/stats").json()
+    assert "checked_out" in stats["db_pool"]
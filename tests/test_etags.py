@@ -0,0 +1,30 @@
+def test_list_revalidates_with_etag(client, auth_headers):
+    client.post("/spending/", json={"amount": 5.0}, headers=auth_headers)
+    first = client.get("/spending/", headers=auth_headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    cached = client.get("/spending/", headers={**auth_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    # Other query parameters are a different representation
+    assert client.get("/spending/?limit=5", headers={**auth_headers, "If-None-Match": etag}).status_code == 200
+
+    # Any write moves the version, so the stale copy is sent again
+    client.post("/spending/", json={"amount": 6.0}, headers=auth_headers)
+    fresh = client.get("/spending/", headers={**auth_headers, "If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+    assert len(fresh.json()["data"]) == 2
+
+def test_savings_etag_follows_contributions(client, auth_headers):
+    goal_id = client.post("/savings/", json={"goal_name": "Bike", "target_amount": 300.0}, headers=auth_headers).json()["data"]["id"]
+    etag = client.get("/savings/", headers=auth_headers).headers["etag"]
+    # Other resources do not touch the savings tag
+    client.post("/income/", json={"amount": 50.0, "source": "Gift"}, headers=auth_headers)
+    assert client.get("/savings/", headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+
+    client.post(f"/savings/{goal_id}/contributions/", json={"amount": 30.0}, headers=auth_headers)
+    assert client.get("/savings/", headers={**auth_headers, "If-None-Match": etag}).status_code == 200
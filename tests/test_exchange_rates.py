@@ -0,0 +1,70 @@
+from datetime import date
+
+import pytest
+
+from app import exchange_rates, models
+from app.models import Currency
+
+
+def test_rate_table_as_of_lookups():
+    table = exchange_rates.RateTable([
+        ("USD", "NGN", date(2024, 3, 1), 1500.0),
+        ("USD", "NGN", date(2024, 1, 1), 1000.0),
+    ])
+    assert table.rate("USD", "NGN", date(2023, 12, 31)) is None
+    assert table.rate("USD", "NGN", date(2024, 1, 1)) == 1000.0
+    assert table.rate("USD", "NGN", date(2024, 2, 29)) == 1000.0
+    assert table.rate("USD", "NGN", date(2024, 6, 1)) == 1500.0
+    assert table.rate(Currency.NGN, Currency.NGN, date(2000, 1, 1)) == 1.0
+    assert table.rate("EUR", "NGN", date(2024, 6, 1)) is None
+
+def test_rates_file_adds_inverse_pairs(tmp_path):
+    path = tmp_path / "rates.csv"
+    path.write_text("from_currency,to_currency,as_of,rate\nusd,NGN,2024-01-01,1000\nNGN,USD,2024-01-01,0.0011\n"
+                    "GBP,NGN,2024-01-01,1250\n")
+    rates = {(r["from_currency"].value, r["to_currency"].value): r["rate"] for r in exchange_rates.read_rates_file(str(path))}
+    # An explicit inverse wins over the derived one
+    assert rates == {("USD", "NGN"): 1000.0, ("NGN", "USD"): 0.0011, ("GBP", "NGN"): 1250.0, ("NGN", "GBP"): 1 / 1250}
+
+    path.write_text("from_currency,to_currency,as_of,rate\nUSD,NGN,2024-01-01,-1\n")
+    with pytest.raises(ValueError, match="entry 1"):
+        exchange_rates.read_rates_file(str(path))
+
+def test_summary_converts_into_default_currency(client, auth_headers, db):
+    for amount, currency, day in [
+        (1000.0, "NGN", "2024-01-10T12:00:00"),
+        (2.0, "USD", "2024-01-10T12:00:00"),  # 2 x 1000
+        (2.0, "USD", "2024-01-20T12:00:00"),  # 2 x 1500, the rate changed on the 15th
+    ]:
+        client.post("/spending/", json={"amount": amount, "currency": currency, "date": day}, headers=auth_headers)
+    client.post("/income/", json={"amount": 10.0, "source": "Client", "currency": "USD", "date": "2024-01-16T09:00:00"},
+                headers=auth_headers)
+
+    response = client.get("/summary/?convert=true&start_date=2024-01-01&end_date=2024-01-31", headers=auth_headers)
+    assert response.status_code == 400
+    assert "USD->NGN" in response.json()["error"]["message"]
+
+    exchange_rates.load_rates(db, [
+        {"from_currency": Currency.USD, "to_currency": Currency.NGN, "as_of": date(2024, 1, 1), "rate": 1000.0},
+        {"from_currency": Currency.USD, "to_currency": Currency.NGN, "as_of": date(2024, 1, 15), "rate": 1500.0},
+    ])
+    data = client.get("/summary/?convert=true&start_date=2024-01-01&end_date=2024-01-31", headers=auth_headers).json()["data"]
+    assert data["currency"] == "NGN"
+    assert [(r["currency"], r["total"], r["count"]) for r in data["spending"]] == [("NGN", 6000.0, 3)]
+    assert [(r["currency"], r["total"]) for r in data["income"]] == [("NGN", 15000.0)]
+
+    # Unconverted, each currency keeps its own row
+    data = client.get("/summary/?kind=spending&start_date=2024-01-01&end_date=2024-01-31", headers=auth_headers).json()["data"]
+    assert sorted((r["currency"], r["total"]) for r in data["spending"]) == [("NGN", 1000.0), ("USD", 4.0)]
+
+def test_rates_loaded_elsewhere_are_used_at_once(client, auth_headers, db):
+    client.post("/spending/", json={"amount": 2.0, "currency": "USD", "date": "2024-01-10T12:00:00"}, headers=auth_headers)
+    exchange_rates.rate_cache.table(db)  # warm, and about to go stale
+
+    # Another process (the CLI) loads rates; this process's cache is not invalidated
+    db.add(models.ExchangeRate(from_currency=Currency.USD, to_currency=Currency.NGN, as_of=date(2024, 1, 1), rate=1000.0))
+    db.commit()
+
+    response = client.get("/summary/?convert=true&start_date=2024-01-01&end_date=2024-01-31", headers=auth_headers)
+    assert response.status_code == 200
+    assert [r["total"] for r in response.json()["data"]["spending"]] == [2000.0]
@@ -0,0 +1,100 @@
+import csv
+import gc
+import io
+import json
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app import exporter, models
+
+
+def test_export_csv_and_ndjson(client, auth_headers):
+    category_id = client.post(
+        "/categories/", json={"category_name": "Food"}, headers=auth_headers
+    ).json()["data"]["id"]
+    client.post(
+        "/spending/",
+        json={"amount": 12.5, "item_name": "Lunch", "category_id": category_id, "date": "2024-05-01T12:00:00"},
+        headers=auth_headers
+    )
+    client.post(
+        "/income/",
+        json={"amount": 100.0, "source": "Refund", "type": "card", "date": "2024-05-02T09:00:00"},
+        headers=auth_headers
+    )
+
+    response = client.get("/export/transactions?format=csv", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(r["kind"], r["description"], r["category"]) for r in rows] == [
+        ("spending", "Lunch", "Food"), ("income", "Refund", "")
+    ]
+
+    response = client.get("/export/transactions?format=ndjson&kind=income", headers=auth_headers)
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [{
+        "kind": "income", "id": lines[0]["id"], "date": "2024-05-02T09:00:00", "amount": 100.0,
+        "currency": "NGN", "description": "Refund", "category": None, "notes": "card",
+    }]
+
+def test_export_buffers_at_most_one_chunk():
+    total_rows = 20 * exporter.EXPORT_CHUNK_ROWS
+    consumed = 0
+    start = datetime(2020, 1, 1)
+
+    def rows():
+        nonlocal consumed
+        for i in range(total_rows):
+            consumed += 1
+            yield ("spending", i, start + timedelta(seconds=i), 9.99, models.Currency.NGN, "Coffee", "Food", None)
+
+    emitted = -1  # header line
+    largest_chunk = 0
+    for chunk in exporter.encode_csv(rows()):
+        emitted += chunk.count("\n")
+        largest_chunk = max(largest_chunk, len(chunk))
+        # Never more than one chunk of rows buffered between the cursor and the socket
+        assert consumed - emitted <= exporter.EXPORT_CHUNK_ROWS
+
+    assert emitted == total_rows
+    assert largest_chunk < 100 * exporter.EXPORT_CHUNK_ROWS
+
+# The same for every row count: holding the whole result would take far more at either size
+EXPORT_PEAK_MEMORY_LIMIT = 10 * 1024 * 1024
+
+@pytest.mark.parametrize("total_rows, format", [
+    (50_000, "csv"),
+    (50_000, "ndjson"),
+    pytest.param(2_000_000, "csv", marks=pytest.mark.slow),
+])
+def test_export_memory_is_bounded(db, test_user, total_rows, format):
+    category = models.Category(category_name="Food", user_id=test_user.id)
+    db.add(category)
+    db.flush()
+    start = datetime(2015, 1, 1)
+    for offset in range(0, total_rows, 50_000):
+        db.execute(insert(models.Spending), [
+            {"amount": 9.99, "item_name": "Coffee", "notes": "oat milk", "date": start + timedelta(minutes=i),
+             "category_id": category.id, "user_id": test_user.id, "is_deleted": False}
+            for i in range(offset, min(offset + 50_000, total_rows))
+        ])
+    db.commit()
+    encode, _ = exporter.ENCODERS[format]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        lines = 0
+        # The pipeline GET /export/transactions streams: server-side cursor -> encoder
+        for chunk in encode(exporter.spending_rows(db, test_user.id)):
+            lines += chunk.count("\n")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert lines == total_rows + (format == "csv")  # CSV has a header line
+    assert peak < EXPORT_PEAK_MEMORY_LIMIT
@@ -0,0 +1,79 @@
+import json
+
+STATEMENT = (
+    "Date,Amount,Description,Category\n"
+    "2024-03-01,-12.50,Uber,Transport\n"
+    "2024-03-02,\"-1,200.00\",Rent,Housing\n"
+    "2024-03-03,3000,Salary,\n"
+    "not a date,-5,Broken,\n"
+    "2024-03-04,-4.20,Coffee,transport\n"
+)
+
+def upload(client, auth_headers, content):
+    response = client.post(
+        "/import/statement",
+        files={"file": ("statement.csv", content.encode(), "text/csv")},
+        data={
+            "date_column": "Date",
+            "amount_column": "Amount",
+            "description_column": "Description",
+            "category_column": "Category",
+        },
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def test_import_statement(client, auth_headers):
+    events = upload(client, auth_headers, STATEMENT)
+
+    assert events[0] == {"type": "error", "line": 5, "error": events[0]["error"]}
+    summary = events[-1]
+    assert summary["type"] == "summary"
+    assert summary["rows_read"] == 5
+    assert summary["inserted"] == 4
+    assert summary["errors"] == 1
+
+    spendings = client.get(
+        "/spending/?start_date=2024-03-01&end_date=2024-03-31", headers=auth_headers
+    ).json()["data"]
+    assert sorted((s["item_name"], s["amount"]) for s in spendings) == [("Coffee", 4.2), ("Rent", 1200.0), ("Uber", 12.5)]
+    categories = client.get("/categories/", headers=auth_headers).json()["data"]
+    assert sorted(c["category_name"] for c in categories) == ["Housing", "Transport"]
+    incomes = client.get("/income/", headers=auth_headers).json()["data"]
+    assert [(i["source"], i["amount"]) for i in incomes] == [("Salary", 3000.0)]
+
+def test_reimport_skips_duplicates(client, auth_headers):
+    upload(client, auth_headers, STATEMENT)
+    summary = upload(client, auth_headers, STATEMENT)[-1]
+
+    assert summary["inserted"] == 0
+    assert summary["duplicates"] == 4
+
+def test_identical_rows_within_a_statement_are_not_duplicates(client, auth_headers):
+    statement = (
+        "Date,Amount,Description,Category\n"
+        "2024-03-05,-2.50,Coffee,Food\n"
+        "2024-03-05,-2.50,Coffee,Food\n"
+    )
+    assert upload(client, auth_headers, statement)[-1]["inserted"] == 2
+
+    summary = upload(client, auth_headers, statement + "2024-03-05,-2.50,Coffee,Food\n")[-1]
+    assert summary["duplicates"] == 2
+    assert summary["inserted"] == 1
+
+def test_non_finite_amounts_are_row_errors(client, auth_headers):
+    statement = (
+        "Date,Amount,Description,Category\n"
+        "2024-03-01,nan,Broken,\n"
+        "2024-03-02,-inf,Broken,\n"
+        "2024-03-03,1e309,Broken,\n"
+    )
+    summary = upload(client, auth_headers, statement)[-1]
+    assert summary["errors"] == 3
+    assert summary["inserted"] == 0
+
+def test_unreadable_statement_ends_with_failed_event(client, auth_headers):
+    # Over the csv module's field size limit, so the reader raises csv.Error mid-file
+    events = upload(client, auth_headers, "Date,Amount,Description\n2024-03-01,-1," + "x" * 200_000 + "\n")
+    assert events[-1]["type"] == "failed"
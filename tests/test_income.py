@@ -34,3 +34,30 @@ def test_get_incomes(client, auth_headers):
     sources = [item["source"] for item in data]
     assert "Freelance" in sources
     assert "Gift" in sources
+
+def test_get_incomes_cursor_matches_offset(client, auth_headers):
+    for i in range(3):
+        client.post(
+            "/income/",
+            json={"amount": 100.0 + i, "source": f"Job {i}", "date": f"2024-03-0{i + 1}T09:00:00"},
+            headers=auth_headers
+        )
+
+    first = client.get("/income/?limit=2", headers=auth_headers).json()
+    by_offset = client.get("/income/?limit=2&skip=2", headers=auth_headers).json()
+    by_cursor = client.get(f"/income/?limit=2&cursor={first['next_cursor']}", headers=auth_headers).json()
+
+    assert [i["source"] for i in first["data"]] == ["Job 2", "Job 1"]
+    assert by_cursor["data"] == by_offset["data"]
+    assert by_cursor["next_cursor"] is None
+
+def test_bulk_create_incomes(client, auth_headers):
+    response = client.post(
+        "/income/bulk",
+        json=[{"amount": 10.0, "source": "Tips"}, {"amount": "lots", "source": "Bad"}, {"amount": 20.0, "source": "Refund"}],
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    results = response.json()["data"]
+    assert [r["success"] for r in results] == [True, False, True]
+    assert response.json()["message"] == "2 of 3 incomes added"
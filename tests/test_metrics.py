@@ -0,0 +1,30 @@
+from app.metrics import request_metrics
+
+
+def _samples(text):
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+def test_metrics_per_route_template(client, auth_headers):
+    request_metrics.clear()
+    spending_id = client.post("/spending/", json={"amount": 5.0}, headers=auth_headers).json()["data"]["id"]
+    client.put(f"/spending/{spending_id + 1000}", json={"id": spending_id + 1000, "amount": 1.0}, headers=auth_headers)
+    client.get("/no-such-page")
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    samples = _samples(response.text)
+    assert samples['http_requests_total{method="POST",route="/spending/",status="200"}'] == 1
+    assert samples['http_requests_total{method="PUT",route="/spending/{spending_id}",status="404"}'] == 1
+    assert samples['http_requests_total{method="GET",route="unmatched",status="404"}'] == 1
+    assert samples['http_request_duration_seconds_count{method="POST",route="/spending/"}'] == 1
+    # The create runs its queries inside the request, and they are counted against it
+    assert samples['http_request_db_queries_sum{method="POST",route="/spending/"}'] >= 2
+    assert samples['http_request_db_seconds_sum{method="POST",route="/spending/"}'] > 0
+    assert samples['http_request_db_queries_bucket{method="POST",route="/spending/",le="+Inf"}'] == 1
+    # /metrics itself is still in flight while it renders
+    assert samples["http_requests_in_flight"] == 1
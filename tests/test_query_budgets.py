@@ -0,0 +1,130 @@
+"""Query budgets for every API route.
+
+Each request runs against a user with several rows of every kind, so a lazy
+load per row shows up as both a blown budget and a repeated statement. The
+budgets are the counts today; raise one only together with the change that
+needs the extra query.
+"""
+from datetime import datetime
+
+import pytest
+from fastapi.routing import APIRoute
+
+from app.auth import create_refresh_token
+from app.main import app
+from app.models import SavingsGoal
+
+STATEMENT = "Date,Amount,Description,Category\n2024-03-01,-12.50,Uber,Transport\n2024-03-03,3000,Salary,\n"
+
+
+@pytest.fixture
+def seeded(client, auth_headers):
+    """Three categories, six spendings, three incomes and two goals with two contributions each."""
+    post = lambda path, body: client.post(path, json=body, headers=auth_headers).json()["data"]  # noqa: E731
+    now = datetime.now().replace(microsecond=0).isoformat()
+    categories = [post("/categories/", {"category_name": name})["id"] for name in ("Food", "Transport", "Housing")]
+    spendings = [post("/spending/", {"amount": 5.0 + i, "item_name": f"Item {i}",
+                                         "category_id": categories[i % 3], "date": now}) for i in range(6)]
+    for i in range(3):
+        post("/income/", {"amount": 100.0 + i, "source": f"Source {i}", "date": now})
+    goals = [post("/savings/", {"goal_name": f"Goal {i}", "target_amount": 500.0})["id"] for i in range(2)]
+    for goal_id in goals:
+        for amount in (10.0, 20.0):
+            post(f"/savings/{goal_id}/contributions/", {"amount": amount})
+    client.get("/users/me/", headers=auth_headers)  # cache the principal, as in steady state
+    refresh_token = create_refresh_token({"sub": "testuser@example.com"})
+    return {"categories": categories, "spendings": spendings, "goals": goals, "refresh_token": refresh_token}
+
+
+def _push(seeded):
+    spending = seeded["spendings"][0]
+    return {"mutations": [
+        {"op": "upsert", "client_id": "c-1", "data": {"amount": 1.0}},
+        {"op": "upsert", "id": spending["id"], "base_version": spending["version"], "data": {**spending, "amount": 2.0}},
+    ]}
+
+
+# (method, route): (budget, request)
+BUDGETS = {
+    ("POST", "/register"): (3, lambda c, h, s: c.post("/register", json={
+        "email": "new@example.com", "password": "password123", "first_name": "New", "last_name": "User",
+        "default_currency": "NGN"})),
+    ("POST", "/login"): (1, lambda c, h, s: c.post("/login", json={"email": "testuser@example.com", "password": "password123"})),
+    ("POST", "/refresh"): (2, lambda c, h, s: c.post("/refresh", json={"refresh_token": s["refresh_token"]})),
+    ("POST", "/logout"): (1, lambda c, h, s: c.post("/logout", json={"refresh_token": s["refresh_token"]})),
+    ("GET", "/users/me/"): (0, lambda c, h, s: c.get("/users/me/", headers=h)),
+    ("PUT", "/users/me/"): (3, lambda c, h, s: c.put("/users/me/", json={"first_name": "Renamed"}, headers=h)),
+    ("POST", "/users/"): (3, lambda c, h, s: c.post("/users/", json={
+        "email": "other@example.com", "password": "password123", "first_name": "Other", "last_name": "User",
+        "default_currency": "NGN"})),
+    ("GET", "/categories/"): (2, lambda c, h, s: c.get("/categories/", headers=h)),
+    ("POST", "/categories/"): (3, lambda c, h, s: c.post("/categories/", json={"category_name": "Fun"}, headers=h)),
+    ("GET", "/income/"): (2, lambda c, h, s: c.get("/income/", headers=h)),
+    ("POST", "/income/"): (3, lambda c, h, s: c.post("/income/", json={"amount": 1.0, "source": "Gift"}, headers=h)),
+    ("POST", "/income/bulk"): (2, lambda c, h, s: c.post("/income/bulk", json=[
+        {"amount": 1.0, "source": "A"}, {"amount": 2.0, "source": "B"}, {"amount": -1}], headers=h)),
+    ("GET", "/spending/"): (2, lambda c, h, s: c.get("/spending/", headers=h)),
+    ("GET", "/spending/search"): (2, lambda c, h, s: c.get("/spending/search?q=item", headers=h)),
+    ("POST", "/spending/"): (4, lambda c, h, s: c.post("/spending/", json={
+        "amount": 1.0, "category_id": s["categories"][0]}, headers=h)),
+    ("POST", "/spending/bulk"): (4, lambda c, h, s: c.post("/spending/bulk", json=[
+        {"amount": 1.0, "category_id": cid} for cid in s["categories"]], headers=h)),
+    ("POST", "/spending/bulk/delete"): (4, lambda c, h, s: c.post("/spending/bulk/delete", json={
+        "ids": [sp["id"] for sp in s["spendings"]]}, headers=h)),
+    ("PUT", "/spending/{spending_id}"): (5, lambda c, h, s: c.put(f"/spending/{s['spendings'][0]['id']}", json={
+        **s["spendings"][0], "amount": 9.0, "category_id": s["categories"][1]}, headers=h)),
+    ("DELETE", "/spending/{spending_id}"): (5, lambda c, h, s: c.delete(f"/spending/{s['spendings'][0]['id']}", headers=h)),
+    ("GET", "/savings/"): (3, lambda c, h, s: c.get("/savings/", headers=h)),
+    ("GET", "/savings/progress"): (1, lambda c, h, s: c.get("/savings/progress", headers=h)),
+    ("GET", "/savings/{goal_id}/contributions/"): (2, lambda c, h, s: c.get(
+        f"/savings/{s['goals'][0]}/contributions/", headers=h)),
+    ("POST", "/savings/"): (4, lambda c, h, s: c.post("/savings/", json={"goal_name": "Car", "target_amount": 1.0}, headers=h)),
+    ("POST", "/savings/{goal_id}/contributions/"): (4, lambda c, h, s: c.post(
+        f"/savings/{s['goals'][0]}/contributions/", json={"amount": 1.0}, headers=h)),
+    ("POST", "/import/statement"): (8, lambda c, h, s: c.post(
+        "/import/statement", files={"file": ("statement.csv", STATEMENT.encode(), "text/csv")},
+        data={"date_column": "Date", "amount_column": "Amount", "description_column": "Description",
+              "category_column": "Category"}, headers=h)),
+    ("GET", "/export/transactions"): (2, lambda c, h, s: c.get("/export/transactions?format=csv", headers=h)),
+    ("GET", "/summary/"): (2, lambda c, h, s: c.get("/summary/", headers=h)),
+    ("GET", "/sync/pull"): (10, lambda c, h, s: c.get("/sync/pull", headers=h)),
+    ("POST", "/sync/push"): (10, lambda c, h, s: c.post("/sync/push", json=_push(s), headers=h)),
+}
+
+# Repeats that are the point of the route rather than a lazy load
+ALLOWED_REPEATS = {
+    # one crud write per pushed mutation, all inside the one transaction
+    ("POST", "/sync/push"),
+}
+
+UNMETERED = {("GET", "/"), ("GET", "/health"), ("GET", "/health/stats"), ("GET", "/metrics")}
+
+
+def test_every_route_has_a_budget():
+    routes = {(method, route.path) for route in app.routes if isinstance(route, APIRoute) for method in route.methods}
+    assert routes - UNMETERED == set(BUDGETS)
+
+
+@pytest.mark.parametrize("route", list(BUDGETS), ids=lambda route: " ".join(route))
+def test_query_budget(route, client, auth_headers, seeded, queries):
+    budget, request = BUDGETS[route]
+    with queries() as recorded:
+        response = request(client, auth_headers, seeded)
+    assert response.status_code < 400, response.text
+    label = " ".join(route)
+    recorded.assert_budget(budget, label)
+    if route not in ALLOWED_REPEATS:
+        recorded.assert_no_repeats(label=label)
+
+
+def test_recorder_flags_lazy_loads(db, test_user, queries):
+    db.add_all([SavingsGoal(goal_name=f"Goal {i}", target_amount=10.0, user_id=test_user.id) for i in range(3)])
+    db.commit()
+    db.expire_all()
+    with queries() as recorded:
+        for goal in db.query(SavingsGoal).filter(SavingsGoal.user_id == test_user.id):
+            goal.savings_contributions  # lazy load, one query per goal
+    [(statement, count)] = recorded.repeated().items()
+    assert "FROM savings_contributions" in statement and count == 3
+    with pytest.raises(AssertionError, match="N\\+1"):
+        recorded.assert_no_repeats()
@@ -0,0 +1,64 @@
+import io
+
+from app import models, rollups
+
+
+def _totals(db, user_id):
+    rows = db.query(models.SpendingDailyTotal).filter(
+        models.SpendingDailyTotal.user_id == user_id, models.SpendingDailyTotal.count != 0
+    )
+    return {(r.category_id, r.day.isoformat()): (r.total, r.count) for r in rows}
+
+def test_every_spending_write_keeps_rollups_in_step(client, auth_headers, db, test_user):
+    food = client.post("/categories/", json={"category_name": "Food"}, headers=auth_headers).json()["data"]["id"]
+    first = client.post("/spending/", json={"amount": 10.0, "category_id": food, "date": "2024-03-04T08:00:00"},
+                        headers=auth_headers).json()["data"]
+    client.post("/spending/", json={"amount": 5.0, "date": "2024-03-04T18:00:00"}, headers=auth_headers)
+    assert _totals(db, test_user.id) == {(food, "2024-03-04"): (10.0, 1), (0, "2024-03-04"): (5.0, 1)}
+
+    # Moving a spending to another day and amount shifts its contribution
+    update = {**first, "amount": 12.0, "date": "2024-03-05T08:00:00"}
+    response = client.put(f"/spending/{first['id']}", json=update, headers=auth_headers)
+    assert response.status_code == 200
+    assert _totals(db, test_user.id) == {(food, "2024-03-05"): (12.0, 1), (0, "2024-03-04"): (5.0, 1)}
+
+    # Deleting twice only subtracts once; restoring adds it back
+    client.delete(f"/spending/{first['id']}", headers=auth_headers)
+    client.delete(f"/spending/{first['id']}", headers=auth_headers)
+    assert _totals(db, test_user.id) == {(0, "2024-03-04"): (5.0, 1)}
+    client.put(f"/spending/{first['id']}", json={**update, "is_deleted": False}, headers=auth_headers)
+    assert _totals(db, test_user.id) == {(food, "2024-03-05"): (12.0, 1), (0, "2024-03-04"): (5.0, 1)}
+
+    ids = [
+        r["id"] for r in client.post("/spending/bulk", json=[
+            {"amount": 1.0, "category_id": food, "date": "2024-03-05T09:00:00"},
+            {"amount": 2.0, "category_id": food, "date": "2024-03-05T10:00:00"},
+        ], headers=auth_headers).json()["data"]
+    ]
+    assert _totals(db, test_user.id)[(food, "2024-03-05")] == (15.0, 3)
+    client.post("/spending/bulk/delete", json={"ids": ids + [first["id"]]}, headers=auth_headers)
+    assert _totals(db, test_user.id) == {(0, "2024-03-04"): (5.0, 1)}
+
+    statement = "date,amount,description,category\n2024-03-06,-7.50,Groceries,Food\n"
+    client.post("/import/statement", files={"file": ("s.csv", io.BytesIO(statement.encode()), "text/csv")},
+                data={"category_column": "category"}, headers=auth_headers)
+    assert _totals(db, test_user.id)[(food, "2024-03-06")] == (7.5, 1)
+
+    assert rollups.verify(db, test_user.id) == []
+
+def test_summary_reads_rollups_and_rebuild_repairs_drift(client, auth_headers, db, test_user):
+    client.post("/spending/", json={"amount": 40.0, "date": "2024-03-04T08:00:00"}, headers=auth_headers)
+    client.post("/spending/", json={"amount": 60.0, "date": "2024-03-20T08:00:00"}, headers=auth_headers)
+
+    rollup = db.query(models.SpendingDailyTotal).filter(models.SpendingDailyTotal.user_id == test_user.id).first()
+    rollup.total += 1000
+    db.commit()
+    assert len(rollups.verify(db, test_user.id)) == 1
+    response = client.get("/summary/?kind=spending&start_date=2024-03-01&end_date=2024-03-31", headers=auth_headers)
+    assert response.json()["data"]["spending"][0]["total"] == 1100.0
+
+    assert rollups.rebuild(db, test_user.id) == 2
+    assert rollups.verify(db, test_user.id) == []
+    response = client.get("/summary/?kind=spending&start_date=2024-03-01&end_date=2024-03-31", headers=auth_headers)
+    [row] = response.json()["data"]["spending"]
+    assert (row["category_id"], row["total"], row["count"], row["average"]) == (None, 100.0, 2, 50.0)
@@ -45,3 +45,46 @@ def test_get_savings_goals(client, auth_headers):
     data = response.json()["data"]
     assert len(data) >= 1
     assert any(g["goal_name"] == "Travel" for g in data)
+
+def _add_goals(client, auth_headers, count):
+    for i in range(count):
+        goal_id = client.post("/savings/", json={"goal_name": f"Goal {i}", "target_amount": 200.0},
+                              headers=auth_headers).json()["data"]["id"]
+        for amount in (20.0, 30.0):
+            client.post(f"/savings/{goal_id}/contributions/", json={"amount": amount}, headers=auth_headers)
+
+def test_savings_queries_do_not_grow_with_goals(client, auth_headers, queries):
+    client.get("/savings/", headers=auth_headers)  # warm the principal cache
+    query_counts = []
+    for new_goals in (2, 8):
+        _add_goals(client, auth_headers, new_goals)
+        with queries() as full:
+            goals = client.get("/savings/", headers=auth_headers).json()["data"]
+        with queries() as progress:
+            client.get("/savings/progress", headers=auth_headers)
+        assert all(len(g["savings_contributions"]) == 2 for g in goals)
+        full.assert_no_repeats()
+        query_counts.append((full.count, progress.count))
+    # ETag version lookup + goals + contributions for the full view, one grouped query for progress
+    assert query_counts == [(3, 1), (3, 1)]
+
+def test_savings_progress_and_contribution_pages(client, auth_headers):
+    goal_id = client.post("/savings/", json={"goal_name": "Laptop", "target_amount": 400.0},
+                          headers=auth_headers).json()["data"]["id"]
+    client.post("/savings/", json={"goal_name": "Empty", "target_amount": 100.0}, headers=auth_headers)
+    for day, amount in [(1, 50.0), (2, 25.0), (3, 25.0)]:
+        client.post(f"/savings/{goal_id}/contributions/", json={"amount": amount, "date": f"2024-01-0{day}T12:00:00"},
+                    headers=auth_headers)
+
+    progress = {g["goal_name"]: g for g in client.get("/savings/progress", headers=auth_headers).json()["data"]}
+    assert (progress["Laptop"]["total_contributed"], progress["Laptop"]["contribution_count"],
+            progress["Laptop"]["percent_complete"]) == (100.0, 3, 25.0)
+    assert (progress["Empty"]["total_contributed"], progress["Empty"]["contribution_count"]) == (0.0, 0)
+
+    page = client.get(f"/savings/{goal_id}/contributions/?limit=2", headers=auth_headers).json()
+    assert [c["amount"] for c in page["data"]] == [25.0, 25.0]
+    rest = client.get(f"/savings/{goal_id}/contributions/?limit=2&cursor={page['next_cursor']}", headers=auth_headers).json()
+    assert [c["date"] for c in rest["data"]] == ["2024-01-01T12:00:00"]
+    assert rest["next_cursor"] is None
+
+    assert client.get("/savings/999999/contributions/", headers=auth_headers).status_code == 404
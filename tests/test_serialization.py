@@ -0,0 +1,27 @@
+import json
+from datetime import datetime
+from typing import List
+
+from app import models, schemas, serialization
+
+
+def test_dump_json_matches_response_model():
+    rows = [models.Spending(id=i, amount=1.5 * i, item_name=f"item {i}", date=datetime(2024, 1, i), user_id=1,
+                            currency=models.Currency.USD, is_deleted=False, version=i) for i in range(1, 4)]
+    response_type = schemas.StandardResponse[List[schemas.Spending]]
+    body = serialization.dump_json(response_type, data=rows, message="ok", next_cursor="abc")
+    expected = response_type(data=[schemas.Spending.model_validate(r) for r in rows], message="ok", next_cursor="abc")
+    assert json.loads(body) == json.loads(expected.model_dump_json())
+    assert serialization.adapter(schemas.StandardResponse[List[schemas.Spending]]) is serialization.adapter(response_type)
+
+def test_list_response_keeps_headers_and_compresses(client, auth_headers):
+    client.post("/spending/bulk", json=[{"amount": float(i), "item_name": "Groceries"} for i in range(50)], headers=auth_headers)
+    response = client.get("/spending/", headers={**auth_headers, "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"]
+    assert len(response.json()["data"]) == 50
+
+    small = client.get("/categories/", headers={**auth_headers, "Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert small.json() == {"success": True, "data": [], "message": "Categories retrieved successfully", "next_cursor": None}
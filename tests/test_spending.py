@@ -64,3 +64,133 @@ def test_invalid_date_range(client, auth_headers):
     )
     assert response.status_code == 400
     assert "start_date cannot be after end_date" in response.json()["detail"]
+
+def test_get_spendings_end_date_includes_whole_day(client, auth_headers):
+    today = date.today()
+    client.post(
+        "/spending/",
+        json={"amount": 15.0, "item_name": "Late", "date": f"{today}T23:59:59"},
+        headers=auth_headers
+    )
+
+    response = client.get(
+        f"/spending/?start_date={today}&end_date={today}",
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert [s["item_name"] for s in response.json()["data"]] == ["Late"]
+
+def test_get_spendings_cursor_pagination(client, auth_headers):
+    today = date.today()
+    for i in range(5):
+        client.post(
+            "/spending/",
+            json={"amount": float(i), "item_name": f"Item {i}", "date": f"{today}T0{i}:00:00"},
+            headers=auth_headers
+        )
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/spending/?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url, headers=auth_headers).json()
+        seen += [s["item_name"] for s in body["data"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"Item {i}" for i in range(4, -1, -1)]
+
+def test_get_spendings_invalid_cursor(client, auth_headers):
+    response = client.get("/spending/?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == 400
+
+def test_delete_spending(client, auth_headers):
+    created = client.post(
+        "/spending/",
+        json={"amount": 5.0, "item_name": "Coffee", "date": str(date.today())},
+        headers=auth_headers
+    ).json()["data"]
+
+    response = client.delete(f"/spending/{created['id']}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["data"]["is_deleted"] is True
+    assert client.get("/spending/", headers=auth_headers).json()["data"] == []
+
+    assert client.delete("/spending/999999", headers=auth_headers).status_code == 404
+
+def test_bulk_create_and_delete_spendings(client, auth_headers):
+    today = str(date.today())
+    response = client.post(
+        "/spending/bulk",
+        json=[
+            {"amount": 1.0, "item_name": "Bread", "date": today},
+            {"item_name": "No amount"},
+            {"amount": 2.0, "item_name": "Milk", "date": today},
+            {"amount": 3.0, "item_name": "Stranger's category", "category_id": 999999},
+        ],
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    results = response.json()["data"]
+    assert [r["success"] for r in results] == [True, False, True, False]
+    assert results[3]["error"] == "Category not found"
+
+    listed = client.get("/spending/", headers=auth_headers).json()["data"]
+    assert sorted(s["item_name"] for s in listed) == ["Bread", "Milk"]
+
+    ids = [results[0]["id"], results[2]["id"], 999999]
+    response = client.post("/spending/bulk/delete", json={"ids": ids}, headers=auth_headers)
+    assert [r["success"] for r in response.json()["data"]] == [True, True, False]
+    assert client.get("/spending/", headers=auth_headers).json()["data"] == []
+
+def test_search_spendings(client, auth_headers):
+    category_id = client.post("/categories/", json={"category_name": "Transport"}, headers=auth_headers).json()["data"]["id"]
+    rows = [
+        {"amount": 12.5, "item_name": "Uber", "notes": "ride home", "category_id": category_id, "date": "2024-03-02T10:00:00"},
+        {"amount": 900.0, "item_name": "Rent", "notes": "March rent", "date": "2024-03-01T09:00:00"},
+        {"amount": 850.0, "item_name": "Rent", "notes": "February", "date": "2024-02-01T09:00:00"},
+        {"amount": 4.0, "item_name": "Coffee", "notes": "with Uber driver", "date": "2024-03-05T08:00:00"},
+    ]
+    ids = client.post("/spending/bulk", json=rows, headers=auth_headers).json()["data"]
+    ids = [r["id"] for r in ids]
+
+    def search(**params):
+        response = client.get("/spending/search", params=params, headers=auth_headers)
+        assert response.status_code == 200, response.text
+        return [s["id"] for s in response.json()["data"]]
+
+    assert search(q="rent march") == [ids[1]]            # every word must match, in either column
+    assert set(search(q="ube")) == {ids[0], ids[3]}      # prefix match
+    assert search(q="uber", category_id=category_id) == [ids[0]]
+    assert search(q="rent", start_date="2024-02-15") == [ids[1]]
+    assert search(q="groceries") == []
+
+    # Updates and deletes are reflected
+    update = {**rows[2], "id": ids[2], "item_name": "Groceries"}
+    assert client.put(f"/spending/{ids[2]}", json=update, headers=auth_headers).status_code == 200
+    assert search(q="groceries") == [ids[2]]
+    client.delete(f"/spending/{ids[2]}", headers=auth_headers)
+    assert search(q="groceries") == []
+
+def test_search_ranks_and_isolates_users(client, auth_headers, db):
+    from app.models import Spending, User
+    other = User(email="other@example.com", password="x")
+    db.add(other)
+    db.commit()
+    db.add(Spending(user_id=other.id, item_name="Uber", notes="not yours"))
+    db.commit()
+    rows = [
+        {"amount": 1.0, "item_name": "Lunch", "notes": "at the cafe next to the uber office downtown"},
+        {"amount": 2.0, "item_name": "Uber", "notes": "uber to the airport"},
+        {"amount": 3.0, "item_name": "Snacks"},
+    ]
+    ids = [r["id"] for r in client.post("/spending/bulk", json=rows, headers=auth_headers).json()["data"]]
+    response = client.get("/spending/search", params={"q": "uber"}, headers=auth_headers)
+    assert [s["id"] for s in response.json()["data"]] == [ids[1], ids[0]]
+
+def test_search_rejects_empty_query(client, auth_headers):
+    assert client.get("/spending/search", params={"q": "!!"}, headers=auth_headers).status_code == 400
+    assert client.get("/spending/search", params={"q": ""}, headers=auth_headers).status_code == 422
+    # FTS syntax in the query is treated as plain words
+    assert client.get("/spending/search", params={"q": 'rent" OR NEAR(*'}, headers=auth_headers).status_code == 200
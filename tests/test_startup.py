@@ -0,0 +1,26 @@
+from typing import List
+
+from fastapi.testclient import TestClient
+
+from app import schemas, serialization, startup
+from app.main import app
+
+
+def test_lifespan_prebuilds_openapi_and_serializers(monkeypatch):
+    app.openapi_schema = None
+    serialization.adapter.cache_clear()
+    monkeypatch.setattr(startup, "AUTO_CREATE_TABLES", False)
+    with TestClient(app):
+        assert app.openapi_schema is not None
+        assert serialization.adapter.cache_info().currsize > 0
+        built = serialization.adapter.cache_info()
+        serialization.adapter(schemas.StandardResponse[List[schemas.Spending]])
+        assert serialization.adapter.cache_info().misses == built.misses
+
+def test_startup_survives_unreachable_database(monkeypatch):
+    def unreachable(*args):
+        raise ConnectionError("database is down")
+    monkeypatch.setattr(startup, "AUTO_CREATE_TABLES", False)
+    monkeypatch.setattr(startup, "warm_pool", unreachable)
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
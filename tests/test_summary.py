@@ -0,0 +1,42 @@
+def test_summary_groups_by_period_and_category(client, auth_headers):
+    food = client.post("/categories/", json={"category_name": "Food"}, headers=auth_headers).json()["data"]["id"]
+    rent = client.post("/categories/", json={"category_name": "Rent"}, headers=auth_headers).json()["data"]["id"]
+    for amount, category_id, day in [
+        (10.0, food, "2024-03-04T08:00:00"),  # Monday
+        (20.0, food, "2024-03-10T23:30:00"),  # Sunday, same week
+        (500.0, rent, "2024-03-11T09:00:00"),
+        (30.0, food, "2024-04-02T12:00:00"),
+    ]:
+        client.post("/spending/", json={"amount": amount, "category_id": category_id, "date": day}, headers=auth_headers)
+    deleted = client.post("/spending/", json={"amount": 99.0, "category_id": food, "date": "2024-03-05T10:00:00"},
+                          headers=auth_headers).json()["data"]["id"]
+    client.delete(f"/spending/{deleted}", headers=auth_headers)
+    client.post("/income/", json={"amount": 1000.0, "source": "Salary", "date": "2024-03-28T09:00:00"}, headers=auth_headers)
+    client.post("/income/", json={"amount": 1000.0, "source": "Salary", "date": "2024-04-28T09:00:00"}, headers=auth_headers)
+
+    response = client.get("/summary/?period=month&start_date=2024-03-01&end_date=2024-04-30", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert [(r["period"], r["category_id"], r["total"], r["count"], r["average"]) for r in data["spending"]] == [
+        ("2024-03-01", food, 30.0, 2, 15.0),
+        ("2024-03-01", rent, 500.0, 1, 500.0),
+        ("2024-04-01", food, 30.0, 1, 30.0),
+    ]
+    assert [(r["period"], r["source"], r["total"]) for r in data["income"]] == [
+        ("2024-03-01", "Salary", 1000.0), ("2024-04-01", "Salary", 1000.0)
+    ]
+
+    response = client.get(f"/summary/?period=week&kind=spending&start_date=2024-03-01&end_date=2024-03-31&category_id={food}",
+                          headers=auth_headers)
+    data = response.json()["data"]
+    assert data["income"] == []
+    assert [(r["period"], r["total"], r["count"]) for r in data["spending"]] == [("2024-03-04", 30.0, 2)]
+
+    response = client.get("/summary/?period=day&kind=spending&start_date=2024-03-10&end_date=2024-03-10", headers=auth_headers)
+    assert [(r["period"], r["total"]) for r in response.json()["data"]["spending"]] == [("2024-03-10", 20.0)]
+
+def test_summary_validates_params(client, auth_headers):
+    response = client.get("/summary/?start_date=2024-05-01&end_date=2024-04-01", headers=auth_headers)
+    assert response.status_code == 400
+    response = client.get("/summary/?period=year", headers=auth_headers)
+    assert response.status_code == 422
@@ -0,0 +1,82 @@
+from app import rollups
+
+
+def _pull(client, auth_headers, since=0, limit=500):
+    response = client.get(f"/sync/pull?since={since}&limit={limit}", headers=auth_headers)
+    assert response.status_code == 200
+    return response.json()["data"]
+
+def test_pull_returns_only_changes_since_token(client, auth_headers):
+    category_id = client.post("/categories/", json={"category_name": "Food"}, headers=auth_headers).json()["data"]["id"]
+    spending = client.post("/spending/", json={"amount": 5.0, "category_id": category_id}, headers=auth_headers).json()["data"]
+    client.post("/income/", json={"amount": 50.0, "source": "Gift"}, headers=auth_headers)
+    goal_id = client.post("/savings/", json={"goal_name": "Bike", "target_amount": 300.0}, headers=auth_headers).json()["data"]["id"]
+    client.post(f"/savings/{goal_id}/contributions/", json={"amount": 30.0}, headers=auth_headers)
+
+    first = _pull(client, auth_headers)
+    assert not first["has_more"]
+    assert [len(first[k]) for k in ("categories", "spendings", "incomes", "savings_goals", "savings_contributions")] == [1, 1, 1, 1, 1]
+    assert first["token"] == first["savings_contributions"][0]["version"]
+
+    assert _pull(client, auth_headers, since=first["token"]) == {
+        "token": first["token"], "has_more": False, "categories": [], "incomes": [], "spendings": [],
+        "savings_goals": [], "savings_contributions": [],
+    }
+
+    # Updates and soft-deletes come back as changed rows
+    client.put(f"/spending/{spending['id']}", json={**spending, "amount": 6.0}, headers=auth_headers)
+    client.delete(f"/spending/{spending['id']}", headers=auth_headers)
+    second = _pull(client, auth_headers, since=first["token"])
+    assert [(s["id"], s["amount"], s["is_deleted"]) for s in second["spendings"]] == [(spending["id"], 6.0, True)]
+    assert second["token"] > first["token"]
+    assert second["categories"] == second["incomes"] == []
+
+def test_pull_pages_without_splitting_a_batch(client, auth_headers):
+    client.post("/spending/bulk", json=[{"amount": float(i)} for i in range(3)], headers=auth_headers)
+    for i in range(3):
+        client.post("/income/", json={"amount": float(i), "source": f"Source {i}"}, headers=auth_headers)
+
+    seen, token, pages = [], 0, 0
+    while True:
+        page = _pull(client, auth_headers, since=token, limit=2)
+        seen += [("spending", s["id"]) for s in page["spendings"]] + [("income", i["id"]) for i in page["incomes"]]
+        token, pages = page["token"], pages + 1
+        if not page["has_more"]:
+            break
+    # The bulk insert shares one version, so it arrives whole on the first page
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 6
+
+def test_push_applies_batch_and_reports_conflicts(client, auth_headers, db, test_user):
+    existing = client.post("/spending/", json={"amount": 10.0, "item_name": "Taxi"}, headers=auth_headers).json()["data"]
+    response = client.post("/sync/push", json={"mutations": [
+        {"op": "upsert", "client_id": "c-1", "data": {"amount": 4.0, "item_name": "Coffee", "date": "2024-05-01T08:00:00"}},
+        {"op": "upsert", "client_id": "c-1", "data": {"amount": 4.5, "item_name": "Coffee", "date": "2024-05-01T08:00:00"}},
+        {"op": "upsert", "id": existing["id"], "base_version": existing["version"], "data": {**existing, "amount": 12.0}},
+        {"op": "delete", "client_id": "never-created"},
+        {"op": "upsert", "client_id": "c-2", "data": {"amount": 1.0, "category_id": 999999}},
+    ]}, headers=auth_headers)
+    assert response.status_code == 200
+    results = response.json()["data"]
+    assert [r["status"] for r in results] == ["applied", "applied", "applied", "error", "error"]
+    assert results[0]["id"] == results[1]["id"]
+    assert results[1]["version"] > results[0]["version"]
+
+    pulled = _pull(client, auth_headers, since=existing["version"])["spendings"]
+    assert [(s["client_id"], s["amount"]) for s in pulled] == [("c-1", 4.5), (None, 12.0)]
+
+    # A second device edited c-1 from a stale version
+    stale = {"op": "upsert", "client_id": "c-1", "base_version": results[0]["version"],
+             "data": {"amount": 9.0, "date": "2024-05-01T08:00:00"}}
+    [conflict] = client.post("/sync/push", json={"mutations": [stale]}, headers=auth_headers).json()["data"]
+    assert conflict["status"] == "conflict"
+    assert (conflict["server"]["amount"], conflict["version"]) == (4.5, results[1]["version"])
+
+    [applied] = client.post("/sync/push", json={"mutations": [stale], "on_conflict": "last_writer_wins"},
+                            headers=auth_headers).json()["data"]
+    assert applied["status"] == "applied"
+    [deleted] = client.post("/sync/push", json={"mutations": [
+        {"op": "delete", "client_id": "c-1", "base_version": applied["version"]}
+    ]}, headers=auth_headers).json()["data"]
+    assert deleted["status"] == "applied"
+    assert rollups.verify(db, test_user.id) == []